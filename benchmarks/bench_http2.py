@@ -0,0 +1,196 @@
+"""
+Compares Transport (HTTP/1.1) with HTTP2Transport under many concurrent
+requests.
+
+Serves a stand-in for hyper over TLS with hypercorn, in its own process,
+which speaks HTTP/2 when the client offers it and answers every request
+after a short delay like a remote server would.  Sends the same
+concurrent data gets through each transport and reports throughput, the
+protocol used, and how many sockets the server saw.
+
+Needs hypercorn (a dev dependency), httpx[http2], and the openssl
+command:
+
+    poetry install -E http2
+    python benchmarks/bench_http2.py
+"""
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Set, Tuple
+
+from hyper_connect import connect
+from hyper_connect.utils import HTTP2Transport, Transport, map_concurrently
+
+REQUESTS = 2000
+CONCURRENCY = 200
+# seconds the server takes to answer, standing in for network latency
+LATENCY = 0.01
+
+
+class Server:
+    """
+    An ASGI app recording the client sockets and protocols it sees.
+    GET /stats reports them and then forgets them.
+    """
+
+    def __init__(self):
+        self.sockets: Set[Tuple[str, int]] = set()
+        self.versions: Set[str] = set()
+
+    async def __call__(self, scope: Dict, receive, send):
+        if scope["type"] != "http":
+            return
+
+        if scope["path"] == "/stats":
+            doc = {
+                "sockets": len(self.sockets),
+                "versions": sorted(self.versions),
+            }
+            self.sockets.clear()
+            self.versions.clear()
+        else:
+            self.sockets.add(tuple(scope["client"]))
+            self.versions.add(scope["http_version"])
+            doc = {"_id": "movie-1"}
+            await asyncio.sleep(LATENCY)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": json.dumps(doc).encode("utf-8"),
+            }
+        )
+
+
+def self_signed_certificate(directory: str) -> Tuple[str, str]:
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1",
+            "-keyout",
+            key,
+            "-out",
+            cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def serve(port: int, cert: str, key: str):
+    """Runs the server until the process is stopped."""
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = cert
+    config.keyfile = key
+    config.loglevel = "ERROR"
+    # hypercorn closes connections after 1000 requests by default
+    config.keep_alive_max_requests = REQUESTS * 10
+    asyncio.run(serve(Server(), config))
+
+
+def wait_for(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def run(name: str, transport: Transport, base_url: str):
+    hyper = connect(f"{base_url}/test", transport=transport)
+
+    # handle_response prints a blank line per response
+    with contextlib.redirect_stdout(io.StringIO()):
+        # open the connections before timing
+        map_concurrently(lambda i: hyper.data.get("movie-1"), range(50), 50)
+        transport.request("GET", f"{base_url}/stats")
+
+        start = time.perf_counter()
+        results = map_concurrently(
+            lambda i: hyper.data.get("movie-1"), range(REQUESTS), CONCURRENCY
+        )
+        elapsed = time.perf_counter() - start
+    stats = transport.request("GET", f"{base_url}/stats").json()
+    transport.close()
+
+    failed = sum(1 for result in results if result.get("status") != 200)
+    print(
+        f"{name:<16}"
+        f"{REQUESTS / elapsed:>10.0f} req/s"
+        f"{stats['sockets']:>10} sockets"
+        f"{'/'.join(stats['versions']):>10}"
+        f"{failed:>10} failed"
+    )
+
+
+def main():
+    # requests warns each time its pool is full and a connection is dropped
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = self_signed_certificate(directory)
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--serve", str(port), cert, key]
+        )
+        try:
+            wait_for(port)
+            os.environ["REQUESTS_CA_BUNDLE"] = cert
+            base_url = f"https://127.0.0.1:{port}"
+
+            print(
+                f"{REQUESTS} data gets, {CONCURRENCY} at a time, "
+                f"{LATENCY * 1000:.0f}ms server latency"
+            )
+            run("HTTP/1.1", Transport(), base_url)
+            run("HTTP/2", HTTP2Transport(verify=cert), base_url)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--serve"]:
+        serve(int(sys.argv[2]), sys.argv[3], sys.argv[4])
+    else:
+        main()
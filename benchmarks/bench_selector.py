@@ -0,0 +1,116 @@
+"""
+Measures in-process selector matching over many documents.
+
+Filters generated movie documents with a few data query selectors, once
+with compile_selector and once with a matcher that walks the selector
+for every document, as hand-written filters tend to.  Then sorts the
+matches, in full and with a limit.  Reports documents per second.
+
+    python benchmarks/bench_selector.py [documents, default 1000000]
+"""
+import random
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from hyper_connect.utils import compile_selector, filter_docs
+
+GENRES = ["comedy", "drama", "horror", "sci-fi", "fantasy", "western"]
+
+SELECTORS: Dict[str, Dict] = {
+    "equality": {"type": "movie", "genre": "comedy"},
+    "range": {"type": "movie", "year": {"$gte": 1980, "$lt": 1990}},
+    "in": {"genres": {"$in": ["horror", "western"]}},
+    "or": {"$or": [{"rating": {"$gt": 9}}, {"director.name": "Ivan Reitman"}]},
+    "regex": {"title": {"$regex": "^Movie 12"}},
+}
+
+
+def generate(count: int) -> List[Dict]:
+    rng = random.Random(42)
+    return [
+        {
+            "_id": f"movie-{i}",
+            "type": "movie" if i % 10 else "book",
+            "title": f"Movie {i}",
+            "year": rng.randint(1950, 2020),
+            "rating": round(rng.uniform(1, 10), 1),
+            "genre": rng.choice(GENRES),
+            "genres": rng.sample(GENRES, 2),
+            "director": {"name": rng.choice(["Ivan Reitman", "Ridley Scott"])},
+        }
+        for i in range(count)
+    ]
+
+
+def interpret(selector: Dict, doc: Any) -> bool:
+    """Matches a document by walking the selector, for comparison."""
+    for key, arg in selector.items():
+        if key == "$or":
+            if not any(interpret(clause, doc) for clause in arg):
+                return False
+            continue
+        value = doc
+        for part in key.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        if isinstance(arg, dict):
+            for op, operand in arg.items():
+                if value is None:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$regex" and not re.search(operand, value):
+                    return False
+                if op == "$in" and not (
+                    set(value) & set(operand)
+                    if isinstance(value, list)
+                    else value in operand
+                ):
+                    return False
+        elif value != arg:
+            return False
+    return True
+
+
+def rate(count: int, fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    docs = generate(count)
+    print(f"{count} documents, documents per second\n")
+
+    print(f"{'selector':<10} {'matches':>9} {'walked':>12} {'compiled':>12}")
+    for name, selector in SELECTORS.items():
+        match = compile_selector(selector)
+        matches = sum(1 for _ in filter(match, docs))
+        walked = rate(
+            count, lambda: [doc for doc in docs if interpret(selector, doc)]
+        )
+        compiled = rate(count, lambda: list(filter_docs(docs, match)))
+        print(f"{name:<10} {matches:>9} {walked:>12,.0f} {compiled:>12,.0f}")
+
+    selector = compile_selector(SELECTORS["range"])
+    print(f"\n{'sort':<24} {'compiled':>12}")
+    for name, options in [
+        ("year, title", {"sort": [{"year": "ASC"}, {"title": "ASC"}]}),
+        ("rating desc", {"sort": [{"rating": "DESC"}]}),
+        ("rating desc, limit 10", {"sort": [{"rating": "DESC"}], "limit": 10}),
+        ("rating desc, year asc", {"sort": [{"rating": "DESC"}, "year"]}),
+    ]:
+        sorted_rate = rate(
+            count, lambda: list(filter_docs(docs, selector, options))
+        )
+        print(f"{name:<24} {sorted_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,71 @@
-from importlib.metadata import version
+# Attributes are resolved on first access (PEP 562) so that
+# `import hyper_connect` stays cheap.  The service modules and their
+# dependencies (requests, promisio, ramda, PyJWT, ...) load on first use.
+from typing import TYPE_CHECKING, Any
 
-__version__ = version("hyper_connect")
+if TYPE_CHECKING:
+    from hyper_connect._batcher import EnqueueBatcher
+    from hyper_connect._copy import copy
+    from hyper_connect._hyper_connect import connect
+    from hyper_connect._index_advisor import IndexRegistry, QueryAdvisor
+    from hyper_connect._outbox import QueueOutbox
+    from hyper_connect._queue_watcher import QueueWatcher
+    from hyper_connect._receiver import (
+        ASGIJobReceiver,
+        JobReceiver,
+        WSGIJobReceiver,
+    )
+    from hyper_connect._registry import HyperRegistry
+    from hyper_connect._write_buffer import DataWriteBuffer
 
-from hyper_connect._hyper_connect import connect
+__all__ = [
+    "connect",
+    "HyperRegistry",
+    "JobReceiver",
+    "WSGIJobReceiver",
+    "ASGIJobReceiver",
+    "EnqueueBatcher",
+    "QueueOutbox",
+    "QueueWatcher",
+    "DataWriteBuffer",
+    "QueryAdvisor",
+    "IndexRegistry",
+    "copy",
+]
+
+_RECEIVERS = ("JobReceiver", "WSGIJobReceiver", "ASGIJobReceiver")
+
+
+def __getattr__(name: str) -> Any:
+    value: Any
+    if name == "connect":
+        from hyper_connect._hyper_connect import connect as value
+    elif name == "HyperRegistry":
+        from hyper_connect._registry import HyperRegistry as value
+    elif name == "EnqueueBatcher":
+        from hyper_connect._batcher import EnqueueBatcher as value
+    elif name == "QueueOutbox":
+        from hyper_connect._outbox import QueueOutbox as value
+    elif name == "QueueWatcher":
+        from hyper_connect._queue_watcher import QueueWatcher as value
+    elif name == "DataWriteBuffer":
+        from hyper_connect._write_buffer import DataWriteBuffer as value
+    elif name == "QueryAdvisor":
+        from hyper_connect._index_advisor import QueryAdvisor as value
+    elif name == "IndexRegistry":
+        from hyper_connect._index_advisor import IndexRegistry as value
+    elif name == "copy":
+        from hyper_connect._copy import copy as value
+    elif name in _RECEIVERS:
+        from hyper_connect import _receiver
+
+        value = getattr(_receiver, name)
+    elif name == "__version__":
+        from importlib.metadata import version
+
+        value = version("hyper_connect")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
@@ -0,0 +1,353 @@
+import abc
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from hyper_connect.types import ENQUEUE_CONCURRENCY, ENQUEUE_RETRIES
+from hyper_connect.utils import call_with_retries
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperQueue
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE: int = 100
+
+# Seconds an item may wait in the buffer for its batch to fill up
+BATCH_INTERVAL_SECONDS: float = 0.05
+
+# Items buffered before writers block
+BATCH_MAX_BUFFER: int = 10000
+
+
+def resolve_future(future: Future, result: Any):
+    """
+    Sets the result of a batched item's Future, unless its caller
+    cancelled it.
+    """
+    if future.done():
+        return
+    if future.running() or future.set_running_or_notify_cancel():
+        future.set_result(result)
+
+
+def fail_future(future: Future, error: BaseException):
+    """
+    Sets the exception of a batched item's Future, unless it is done or
+    its caller cancelled it.
+    """
+    if future.done():
+        return
+    if future.running() or future.set_running_or_notify_cancel():
+        future.set_exception(error)
+
+
+class BackgroundBatcher(abc.ABC):
+    """
+    Buffers items and sends them in batches from a background thread.
+
+    A batch is sent as soon as `batch_size` items are buffered, or
+    `interval` seconds after its first item arrived.  The buffer holds at
+    most `max_buffer` items.  Subclasses store items and send batches by
+    implementing _buffered, _take, _send, and _futures.  When _send
+    raises, the futures of its batch that are not done get the error and
+    the thread carries on with the next batch.
+
+    ...
+
+    Attributes
+    ----------
+    batch_size : int
+        The most items sent per batch.
+    interval : float
+        Seconds an item waits for its batch to fill up.
+    max_buffer : int
+        The most items waiting to be sent.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = BATCH_SIZE,
+        interval: float = BATCH_INTERVAL_SECONDS,
+        max_buffer: int = BATCH_MAX_BUFFER,
+        name: str = "hyper-batcher",
+    ):
+        if batch_size < 1 or max_buffer < 1:
+            raise ValueError("batch_size and max_buffer must be at least 1")
+
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_buffer = max_buffer
+
+        self._unfinished = 0
+        self._flushing = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._thread = threading.Thread(
+            target=self._run, name=name, daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @abc.abstractmethod
+    def _buffered(self) -> int:
+        """The number of items waiting to be sent."""
+
+    @abc.abstractmethod
+    def _take(self, count: int) -> List:
+        """Removes up to `count` items from the buffer and returns them."""
+
+    @abc.abstractmethod
+    def _send(self, batch: List):
+        """Sends a batch and resolves the futures of its items."""
+
+    @abc.abstractmethod
+    def _futures(self, batch: List) -> Iterable[Future]:
+        """The futures of a batch's items."""
+
+    def _put(
+        self,
+        add: Callable[[], bool],
+        needs_room: Callable[[], bool],
+        block: bool,
+        timeout: Optional[float],
+    ):
+        """
+        Calls `add` to buffer an item, first waiting for room when
+        `needs_room` returns True.  `add` returns True when the buffer grew.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the batcher is closed")
+
+            if needs_room() and self._buffered() >= self.max_buffer:
+                if not block or not self._condition.wait_for(
+                    lambda: self._buffered() < self.max_buffer or self._closed,
+                    timeout,
+                ):
+                    raise queue.Full
+                if self._closed:
+                    raise RuntimeError("the batcher is closed")
+
+            if add():
+                self._unfinished += 1
+                buffered = self._buffered()
+                if buffered == 1 or buffered >= self.batch_size:
+                    self._condition.notify_all()
+
+    def __len__(self) -> int:
+        """The number of items buffered or being sent."""
+        with self._condition:
+            return self._unfinished
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends the buffered items now and waits until every buffered item is
+        sent.  Returns False if `timeout` seconds pass first.
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(
+                    lambda: self._unfinished == 0, timeout
+                )
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops accepting items, sends the buffered ones, and stops the
+        background thread.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        atexit.unregister(self.close)
+        self._thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_batch(self) -> Optional[List]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._buffered() or self._closed)
+            if not self._buffered():
+                return None
+
+            deadline = time.monotonic() + self.interval
+            while (
+                self._buffered() < self.batch_size
+                and not self._closed
+                and not self._flushing
+            ):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = self._take(self.batch_size)
+            # wake writers waiting for room in the buffer
+            self._condition.notify_all()
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                self._send(batch)
+            except Exception as error:
+                logger.exception("hyper batcher failed to send a batch")
+                for future in self._futures(batch):
+                    fail_future(future, error)
+            finally:
+                with self._condition:
+                    self._unfinished -= len(batch)
+                    self._condition.notify_all()
+
+
+class EnqueueBatcher(BackgroundBatcher):
+    """
+    Enqueues jobs in the background so callers do not wait on hyper.
+
+    submit() buffers a job and returns at once with a Future of its
+    Result.  A background thread sends the buffer in batches of up to
+    `batch_size` jobs, as soon as a batch is full or `interval` seconds
+    after its first job arrived.  The jobs of a batch are sent
+    `concurrency` at a time and retried like hyper.queue.enqueue_many.
+
+    The buffer holds at most `max_buffer` jobs.  When it is full, submit
+    blocks until there is room, or raises queue.Full when called with
+    block=False.  Buffered jobs are sent when the batcher is closed, and
+    batchers still open when the interpreter exits are closed then.  A job
+    whose Future is cancelled before its batch is sent is not enqueued.
+
+    Example:
+
+        batcher = hyper.queue.batcher(batch_size=50)
+
+        batcher.submit({"type": "email", "to": "..."})
+        future = batcher.submit({"type": "sms", "to": "..."})
+        future.result()  # {'ok': True, 'status': 201, 'attempts': 1}
+
+        batcher.close()
+
+    ...
+
+    Attributes
+    ----------
+    batch_size : int
+        The most jobs sent per batch.
+    interval : float
+        Seconds a job waits for its batch to fill up.
+    max_buffer : int
+        The most jobs waiting to be sent.
+    """
+
+    def __init__(
+        self,
+        hyper_queue: "HyperQueue",
+        batch_size: int = BATCH_SIZE,
+        interval: float = BATCH_INTERVAL_SECONDS,
+        max_buffer: int = BATCH_MAX_BUFFER,
+        concurrency: int = ENQUEUE_CONCURRENCY,
+        retries: int = ENQUEUE_RETRIES,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self._queue = hyper_queue
+        self._retries = retries
+        self._jobs: Deque[Tuple[Dict, Future]] = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="hyper-enqueue"
+        )
+        super().__init__(
+            batch_size, interval, max_buffer, name="hyper-enqueue-batcher"
+        )
+
+    def submit(
+        self, job: Dict, block: bool = True, timeout: Optional[float] = None
+    ) -> "Future[Dict]":
+        """
+        Buffers a job to be enqueued.
+
+        Parameters
+        ----------
+        job : Dict
+            The job to post to the queue.
+        block : bool
+            Wait for room when the buffer is full.  False raises queue.Full
+            instead.
+        timeout : float, optional
+            The most seconds to wait for room before raising queue.Full.
+
+        Returns
+        -------
+        A Future of the job's Result (OkResult, NotOkResult)
+        """
+        future: "Future[Dict]" = Future()
+
+        def add() -> bool:
+            self._jobs.append((job, future))
+            return True
+
+        self._put(add, lambda: True, block, timeout)
+        return future
+
+    def close(self, timeout: Optional[float] = None):
+        super().close(timeout)
+        self._executor.shutdown(wait=True)
+
+    def _buffered(self) -> int:
+        return len(self._jobs)
+
+    def _take(self, count: int) -> List[Tuple[Dict, Future]]:
+        batch: List[Tuple[Dict, Future]] = []
+        while self._jobs and len(batch) < count:
+            batch.append(self._jobs.popleft())
+        return batch
+
+    def _enqueue(self, job: Dict) -> Dict:
+        return call_with_retries(
+            lambda: self._queue.enqueue(job), self._retries
+        )
+
+    def _send(self, batch: List[Tuple[Dict, Future]]):
+        # jobs whose futures were cancelled while buffered are not sent
+        batch = [
+            (job, future)
+            for job, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        results = self._executor.map(self._enqueue, [job for job, _ in batch])
+        for (_, future), result in zip(batch, results):
+            resolve_future(future, result)
+
+    def _futures(self, batch: List[Tuple[Dict, Future]]) -> Iterable[Future]:
+        return (future for _, future in batch)
@@ -0,0 +1,465 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from itertools import islice
+from queue import Full, Queue
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from hyper_connect.utils import (
+    ListPagesError,
+    call_with_retries,
+    create_hyper_request_params,
+    iter_concurrently,
+    list_pages,
+    save_checkpoint,
+)
+
+if TYPE_CHECKING:
+    from hyper_connect.types import Hyper
+
+COPY_SERVICES: Tuple[str, ...] = ("data", "cache", "search")
+
+COPY_BATCH_SIZE: int = 500
+COPY_CONCURRENCY: int = 8
+COPY_RETRIES: int = 2
+
+# batches read from the source while the batches before them are written
+COPY_READ_AHEAD: int = 2
+
+Progress = Callable[[Dict[str, Any]], None]
+
+T = TypeVar("T")
+
+
+class _Batch(NamedTuple):
+    seq: int
+    # where a copy carries on from once this batch, and every batch
+    # before it, is written
+    after: Any
+    items: List[Any]
+
+
+def _app(hyper: "Hyper") -> str:
+    # the data service's url, which names the app and, for cloud
+    # connection strings, the domain, without the secret
+    connection = hyper.data._connection
+    return create_hyper_request_params(
+        connection.connection_string,
+        connection.domain,
+        {
+            "service": "data",
+            "method": "GET",
+            "resource": None,
+            "body": None,
+            "params": None,
+            "action": None,
+        },
+    )["url"]
+
+
+def _prefetched(items: Iterable[T], size: int) -> Generator[T, None, None]:
+    """
+    Yields `items`, read on a thread at most `size` ahead, so reading the
+    source overlaps with writing what was read before.  Errors raised
+    reading are raised here.  Closing the generator stops the reads.
+    """
+    queue: "Queue[Tuple[str, Any]]" = Queue(size)
+    closed = threading.Event()
+
+    def put(entry: Tuple[str, Any]) -> bool:
+        while not closed.is_set():
+            try:
+                queue.put(entry, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def read():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except BaseException as error:
+            put(("error", error))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    reader = threading.Thread(
+        target=contextvars.copy_context().run, args=(read,), daemon=True
+    )
+    reader.start()
+    try:
+        while True:
+            kind, value = queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        closed.set()
+
+
+def _chunks(
+    items: Iterable[Any], size: int, position: int
+) -> Iterator[_Batch]:
+    items = iter(items)
+    seq = 0
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        position += len(chunk)
+        yield _Batch(seq, position, chunk)
+        seq += 1
+
+
+def _is_rejection(result: Dict) -> bool:
+    # hyper refused this document, as opposed to failing to answer
+    status = result.get("status")
+    return isinstance(status, int) and 400 <= status < 500
+
+
+def _rejected(result: Dict) -> int:
+    return sum(1 for doc in result.get("results") or [] if not doc.get("ok"))
+
+
+def _load_checkpoint(
+    path: Optional[str], source: str, target: str
+) -> Dict[str, Any]:
+    if path is None or not os.path.exists(path):
+        return {"source": source, "target": target, "services": {}}
+
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    if (checkpoint.get("source"), checkpoint.get("target")) != (
+        source,
+        target,
+    ):
+        raise ValueError(
+            f"checkpoint {path} is for a copy from "
+            f"{checkpoint.get('source')!r} to {checkpoint.get('target')!r}"
+        )
+    return checkpoint
+
+
+def copy(
+    src: "Hyper",
+    dst: "Hyper",
+    services: Sequence[str] = COPY_SERVICES,
+    batch_size: int = COPY_BATCH_SIZE,
+    concurrency: int = COPY_CONCURRENCY,
+    retries: int = COPY_RETRIES,
+    cache_pattern: str = "*",
+    cache_ttl: Optional[str] = None,
+    search_keys: Optional[Iterable[str]] = None,
+    checkpoint: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Copies the data, cache, and search services of one hyper app or domain
+    to another, eg from connect(connection_string, "production") to
+    connect(connection_string, "staging").
+
+    Each service is read from `src` on a thread a batch at a time while
+    the batches read before it are written to `dst`, `concurrency` at a
+    time, so reads and writes overlap and memory holds the batches in
+    flight, not the service.  Failed writes are retried like
+    hyper.queue.enqueue_many.
+
+    - data: documents are listed in _id order and written with
+      hyper.data.bulk, without their _rev.
+    - cache: the keys matching `cache_pattern` are set, with `cache_ttl`.
+    - search: hyper cannot list a search index, so the keys copied are
+      `search_keys`, or else the _ids of the source's data service.  Each
+      is read with hyper.search.get and written with hyper.search.load;
+      keys the index does not hold are skipped.
+
+    With a `checkpoint` path, the progress of each service is saved there
+    after every batch that was written along with every batch before it.
+    When a batch fails for good, no more batches are sent and the copy
+    stops; copying between the same apps with the same checkpoint carries
+    on from it.  Cache queries cannot resume part way, so a cache copy
+    that stopped starts over.  The checkpoint is removed once every
+    service is copied.
+
+    `progress` is called after each written batch with the service, its
+    documents, batches, and rejected documents so far, the seconds taken,
+    and documents per second.
+
+    Example:
+
+        from hyper_connect import connect, copy
+
+        copy(
+            connect(connection_string, "production"),
+            connect(connection_string, "staging"),
+            ["data", "search"],
+            checkpoint="staging.checkpoint",
+            progress=print,
+        )
+
+    Parameters
+    ----------
+    src : Hyper
+        The app to copy from.
+    dst : Hyper
+        The app to copy to.
+    services : Sequence[str]
+        Any of "data", "cache", and "search", copied in the order given.
+    batch_size : int
+        The most documents, cache keys, or search keys per write.
+    concurrency : int
+        The most batches written at a time, per service.
+    retries : int
+        How many times a failed write is retried.
+    cache_pattern : str
+        The cache keys to copy, see hyper.cache.query.
+    cache_ttl : str, optional
+        The ttl of copied cache keys, eg "1d".  Cache queries do not
+        return ttls, so by default copied keys do not expire.
+    search_keys : Iterable[str], optional
+        The search keys to copy.
+    checkpoint : str, optional
+        The path of the checkpoint file.
+    progress : Callable[[Dict], None], optional
+        Called after every written batch.
+
+    Returns
+    -------
+    {'ok': True, 'services': {service: {'docs': ..., 'batches': ...,
+    'failed': ..., 'elapsed': ..., 'docs_per_second': ...}}, 'elapsed':
+    ...}, where failed counts the documents hyper rejected, or, when a
+    batch fails, its NotOkResult with the service it failed in and the
+    same services.
+    Raises ValueError for unknown services, or when `src` and `dst` are the
+    same app and domain.  Only cloud connection strings have domains, so
+    other `src` and `dst` of the same connection string are the same app.
+    """
+    import requests
+
+    if isinstance(services, str):
+        services = [services]
+    unknown = [name for name in services if name not in COPY_SERVICES]
+    if unknown:
+        raise ValueError(
+            f"cannot copy {', '.join(unknown)}, "
+            f"only {', '.join(COPY_SERVICES)}"
+        )
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    source, target = _app(src), _app(dst)
+    if source == target:
+        raise ValueError(f"cannot copy {source} to itself")
+
+    state = _load_checkpoint(checkpoint, source, target)
+    started = time.monotonic()
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def data_batches(after: Optional[str]) -> Iterator[_Batch]:
+        # the last document copied starts the first page
+        seq = 0
+        for page in list_pages(src.data, batch_size, after):
+            if page and page[0]["_id"] == after:
+                page = page[1:]
+            if page:
+                yield _Batch(seq, page[-1]["_id"], page)
+                seq += 1
+
+    def write_data(batch: _Batch) -> Dict:
+        docs = [
+            {key: value for key, value in doc.items() if key != "_rev"}
+            for doc in batch.items
+        ]
+        result = call_with_retries(lambda: dst.data.bulk(docs), retries)
+        if not result.get("ok", False):
+            return result
+        return {"ok": True, "docs": len(docs), "failed": _rejected(result)}
+
+    def cache_batches(after: Any) -> Iterator[_Batch]:
+        pages = src.cache.iter_query(cache_pattern, page_size=batch_size)
+        for seq, page in enumerate(pages):
+            yield _Batch(seq, None, page)
+
+    def write_cache(batch: _Batch) -> Dict:
+        failed = 0
+        for doc in batch.items:
+            key, value = doc["key"], doc["value"]
+            result = call_with_retries(
+                lambda: dst.cache.set(key, value, cache_ttl), retries
+            )
+            if not result.get("ok", False):
+                if not _is_rejection(result):
+                    return result
+                failed += 1
+        return {"ok": True, "docs": len(batch.items), "failed": failed}
+
+    def search_batches(after: Optional[int]) -> Iterator[_Batch]:
+        keys: Iterable[str] = (
+            search_keys
+            if search_keys is not None
+            else (
+                doc["_id"]
+                for page in list_pages(src.data, batch_size)
+                for doc in page
+            )
+        )
+        yield from _chunks(islice(keys, after, None), batch_size, after or 0)
+
+    def write_search(batch: _Batch) -> Dict:
+        docs = []
+        for key in batch.items:
+            result = call_with_retries(lambda: src.search.get(key), retries)
+            if result.get("ok", False):
+                docs.append({**result.get("doc", {}), "_id": key})
+            elif result.get("status") != 404:
+                return result
+        if not docs:
+            return {"ok": True, "docs": 0, "failed": 0}
+
+        result = call_with_retries(lambda: dst.search.load(docs), retries)
+        if not result.get("ok", False):
+            return result
+        return {"ok": True, "docs": len(docs), "failed": _rejected(result)}
+
+    pipelines: Dict[
+        str,
+        Tuple[Callable[[Any], Iterator[_Batch]], Callable[[_Batch], Dict]],
+    ] = {
+        "data": (data_batches, write_data),
+        "cache": (cache_batches, write_cache),
+        "search": (search_batches, write_search),
+    }
+
+    for name in services:
+        service = state["services"].setdefault(
+            name, {"after": None, "docs": 0, "done": False}
+        )
+        # a cache copy cannot resume, so it starts over
+        if name == "cache" and not service["done"]:
+            service.update(after=None, docs=0)
+
+        stats: Dict[str, Any] = {
+            "docs": service["docs"],
+            "batches": 0,
+            "failed": 0,
+            "elapsed": 0.0,
+            "docs_per_second": 0.0,
+        }
+        results[name] = stats
+        if service["done"]:
+            continue
+
+        service_started = time.monotonic()
+        resumed_docs = service["docs"]
+
+        def commit(after: Any, result: Dict):
+            service["after"] = after
+            service["docs"] += result["docs"]
+            stats["docs"] = service["docs"]
+            stats["batches"] += 1
+            stats["failed"] += result["failed"]
+            stats["elapsed"] = time.monotonic() - service_started
+            stats["docs_per_second"] = (stats["docs"] - resumed_docs) / max(
+                stats["elapsed"], 1e-9
+            )
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, state)
+            if progress is not None:
+                progress({"service": name, **stats})
+
+        read, write = pipelines[name]
+        try:
+            failure = _pipeline(
+                read(service["after"]), write, concurrency, commit
+            )
+        except ListPagesError as error:
+            failure = error.result
+        except requests.HTTPError as error:
+            failure = {
+                "ok": False,
+                "status": getattr(error.response, "status_code", None),
+                "msg": str(error),
+            }
+        stats["elapsed"] = time.monotonic() - service_started
+        if failure:
+            return {
+                **failure,
+                "ok": False,
+                "service": name,
+                "services": results,
+                "elapsed": time.monotonic() - started,
+            }
+
+        service["done"] = True
+        if checkpoint is not None:
+            save_checkpoint(checkpoint, state)
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return {
+        "ok": True,
+        "services": results,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def _pipeline(
+    batches: Iterator[_Batch],
+    write: Callable[[_Batch], Dict],
+    concurrency: int,
+    commit: Callable[[Any, Dict], None],
+) -> Optional[Dict]:
+    failure: Dict[str, Any] = {}
+
+    def unsent(prefetched: Iterable[_Batch]) -> Iterator[_Batch]:
+        for batch in prefetched:
+            if failure:
+                return
+            yield batch
+
+    # batches written ahead of one still in flight, by seq, without
+    # their documents
+    written: Dict[int, Tuple[Any, Dict]] = {}
+    next_seq = 0
+    prefetched = _prefetched(batches, COPY_READ_AHEAD)
+    try:
+        for batch, result in iter_concurrently(
+            write, unsent(prefetched), concurrency
+        ):
+            if not result.get("ok", False):
+                failure = failure or result
+                continue
+
+            written[batch.seq] = (batch.after, result)
+            while next_seq in written:
+                after, done = written.pop(next_seq)
+                next_seq += 1
+                commit(after, done)
+    finally:
+        prefetched.close()
+    return failure or None
@@ -1,75 +1,36 @@
-import io
-from typing import Any, Dict, List, Optional
+import math
+from typing import Dict, Optional
 
-from typeguard import typechecked
-
-from hyper_connect.services import (
-    add_cache,
-    add_cache_async,
-    add_data,
-    add_data_async,
-    add_search,
-    add_search_async,
-    download,
-    download_async,
-    get_cache,
-    get_cache_async,
-    get_data,
-    get_data_async,
-    get_data_list,
-    get_data_list_async,
-    get_search,
-    get_search_async,
-    load_search,
-    load_search_async,
-    post_bulk,
-    post_bulk_async,
-    post_cache_query,
-    post_cache_query_async,
-    post_index,
-    post_index_async,
-    post_query,
-    post_query_async,
-    post_query_search,
-    post_query_search_async,
-    queue_enqueue,
-    queue_enqueue_async,
-    queue_errors,
-    queue_errors_async,
-    queue_queued,
-    queue_queued_async,
-    remove_cache,
-    remove_cache_async,
-    remove_data,
-    remove_data_async,
-    remove_search,
-    remove_search_async,
-    remove_storage,
-    remove_storage_async,
-    services,
-    services_async,
-    set_cache,
-    set_cache_async,
-    update_data,
-    update_data_async,
-    update_search,
-    update_search_async,
-    upload,
-    upload_async,
-)
 from hyper_connect.types import (
+    Compression,
     Hyper,
     HyperCache,
+    HyperConnection,
     HyperData,
     HyperInfo,
     HyperQueue,
     HyperSearch,
     HyperStorage,
-    ListOptions,
-    QueryOptions,
-    SearchQueryOptions,
+    RateLimit,
+    ServiceType,
 )
-from hyper_connect.utils import handle_response, handle_response_sync
+from hyper_connect.utils import (
+    COMPRESSION_THRESHOLD,
+    DEFAULT_TIMEOUT,
+    HEDGE_MAX_EXTRA,
+    AdaptiveConcurrencyTransport,
+    HedgedTransport,
+    LocalCache,
+    RateLimitedTransport,
+    Timeout,
+    Transport,
+    parse_ttl,
+    typechecked,
+)
+
+CACHE_L1_TTL: str = "30s"
+
+NEGATIVE_CACHE_TTL: str = "5s"
 
 """connects to a hyper cloud application
 
@@ -85,6 +46,59 @@ CONNECTION_STRING : str
     cloud://<key>:<secret>@cloud.hyper.io/<hyper application name>
 domain : str
     The service name. The default is "default".
+compression : Compression, optional
+    "gzip" or "deflate".  Compresses the request bodies of data query,
+    data bulk, and search load calls.  The default is None (uncompressed).
+compression_threshold : int
+    Minimum request body size, in bytes, before compression is applied.
+    The default is 1024.
+transport : Transport, optional
+    The transport requests are sent over.  The default is None, which uses
+    a keep-alive connection pool shared by every Hyper object in the process.
+cache_l1_size : int
+    The most cache values kept in process, in front of hyper cache.  Cache
+    gets of those keys skip the network.  The default is 0 (disabled).
+cache_l1_ttl : str
+    The longest a value is kept in process, eg "30s".  Writes made by other
+    clients are not seen until then.  The default is "30s".
+negative_cache_size : int
+    The most missing (404) data ids and cache keys remembered, per service.
+    Data and cache gets of those skip the network until this client writes
+    them, or negative_cache_ttl passes.  The default is 0 (disabled).
+negative_cache_ttl : str
+    How long a missing id or key is remembered, eg "5s".  Documents added
+    by other clients are not seen until then.  The default is "5s".
+conditional_cache_size : int
+    The most data docs, and storage objects of up to 1MB, kept with their
+    ETag or Last-Modified validators.  Repeat data gets and storage
+    downloads of those ask hyper to send them only if they changed.  The
+    default is 0 (disabled).
+timeout : Timeout
+    The seconds to wait for a connection to hyper, and then for each read
+    of its response, as (connect, read) or one number for both.  A call
+    that takes longer raises requests.Timeout.  The default is (3.05, 30).
+timeouts : Dict[ServiceType, Timeout], optional
+    Timeouts for some services, eg {"storage": (3.05, 300)}, in place of
+    timeout.  The default is None.
+hedge_percentile : float, optional
+    Hedges data and cache gets: when hyper has not answered one by this
+    percentile, 0 to 100, of recent get latencies, it is sent again and
+    the first response is used, eg 95.  The default is None (disabled).
+hedge_max_extra : float
+    The most hedged gets, as a share of all gets.  The default is 0.05.
+adaptive_concurrency : bool
+    Limits each service's requests in flight to a limit that grows while
+    latency stays flat and is cut when latency grows or hyper answers 429
+    or 503.  Requests over the limit wait.  The default is False.
+rate_limits : Dict[ServiceType, Dict[str, RateLimit]], optional
+    Client side rate limits per service, keyed by "*" for every method or
+    by a method, eg {"data": {"*": {"requests_per_second": 50}}}.
+    Requests wait for their turn rather than burst past hyper's quota.
+    The default is None.
+query_advisor : bool
+    Records the shape and latency of every data query in a QueryAdvisor,
+    hyper.data.advisor, which recommends indexes for the queries sent
+    without useIndex.  The default is False.
 
 Returns
 -------
@@ -95,418 +109,92 @@ Examples
 --------
 >>> connection_string: str = str(config["HYPER"])
 >>> hyper: Hyper = connect(connection_string)
+>>> hyper: Hyper = connect(connection_string, compression="gzip")
+>>> hyper: Hyper = connect(connection_string, cache_l1_size=10000)
+>>> hyper: Hyper = connect(connection_string, timeouts={"search": 2})
 """
 
 
 @typechecked
-def connect(CONNECTION_STRING: str, domain: str = "default") -> Hyper:
-
-    # /////////////////////////
-    #      BEGIN HyperData
-    # /////////////////////////
-
-    # /////////////////////////
-    #          ASYNC
-    # /////////////////////////
-
-    def add_data_doc_async(doc: Dict):
-        return add_data_async(doc, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def get_data_doc_async(id: str):
-        return get_data_async(id, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def list_data_docs_async(options: ListOptions):
-        return get_data_list_async(options, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def update_data_doc_async(id: str, doc: Dict):
-        return update_data_async(id, doc, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def remove_data_doc_async(id: str):
-        return remove_data_async(id, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def query_docs_async(selector: Dict, options: QueryOptions):
-        return post_query_async(
-            selector, options, CONNECTION_STRING, domain
-        ).then(handle_response)
-
-    def index_docs_async(name: str, fields: List[str]):
-        return post_index_async(name, fields, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def bulk_docs_async(docs: List[Dict]):
-        return post_bulk_async(docs, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    # ////////////////////////////
-    #           SYNC
-    # ////////////////////////////
-
-    def add_data_doc_sync(doc: Dict):
-        response = add_data(doc, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def get_data_doc_sync(id: str):
-        response = get_data(id, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def list_data_docs_sync(options: ListOptions):
-        response = get_data_list(options, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def update_data_doc_sync(id: str, doc: Dict):
-        response = update_data(id, doc, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def remove_data_doc_sync(id: str):
-        response = remove_data(id, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def query_docs_sync(selector: Dict, options: QueryOptions):
-        response = post_query(selector, options, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def index_docs_sync(name: str, fields: List[str]):
-        response = post_index(name, fields, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    def bulk_docs_sync(docs: List[Dict]):
-        response = post_bulk(docs, CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    hyper_data: HyperData = HyperData(
-        # Async
-        add_data_doc_async_fn=add_data_doc_async,
-        get_data_doc_async_fn=get_data_doc_async,
-        list_data_docs_async_fn=list_data_docs_async,
-        update_data_doc_async_fn=update_data_doc_async,
-        remove_data_doc_async_fn=remove_data_doc_async,
-        query_docs_async_fn=query_docs_async,
-        index_docs_async_fn=index_docs_async,
-        bulk_docs_async_fn=bulk_docs_async,
-        # Sync
-        add_data_doc_sync_fn=add_data_doc_sync,
-        get_data_doc_sync_fn=get_data_doc_sync,
-        list_data_docs_sync_fn=list_data_docs_sync,
-        update_data_doc_sync_fn=update_data_doc_sync,
-        remove_data_doc_sync_fn=remove_data_doc_sync,
-        query_docs_sync_fn=query_docs_sync,
-        index_docs_sync_fn=index_docs_sync,
-        bulk_docs_sync_fn=bulk_docs_sync,
-    )
-    # /////////////////////////
-    #      END HyperData
-    # /////////////////////////
-
-    # ////////////////////////////
-    #     BEGIN HyperCache
-    # ////////////////////////////
-
-    # ////////////////////////////
-    #          ASYNC
-    # ////////////////////////////
-
-    def add_cache_doc_async(key: str, value: Any, ttl: Optional[str]):
-        return add_cache_async(
-            key, value, ttl, CONNECTION_STRING, domain
-        ).then(handle_response)
-
-    def get_cache_doc_async(key: str):
-        return get_cache_async(key, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def set_cache_doc_async(key: str, value: Any, ttl: Optional[str]):
-        return set_cache_async(
-            key, value, ttl, CONNECTION_STRING, domain
-        ).then(handle_response)
-
-    def remove_cache_doc_async(key: str):
-        return remove_cache_async(key, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def post_cache_query_doc_async(pattern: str):
-        return post_cache_query_async(pattern, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    # ////////////////////////////
-    #            SYNC
-    # ////////////////////////////
-    def add_cache_doc_sync(key: str, value: Any, ttl: Optional[str]):
-        response = add_cache(key, value, ttl, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def get_cache_doc_sync(key: str):
-        response = get_cache(key, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def set_cache_doc_sync(key: str, value: Any, ttl: Optional[str]):
-        response = set_cache(key, value, ttl, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def remove_cache_doc_sync(key: str):
-        response = remove_cache(key, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def post_cache_query_doc_sync(pattern: str):
-        response = post_cache_query(pattern, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    hyper_cache: HyperCache = HyperCache(
-        # Async
-        add_cache_async_fn=add_cache_doc_async,
-        get_cache_async_fn=get_cache_doc_async,
-        set_cache_async_fn=set_cache_doc_async,
-        remove_cache_async_fn=remove_cache_doc_async,
-        post_cache_query_async_fn=post_cache_query_doc_async,
-        # Sync
-        add_cache_sync_fn=add_cache_doc_sync,
-        get_cache_sync_fn=get_cache_doc_sync,
-        set_cache_sync_fn=set_cache_doc_sync,
-        remove_cache_sync_fn=remove_cache_doc_sync,
-        post_cache_query_sync_fn=post_cache_query_doc_sync,
-    )
-    # ////////////////////////////
-    #     END HyperCache
-    # ////////////////////////////
-
-    # ////////////////////////////
-    #      BEGIN HyperSearch
-    # ////////////////////////////
-
-    # ////////////////////////////
-    #          ASYNC
-    # ////////////////////////////
-
-    def add_search_doc_async(key: str, doc: Dict):
-        return add_search_async(key, doc, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def remove_search_doc_async(key: str):
-        return remove_search_async(key, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def get_search_doc_async(key: str):
-        return get_search_async(key, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def update_search_doc_async(key: str, doc: Dict):
-        return update_search_async(key, doc, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def load_search_docs_async(docs: List[Dict]):
-        return load_search_async(docs, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def post_query_search_docs_async(query: str, options: SearchQueryOptions):
-        return post_query_search_async(
-            query, options, CONNECTION_STRING, domain
-        ).then(handle_response)
-
-    # ////////////////////////////
-    #          SYNC
-    # ////////////////////////////
-    def add_search_doc_sync(key: str, doc: Dict):
-        response = add_search(key, doc, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def remove_search_doc_sync(key: str):
-        response = remove_search(key, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def get_search_doc_sync(key: str):
-        response = get_search(key, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def update_search_doc_sync(key: str, doc: Dict):
-        response = update_search(key, doc, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def load_search_docs_sync(docs: List[Dict]):
-        response = load_search(docs, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def post_query_search_docs_sync(query: str, options: SearchQueryOptions):
-        response = post_query_search(query, options, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    hyper_search: HyperSearch = HyperSearch(
-        # Async
-        add_search_doc_async_fn=add_search_doc_async,
-        remove_search_doc_async_fn=remove_search_doc_async,
-        get_search_doc_async_fn=get_search_doc_async,
-        update_search_doc_async_fn=update_search_doc_async,
-        load_search_async_fn=load_search_docs_async,
-        query_search_async_fn=post_query_search_docs_async,
-        # Sync
-        add_search_doc_sync_fn=add_search_doc_sync,
-        remove_search_doc_sync_fn=remove_search_doc_sync,
-        get_search_doc_sync_fn=get_search_doc_sync,
-        update_search_doc_sync_fn=update_search_doc_sync,
-        load_search_sync_fn=load_search_docs_sync,
-        query_search_sync_fn=post_query_search_docs_sync,
-    )
-
-    # ////////////////////////////
-    #      END HyperSearch
-    # ////////////////////////////
-
-    # ///////////////////////////
-    #      BEGIN HyperStorage
-    # ///////////////////////////
-
-    # ////////////////////////////
-    #          ASYNC
-    # ////////////////////////////
-
-    def upload_doc_async(name: str, data: io.BufferedReader):
-        return upload_async(name, data, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def download_doc_async(name: str):
-        return download_async(name, CONNECTION_STRING, domain)
-
-    def remove_storage_doc_async(name: str):
-        return remove_storage_async(name, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    # ////////////////////////////
-    #            SYNC
-    # ////////////////////////////
-
-    def upload_doc_sync(name: str, data: io.BufferedReader):
-        response = upload(name, data, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def download_doc_sync(name: str):
-        return download(name, CONNECTION_STRING, domain)
-
-    def remove_storage_doc_sync(name: str):
-        response = remove_storage(name, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    hyper_storage: HyperStorage = HyperStorage(
-        # Async
-        upload_async_fn=upload_doc_async,
-        download_async_fn=download_doc_async,
-        remove_async_fn=remove_storage_doc_async,
-        # Sync
-        upload_sync_fn=upload_doc_sync,
-        download_sync_fn=download_doc_sync,
-        remove_sync_fn=remove_storage_doc_sync,
+def connect(
+    CONNECTION_STRING: str,
+    domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
+    cache_l1_size: int = 0,
+    cache_l1_ttl: str = CACHE_L1_TTL,
+    negative_cache_size: int = 0,
+    negative_cache_ttl: str = NEGATIVE_CACHE_TTL,
+    conditional_cache_size: int = 0,
+    timeout: Timeout = DEFAULT_TIMEOUT,
+    timeouts: Optional[Dict[ServiceType, Timeout]] = None,
+    hedge_percentile: Optional[float] = None,
+    hedge_max_extra: float = HEDGE_MAX_EXTRA,
+    adaptive_concurrency: bool = False,
+    rate_limits: Optional[Dict[ServiceType, Dict[str, RateLimit]]] = None,
+    query_advisor: bool = False,
+) -> Hyper:
+    def connection(
+        service: ServiceType, hedged: bool = False
+    ) -> HyperConnection:
+        # latencies and limits are tracked per service
+        service_transport = transport
+        if adaptive_concurrency:
+            service_transport = AdaptiveConcurrencyTransport(service_transport)
+        if rate_limits and service in rate_limits:
+            # waits for its turn before taking a concurrency slot
+            service_transport = RateLimitedTransport(
+                service_transport, rate_limits[service]
+            )
+        if hedged and hedge_percentile is not None:
+            service_transport = HedgedTransport(
+                service_transport, hedge_percentile, hedge_max_extra
+            )
+        return HyperConnection(
+            CONNECTION_STRING,
+            domain,
+            compression,
+            compression_threshold,
+            service_transport,
+            (timeouts or {}).get(service, timeout),
+        )
+
+    l1 = (
+        LocalCache(cache_l1_size, parse_ttl(cache_l1_ttl))
+        if cache_l1_size > 0
+        else None
     )
-    # ///////////////////////////
-    #      END HyperStorage
-    # ///////////////////////////
-
-    # /////////////////////////
-    #      BEGIN HyperQueue
-    # /////////////////////////
 
-    # ////////////////////////////
-    #          ASYNC
-    # ////////////////////////////
+    def missing() -> Optional[LocalCache]:
+        if negative_cache_size > 0:
+            return LocalCache(
+                negative_cache_size, parse_ttl(negative_cache_ttl)
+            )
+        return None
 
-    def enqueue_job_async(job: Dict):
-        return queue_enqueue_async(job, CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    def list_job_errors_async():
-        return queue_errors_async(CONNECTION_STRING, domain).then(
-            handle_response
-        )
+    def versions() -> Optional[LocalCache]:
+        # kept copies are revalidated on every read, so they never expire
+        if conditional_cache_size > 0:
+            return LocalCache(conditional_cache_size, math.inf)
+        return None
 
-    def list_job_queued_async():
-        return queue_queued_async(CONNECTION_STRING, domain).then(
-            handle_response
-        )
-
-    # ////////////////////////////
-    #            SYNC
-    # ////////////////////////////
-
-    def enqueue_job_sync(job: Dict):
-        response = queue_enqueue(job, CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def list_job_errors_sync():
-        response = queue_errors(CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    def list_job_queued_sync():
-        response = queue_queued(CONNECTION_STRING, domain)
-        return handle_response_sync(response)
-
-    hyper_queue: HyperQueue = HyperQueue(
-        # Async
-        enqueue_async_fn=enqueue_job_async,
-        list_job_errors_async_fn=list_job_errors_async,
-        list_job_queued_async_fn=list_job_queued_async,
-        # Sync
-        enqueue_sync_fn=enqueue_job_sync,
-        list_job_errors_sync_fn=list_job_errors_sync,
-        list_job_queued_sync_fn=list_job_queued_sync,
-    )
-    # /////////////////////////
-    #      END HyperQueue
-    # /////////////////////////
-
-    # /////////////////////////
-    #      BEGIN HyperInfo
-    # /////////////////////////
-
-    def get_services_async():
-        return services_async(CONNECTION_STRING, domain).then(handle_response)
-
-    def get_services_sync():
-        response = services(CONNECTION_STRING, domain)
-        result = handle_response_sync(response)
-        return result
-
-    hyper_info: HyperInfo = HyperInfo(
-        services_async_fn=get_services_async, services_fn=get_services_sync
-    )
+    advisor = None
+    if query_advisor:
+        # imported here, it needs ramda
+        from hyper_connect._index_advisor import QueryAdvisor
 
-    # /////////////////////////
-    #      END HyperInfo
-    # /////////////////////////
+        advisor = QueryAdvisor()
 
     hyper: Hyper = Hyper(
-        data=hyper_data,
-        cache=hyper_cache,
-        search=hyper_search,
-        storage=hyper_storage,
-        queue=hyper_queue,
-        info=hyper_info,
+        data=HyperData(
+            connection("data", True), missing(), versions(), advisor
+        ),
+        cache=HyperCache(connection("cache", True), l1, missing()),
+        search=HyperSearch(connection("search")),
+        storage=HyperStorage(connection("storage"), versions()),
+        queue=HyperQueue(connection("queue")),
+        info=HyperInfo(connection("info")),
     )
 
     return hyper
@@ -0,0 +1,318 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from hyper_connect.types import QueryOptions
+from hyper_connect.utils import to_data_query
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which a query without use_index is logged as slow
+SLOW_QUERY_SECONDS: float = 1.0
+
+_RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte"}
+
+# Operators an index on a field cannot narrow the scan for
+_SCAN_OPERATORS = {"$or", "$nor", "$not"}
+
+
+class QueryShape(NamedTuple):
+    """
+    What an index for a query depends on: the fields it matches exactly,
+    the fields it sorts by, in order, the fields it matches a range of,
+    any other fields it filters on, and the index it asked for.
+    """
+
+    equality: Tuple[str, ...]
+    sort: Tuple[str, ...]
+    range: Tuple[str, ...]
+    other: Tuple[str, ...]
+    use_index: Optional[str]
+
+
+def query_shape(query: Dict) -> QueryShape:
+    """
+    Returns the shape of a data query body, as built by to_data_query.
+    Queries that differ only in the values they match have one shape.
+    """
+    equality: List[str] = []
+    range_: List[str] = []
+    other: List[str] = []
+
+    def visit(selector: Dict, prefix: str, scan: bool):
+        for key, value in selector.items():
+            if key == "$and":
+                for clause in value:
+                    visit(clause, prefix, scan)
+            elif key in _SCAN_OPERATORS:
+                for clause in value if isinstance(value, list) else [value]:
+                    visit(clause, prefix, True)
+            elif key.startswith("$"):
+                continue
+            elif _is_operators(value):
+                operators = set(value)
+                if scan:
+                    other.append(prefix + key)
+                elif operators <= {"$eq"}:
+                    equality.append(prefix + key)
+                elif operators <= _RANGE_OPERATORS | {"$eq"}:
+                    range_.append(prefix + key)
+                else:
+                    other.append(prefix + key)
+            elif isinstance(value, dict) and value:
+                # {"director": {"name": ...}} matches director.name
+                visit(value, prefix + key + ".", scan)
+            else:
+                (other if scan else equality).append(prefix + key)
+
+    visit(query.get("selector") or {}, "", False)
+
+    sort = tuple(
+        field for clause in query.get("sort") or [] for field in clause
+    )
+    return QueryShape(
+        equality=tuple(sorted(set(equality))),
+        sort=sort,
+        range=tuple(sorted(set(range_) - set(equality))),
+        other=tuple(sorted(set(other) - set(equality) - set(range_))),
+        use_index=query.get("use_index"),
+    )
+
+
+def _is_operators(value: Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(key.startswith("$") for key in value)
+    )
+
+
+def index_fields(shape: QueryShape) -> List[str]:
+    """
+    Returns the fields of an index for a query shape: the equality fields,
+    then the sort fields, then the range fields.  Falls back to the other
+    fields filtered on when there are none.
+    """
+    fields = list(shape.equality)
+    for field in shape.sort + shape.range:
+        if field not in fields:
+            fields.append(field)
+    return fields or list(shape.other)
+
+
+def index_name(fields: List[str]) -> str:
+    """Returns a name for an index on `fields`, eg idx_type_published."""
+    return "idx_" + "_".join(re.sub(r"\W", "_", field) for field in fields)
+
+
+class _ShapeStats:
+    __slots__ = ("count", "total_seconds", "max_seconds", "errors", "example")
+
+    def __init__(self, selector: Dict):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+        self.example = selector
+
+
+class QueryAdvisor:
+    """
+    Records the shape and latency of the data queries a Hyper object
+    sends, and recommends indexes for the shapes sent without use_index.
+
+    Enable it with connect(..., query_advisor=True) and read it from
+    hyper.data.advisor.  Queries without use_index that take longer than
+    `slow_query_seconds` are logged as warnings, once per shape.  Apply
+    the recommendations with hyper.data.ensure_indexes().
+
+    Example:
+
+        hyper = connect(connection_string, query_advisor=True)
+        ...
+        for recommendation in hyper.data.advisor.recommendations():
+            print(recommendation["name"], recommendation["fields"])
+
+        hyper.data.ensure_indexes()
+
+    ...
+
+    Attributes
+    ----------
+    slow_query_seconds : float
+        Seconds after which a query without use_index is logged.
+    """
+
+    def __init__(self, slow_query_seconds: float = SLOW_QUERY_SECONDS):
+        self.slow_query_seconds = slow_query_seconds
+        self._shapes: Dict[QueryShape, _ShapeStats] = {}
+        self._warned: set = set()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        selector: Any,
+        options: Optional[QueryOptions],
+        seconds: float,
+        result: Any = None,
+    ):
+        """Records a query and how long hyper took to answer it."""
+        shape = query_shape(to_data_query(selector, options))
+        failed = not (isinstance(result, dict) and result.get("ok", True))
+
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = _ShapeStats(selector)
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.errors += failed
+
+            warn = (
+                shape.use_index is None
+                and seconds > self.slow_query_seconds
+                and shape not in self._warned
+            )
+            if warn:
+                self._warned.add(shape)
+
+        if warn:
+            logger.warning(
+                "slow data query without use_index (%.3fs), consider an "
+                "index on %s: %s",
+                seconds,
+                index_fields(shape),
+                json.dumps(selector),
+            )
+
+    def shapes(self) -> List[Dict[str, Any]]:
+        """
+        Returns every query shape recorded, with its count and latency,
+        the most total time first.
+        """
+        with self._lock:
+            items = list(self._shapes.items())
+
+        return [
+            {
+                "equality": list(shape.equality),
+                "sort": list(shape.sort),
+                "range": list(shape.range),
+                "other": list(shape.other),
+                "use_index": shape.use_index,
+                "count": stats.count,
+                "errors": stats.errors,
+                "mean_seconds": stats.total_seconds / stats.count,
+                "max_seconds": stats.max_seconds,
+                "total_seconds": stats.total_seconds,
+                "example": stats.example,
+            }
+            for shape, stats in sorted(
+                items, key=lambda item: -item[1].total_seconds
+            )
+        ]
+
+    def unindexed(self) -> List[Dict[str, Any]]:
+        """Returns the shapes of queries sent without use_index."""
+        return [shape for shape in self.shapes() if shape["use_index"] is None]
+
+    def recommendations(
+        self, min_count: int = 1, min_mean_seconds: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the indexes that would serve the queries sent without
+        use_index, the most total query time first.  Shapes that need the
+        same index are combined.  Each has the index's name and fields,
+        for hyper.data.index or ensure_indexes, and the queries it serves.
+        """
+        recommended: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        for shape in self.unindexed():
+            if (
+                shape["count"] < min_count
+                or shape["mean_seconds"] < min_mean_seconds
+            ):
+                continue
+            fields = index_fields(
+                QueryShape(
+                    tuple(shape["equality"]),
+                    tuple(shape["sort"]),
+                    tuple(shape["range"]),
+                    tuple(shape["other"]),
+                    None,
+                )
+            )
+            if not fields:
+                continue
+
+            recommendation = recommended.setdefault(
+                tuple(fields),
+                {
+                    "name": index_name(fields),
+                    "fields": fields,
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "examples": [],
+                },
+            )
+            recommendation["count"] += shape["count"]
+            recommendation["total_seconds"] += shape["total_seconds"]
+            recommendation["examples"].append(shape["example"])
+
+        return sorted(
+            recommended.values(), key=lambda index: -index["total_seconds"]
+        )
+
+    def clear(self):
+        with self._lock:
+            self._shapes.clear()
+            self._warned.clear()
+
+
+class IndexRegistry:
+    """
+    Remembers the data indexes created through ensure_indexes, so they are
+    not created again.  Kept in memory, or in a JSON file at `path` that is
+    shared by processes and deploys.  Indexes are keyed by the hyper app,
+    domain, and index name; an index whose fields changed is created again.
+
+    Example:
+
+        registry = IndexRegistry(".hyper-indexes.json")
+        hyper.data.ensure_indexes(indexes, registry=registry)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, List[str]] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                self._indexes = json.load(file)
+
+    @staticmethod
+    def _key(app: str, name: str) -> str:
+        return f"{app}#{name}"
+
+    def has(self, app: str, name: str, fields: List[str]) -> bool:
+        with self._lock:
+            return self._indexes.get(self._key(app, name)) == list(fields)
+
+    def add(self, app: str, name: str, fields: List[str]):
+        with self._lock:
+            self._indexes[self._key(app, name)] = list(fields)
+            if self.path is not None:
+                self._save()
+
+    def _save(self):
+        # written to a temporary file first, so a crash never leaves a
+        # half written registry
+        directory = os.path.dirname(os.path.abspath(self.path or ""))
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            json.dump(self._indexes, file, indent=2, sort_keys=True)
+        os.replace(temporary, self.path or "")
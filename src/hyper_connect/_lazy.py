@@ -0,0 +1,53 @@
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, List[str]]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds module level __getattr__ and __dir__ functions (PEP 562) that
+    import a package's submodules on first use.
+
+    Example:
+
+        __getattr__, __dir__ = lazy_exports(
+            __name__, {"._data": ["add_data", "get_data"]}
+        )
+
+    Parameters
+    ----------
+    package : str
+        The package's __name__.
+    exports : Dict[str, List[str]]
+        Relative submodule names mapped to the names they export.
+
+    Returns
+    -------
+    The (__getattr__, __dir__) pair for the package.
+    """
+    owners: Dict[str, str] = {
+        name: submodule
+        for submodule, names in exports.items()
+        for name in names
+    }
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        submodule = owners.get(name)
+        if submodule is None:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            )
+        # __import__ rather than importlib.import_module so that the import
+        # shows up in `python -X importtime`
+        module = __import__(package + submodule, fromlist=[name])
+        value = getattr(module, name)
+        # cache on the package so later lookups skip __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(owners))
+
+    return __getattr__, __dir__
@@ -0,0 +1,214 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set
+
+from hyper_connect.utils import format_ttl, parse_ttl
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperCache
+
+logger = logging.getLogger(__name__)
+
+MEMOIZE_TTL: str = "5m"
+
+# How long past its ttl a value may still be served while it is refreshed
+MEMOIZE_STALE_TTL: str = "1h"
+
+# Larger values refresh earlier.  1.0 is the XFetch paper's default.
+MEMOIZE_BETA: float = 1.0
+
+
+def default_key(fn: Callable, args: tuple, kwargs: Dict) -> str:
+    """
+    Derives a cache key from a function and its arguments.  Arguments are
+    serialized as JSON, falling back to repr for other types.
+    """
+    raw = json.dumps(
+        [fn.__module__, fn.__qualname__, args, kwargs],
+        sort_keys=True,
+        default=repr,
+    )
+    return "memo-" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+
+class _Memoized:
+    """The shared state of one memoized function."""
+
+    def __init__(
+        self,
+        cache: "HyperCache",
+        fn: Callable,
+        ttl: str,
+        stale_ttl: str,
+        key: Optional[Callable[..., str]],
+        beta: float,
+    ):
+        # Any: the _async methods are annotated with the result they
+        # resolve to rather than with Promise
+        self.cache: Any = cache
+        self.fn = fn
+        self.ttl = parse_ttl(ttl)
+        self.cache_ttl = format_ttl(self.ttl + parse_ttl(stale_ttl))
+        self.key = key
+        self.beta = beta
+        self.refreshing: Set[str] = set()
+        self.lock = threading.Lock()
+        # the event loop only keeps weak references to tasks
+        self.tasks: Set["asyncio.Task"] = set()
+
+    def key_for(self, args: tuple, kwargs: Dict) -> str:
+        if self.key is not None:
+            return self.key(*args, **kwargs)
+        return default_key(self.fn, args, kwargs)
+
+    def envelope(self, value: Any, delta: float) -> Dict:
+        return {
+            "value": value,
+            "expires": time.time() + self.ttl,
+            "delta": delta,
+        }
+
+    def check(self, cached: Any) -> Optional[str]:
+        """
+        Returns "fresh" or "stale" for a cached envelope, or None when it
+        is missing.  A fresh value is reported stale early, with a chance
+        that grows as its expiry nears, so one caller refreshes it before
+        every caller misses at once (XFetch).
+        """
+        if not isinstance(cached, dict) or cached.get("status") != 200:
+            return None
+        if "expires" not in cached or "value" not in cached:
+            return None
+
+        # 1 - random() is in (0, 1], so log never sees 0
+        early = (
+            cached.get("delta", 0) * self.beta * -math.log(1 - random.random())
+        )
+        if time.time() + early < cached["expires"]:
+            return "fresh"
+        return "stale"
+
+    def claim_refresh(self, key: str) -> bool:
+        with self.lock:
+            if key in self.refreshing:
+                return False
+            self.refreshing.add(key)
+            return True
+
+    def release_refresh(self, key: str):
+        with self.lock:
+            self.refreshing.discard(key)
+
+
+def memoize(
+    cache: "HyperCache",
+    ttl: str = MEMOIZE_TTL,
+    key: Optional[Callable[..., str]] = None,
+    stale_ttl: str = MEMOIZE_STALE_TTL,
+    beta: float = MEMOIZE_BETA,
+) -> Callable[[Callable], Callable]:
+    """
+    Returns a decorator that caches a function's results in hyper cache.
+
+    See HyperCache.memoize.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        memo = _Memoized(cache, fn, ttl, stale_ttl, key, beta)
+
+        if inspect.iscoroutinefunction(fn):
+            return _memoize_async(memo)
+        return _memoize_sync(memo)
+
+    return decorate
+
+
+def _memoize_sync(memo: _Memoized) -> Callable:
+    def compute_and_store(key: str, args: tuple, kwargs: Dict) -> Any:
+        start = time.monotonic()
+        value = memo.fn(*args, **kwargs)
+        envelope = memo.envelope(value, time.monotonic() - start)
+        try:
+            memo.cache.set(key, envelope, memo.cache_ttl)
+        except Exception:
+            logger.exception("could not cache %s", key)
+        return value
+
+    def refresh(key: str, args: tuple, kwargs: Dict):
+        try:
+            compute_and_store(key, args, kwargs)
+        except Exception:
+            logger.exception("background refresh of %s failed", key)
+        finally:
+            memo.release_refresh(key)
+
+    @functools.wraps(memo.fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = memo.key_for(args, kwargs)
+        cached: Any
+        try:
+            cached = memo.cache.get(key)
+        except Exception:
+            logger.exception("could not read %s from the cache", key)
+            cached = None
+
+        state = memo.check(cached)
+        if state is None:
+            return compute_and_store(key, args, kwargs)
+
+        if state == "stale" and memo.claim_refresh(key):
+            threading.Thread(
+                target=refresh, args=(key, args, kwargs), daemon=True
+            ).start()
+        return cached["value"]
+
+    return wrapper
+
+
+def _memoize_async(memo: _Memoized) -> Callable:
+    async def compute_and_store(key: str, args: tuple, kwargs: Dict) -> Any:
+        start = time.monotonic()
+        value = await memo.fn(*args, **kwargs)
+        envelope = memo.envelope(value, time.monotonic() - start)
+        try:
+            await memo.cache.set_async(key, envelope, memo.cache_ttl)
+        except Exception:
+            logger.exception("could not cache %s", key)
+        return value
+
+    async def refresh(key: str, args: tuple, kwargs: Dict):
+        try:
+            await compute_and_store(key, args, kwargs)
+        except Exception:
+            logger.exception("background refresh of %s failed", key)
+        finally:
+            memo.release_refresh(key)
+
+    @functools.wraps(memo.fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = memo.key_for(args, kwargs)
+        try:
+            cached = await memo.cache.get_async(key)
+        except Exception:
+            logger.exception("could not read %s from the cache", key)
+            cached = None
+
+        state = memo.check(cached)
+        if state is None:
+            return await compute_and_store(key, args, kwargs)
+
+        if state == "stale" and memo.claim_refresh(key):
+            task = asyncio.ensure_future(refresh(key, args, kwargs))
+            memo.tasks.add(task)
+            task.add_done_callback(memo.tasks.discard)
+        return cached["value"]
+
+    return wrapper
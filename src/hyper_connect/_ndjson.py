@@ -0,0 +1,382 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from hyper_connect.utils import (
+    ListPagesError,
+    call_with_retries,
+    iter_concurrently,
+    list_pages,
+    save_checkpoint,
+)
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperData
+
+EXPORT_PAGE_SIZE: int = 1000
+
+IMPORT_BATCH_SIZE: int = 500
+
+# hyper rejects bulk requests larger than 10MB
+IMPORT_MAX_BATCH_BYTES: int = 4 * 1024 * 1024
+
+IMPORT_CONCURRENCY: int = 4
+IMPORT_RETRIES: int = 2
+
+# A file path, or an open file or stream
+Target = Union[str, "os.PathLike[str]", IO]
+
+Progress = Callable[[Dict[str, Any]], None]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def export_data(
+    data: "HyperData",
+    target: Target,
+    selector: Optional[Dict] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+    compress: Optional[bool] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Writes the documents of a data service, or those matching `selector`,
+    to `target` as newline delimited JSON, one document per line.
+
+    Every document is read with hyper.data.list, a page at a time in _id
+    order, or with hyper.data.iter_query when there is a selector.  Each
+    page is written before the next is read, so memory holds one page
+    whatever the size of the data service.
+
+    A path is written to a temporary file that replaces it once every
+    document is written, so a failed export never leaves half a backup.
+    Paths ending in ".gz" are gzipped unless `compress` is False.  Open
+    files and streams are written to as they are, binary or text, and are
+    left open; gzip needs a binary stream.
+
+    `progress` is called after every page with the documents and bytes
+    written so far and the seconds taken.
+
+    Example:
+
+        hyper.data.export("movies.ndjson.gz", {"type": "movie"})
+
+    Returns
+    -------
+    {'ok': True, 'docs': ..., 'bytes': ...}, with bytes before
+    compression, or a NotOkResult with the docs written before hyper
+    failed.
+    """
+    import requests
+
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    if compress is None:
+        compress = isinstance(target, (str, os.PathLike)) and os.fspath(
+            target
+        ).endswith(".gz")
+
+    pages = (
+        list_pages(data, page_size)
+        if selector is None
+        else data.iter_query(selector, None, page_size)
+    )
+
+    started = time.monotonic()
+    stats: Dict[str, Any] = {"docs": 0, "bytes": 0}
+
+    def write_pages(write: Callable[[bytes], Any]):
+        for page in pages:
+            lines = "".join(
+                json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+                + "\n"
+                for doc in page
+            ).encode("utf-8")
+            write(lines)
+            stats["docs"] += len(page)
+            stats["bytes"] += len(lines)
+            if progress is not None:
+                progress({**stats, "elapsed": time.monotonic() - started})
+
+    try:
+        if isinstance(target, (str, os.PathLike)):
+            _export_to_path(os.fspath(target), compress, write_pages)
+        else:
+            _export_to_stream(target, compress, write_pages)
+    except ListPagesError as error:
+        return {**error.result, "docs": stats["docs"]}
+    except requests.HTTPError as error:
+        return {
+            "ok": False,
+            "status": getattr(error.response, "status_code", None),
+            "msg": str(error),
+            "docs": stats["docs"],
+        }
+    return {"ok": True, **stats}
+
+
+def _export_to_path(
+    path: str, compress: bool, write_pages: Callable[..., None]
+):
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            _export_to_stream(file, compress, write_pages)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def _export_to_stream(
+    stream: IO, compress: bool, write_pages: Callable[..., None]
+):
+    if isinstance(stream, io.TextIOBase):
+        if compress:
+            raise ValueError("gzip exports need a binary stream")
+        write_pages(lambda lines: stream.write(lines.decode("utf-8")))
+    elif compress:
+        with gzip.GzipFile(fileobj=stream, mode="wb") as zipped:
+            write_pages(zipped.write)
+    else:
+        write_pages(stream.write)
+
+
+class _Batch(NamedTuple):
+    seq: int
+    # the batch's first line and the line after its last, from 0
+    start: int
+    end: int
+    docs: List[Dict]
+    size: int
+
+
+def _read_lines(source: Target) -> Iterator[Union[str, bytes]]:
+    if not isinstance(source, (str, os.PathLike)):
+        yield from _gunzipped(source)
+        return
+
+    with open(source, "rb") as file:
+        yield from _gunzipped(file)
+
+
+class _RawReader(io.RawIOBase):
+    """
+    Reads a binary stream, eg an io.BytesIO, for an io.BufferedReader, and
+    leaves it open when closed.
+    """
+
+    def __init__(self, stream: IO):
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _gunzipped(stream: IO) -> Iterable[Union[str, bytes]]:
+    if isinstance(stream, io.TextIOBase) or not isinstance(
+        stream.read(0), bytes
+    ):
+        return stream
+    # gzip is told apart by its first bytes, which need peeking
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(_RawReader(stream))
+    if stream.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return stream
+
+
+def _batches(
+    lines: Iterable[Union[str, bytes]],
+    start: int,
+    batch_size: int,
+    max_batch_bytes: int,
+) -> Generator[_Batch, None, None]:
+    seq = 0
+    first = start
+    docs: List[Dict] = []
+    size = 0
+    number = start - 1
+
+    for number, line in enumerate(lines):
+        if number < start or not line.strip():
+            continue
+        # bytes, not characters, count towards max_batch_bytes
+        line_size = len(line if isinstance(line, bytes) else line.encode())
+        if docs and (
+            len(docs) >= batch_size or size + line_size > max_batch_bytes
+        ):
+            yield _Batch(seq, first, number, docs, size)
+            seq += 1
+            first = number
+            docs = []
+            size = 0
+
+        try:
+            docs.append(json.loads(line))
+        except ValueError as error:
+            raise ValueError(
+                f"line {number + 1} is not a JSON document: {error}"
+            ) from error
+        size += line_size
+
+    if docs:
+        yield _Batch(seq, first, number + 1, docs, size)
+
+
+def _load_checkpoint(path: Optional[str], source: str) -> Dict[str, Any]:
+    if path is None or not os.path.exists(path):
+        return {"source": source, "line": 0, "docs": 0}
+
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    if checkpoint.get("source") != source:
+        raise ValueError(
+            f"checkpoint {path} is for {checkpoint.get('source')!r}, "
+            f"not {source!r}"
+        )
+    return checkpoint
+
+
+def import_data(
+    data: "HyperData",
+    source: Target,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    max_batch_bytes: int = IMPORT_MAX_BATCH_BYTES,
+    concurrency: int = IMPORT_CONCURRENCY,
+    retries: int = IMPORT_RETRIES,
+    checkpoint: Optional[str] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[str, Any]:
+    """
+    Writes the documents of a newline delimited JSON file, eg one written
+    by export_data, to a data service with hyper.data.bulk.
+
+    Lines are read as batches are sent, so memory holds the batches in
+    flight, not the file.  A batch holds up to `batch_size` documents and
+    `max_batch_bytes` of JSON, and `concurrency` batches are sent at a
+    time.  Gzipped files and binary streams are read as they are, and
+    open streams are left open.  Blank lines are skipped.  Failed batches
+    are retried like hyper.queue.enqueue_many.
+
+    With a `checkpoint` path, the line after the last batch hyper accepted,
+    with every batch before it, is saved there after each batch.  When a
+    batch fails for good, no more batches are sent and the checkpoint
+    stays; importing the same source with the same checkpoint carries on
+    from it.  Batches after the checkpoint that were accepted before the
+    failure are sent again.  The checkpoint is removed once the whole file
+    is imported.
+
+    `progress` is called after each accepted batch with the documents,
+    batches, and bytes imported so far, the documents hyper rejected, the
+    checkpoint line, and the seconds taken.
+
+    Example:
+
+        hyper.data.import_(
+            "movies.ndjson.gz", checkpoint="movies.checkpoint", progress=print
+        )
+
+    Returns
+    -------
+    {'ok': True, 'docs': ..., 'failed': ..., 'line': ...}, where failed
+    counts the documents hyper rejected in accepted batches, eg conflicts.
+    When a batch fails, its NotOkResult with the same counts.
+    Raises ValueError at the first line that is not JSON.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    name = (
+        os.path.abspath(source)
+        if isinstance(source, (str, os.PathLike))
+        else "<stream>"
+    )
+    state = _load_checkpoint(checkpoint, name)
+    stats: Dict[str, Any] = {
+        "docs": state["docs"],
+        "batches": 0,
+        "bytes": 0,
+        "failed": 0,
+        "line": state["line"],
+    }
+    started = time.monotonic()
+    failure: Dict[str, Any] = {}
+
+    def send(batch: _Batch) -> Dict:
+        return call_with_retries(lambda: data.bulk(batch.docs), retries)
+
+    def unsent(batches: Iterable[_Batch]) -> Iterator[_Batch]:
+        for batch in batches:
+            if failure:
+                return
+            yield batch
+
+    # batches accepted ahead of one still in flight, by seq
+    accepted: Dict[int, _Batch] = {}
+    next_seq = 0
+    batches = _batches(
+        _read_lines(source), state["line"], batch_size, max_batch_bytes
+    )
+    with contextlib.closing(batches):
+        for batch, result in iter_concurrently(
+            send, unsent(batches), concurrency
+        ):
+            if not result.get("ok", False):
+                failure = failure or result
+                continue
+
+            stats["failed"] += sum(
+                1 for doc in result.get("results") or [] if not doc.get("ok")
+            )
+            accepted[batch.seq] = batch
+            while next_seq in accepted:
+                done = accepted.pop(next_seq)
+                next_seq += 1
+                stats["docs"] += len(done.docs)
+                stats["batches"] += 1
+                stats["bytes"] += done.size
+                stats["line"] = done.end
+                if checkpoint is not None:
+                    save_checkpoint(
+                        checkpoint,
+                        {
+                            "source": name,
+                            "line": done.end,
+                            "docs": stats["docs"],
+                        },
+                    )
+                if progress is not None:
+                    progress({**stats, "elapsed": time.monotonic() - started})
+
+    if failure:
+        return {**failure, **stats, "ok": False}
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return {"ok": True, **stats}
@@ -0,0 +1,323 @@
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from hyper_connect.types import ENQUEUE_CONCURRENCY
+from hyper_connect.utils import (
+    call_with_retries,
+    is_retryable_status,
+    map_concurrently,
+)
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperQueue
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE: int = 500
+
+# Seconds the background drain waits after the outbox empties or hyper fails
+OUTBOX_INTERVAL_SECONDS: float = 1.0
+
+# Seconds the keys of sent jobs are kept to reject duplicates
+OUTBOX_SENT_RETENTION_SECONDS: float = 24 * 60 * 60
+
+# SQLite's synchronous setting.  FULL syncs the write-ahead log on every
+# commit, so a put() that returned survives power loss.
+OUTBOX_SYNCHRONOUS: str = "FULL"
+
+_SYNCHRONOUS_MODES = ("EXTRA", "FULL", "NORMAL")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    job TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_status_seq ON outbox (status, seq);
+"""
+
+
+class QueueOutbox:
+    """
+    A durable, SQLite backed outbox for queue jobs.
+
+    put() writes a job to disk and returns, so producers never wait on
+    hyper and no job is lost when hyper cannot be reached.  drain() sends
+    pending jobs in order, `concurrency` at a time, and removes them from
+    the backlog once hyper accepts them.  When hyper cannot be reached, or
+    answers with a 5xx or 429, the job stays pending and draining stops
+    until the next drain.  Jobs hyper rejects with another 4xx are marked
+    failed and kept for inspection.
+
+    Every job has a key, a uuid unless one is given.  A job put again with
+    the key of a pending job, or of a job sent within `sent_retention`
+    seconds, is ignored.  This makes put() safe to retry.  A job put again
+    with the key of a job hyper rejected raises ValueError, since it would
+    never be sent.
+
+    start() drains in a background thread every `interval` seconds.
+
+    Example:
+
+        outbox = hyper.queue.outbox("jobs.db")
+        outbox.start()
+
+        outbox.put({"type": "email", "to": "..."}, key=f"welcome-{user_id}")
+
+        outbox.backlog()  # 1
+        outbox.close()
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        The SQLite database file.
+    batch_size : int
+        The most jobs read from disk per round of sending.
+    concurrency : int
+        The most jobs sent at the same time.
+    interval : float
+        Seconds the background drain waits once the outbox is empty or
+        hyper fails.
+    sent_retention : float
+        Seconds the keys of sent jobs are remembered.
+    synchronous : str
+        SQLite's synchronous setting.  "FULL", the default, syncs every
+        put() to disk before it returns.  "NORMAL" puts faster, but the
+        last jobs put may be lost when the machine loses power or the OS
+        crashes, though not when the process does.
+    """
+
+    def __init__(
+        self,
+        hyper_queue: "HyperQueue",
+        path: str,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        concurrency: int = ENQUEUE_CONCURRENCY,
+        interval: float = OUTBOX_INTERVAL_SECONDS,
+        sent_retention: float = OUTBOX_SENT_RETENTION_SECONDS,
+        synchronous: str = OUTBOX_SYNCHRONOUS,
+    ):
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("batch_size and concurrency must be at least 1")
+        synchronous = synchronous.upper()
+        if synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"synchronous must be one of {', '.join(_SYNCHRONOUS_MODES)}"
+            )
+
+        self.path = path
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.interval = interval
+        self.sent_retention = sent_retention
+        self.synchronous = synchronous
+        self._queue = hyper_queue
+
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._db = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={synchronous}")
+        self._db.executescript(_SCHEMA)
+
+    def put(self, job: Dict, key: Optional[str] = None) -> bool:
+        """
+        Writes a job to the outbox.
+
+        Parameters
+        ----------
+        job : Dict
+            The job to post to the queue.
+        key : str, optional
+            Identifies the job to reject duplicates.  Defaults to a uuid.
+
+        Returns
+        -------
+        False if a job with the same key is pending or was sent recently.
+        Raises ValueError if a job with the same key was rejected by hyper,
+        see failed().
+        """
+        key = key or uuid.uuid4().hex
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO outbox (key, job, updated_at) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(job), time.time()),
+            )
+            if cursor.rowcount == 1:
+                return True
+            row = self._db.execute(
+                "SELECT error FROM outbox WHERE key = ? AND status = 'failed'",
+                (key,),
+            ).fetchone()
+
+        if row is not None:
+            raise ValueError(f"job {key} was rejected by hyper: {row[0]}")
+        return False
+
+    def backlog(self) -> int:
+        """The number of jobs waiting to be sent."""
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+        return count
+
+    def __len__(self) -> int:
+        return self.backlog()
+
+    def failed(self) -> List[Dict]:
+        """
+        The jobs hyper rejected, as Dicts with key, job, attempts, and the
+        error.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, job, attempts, error FROM outbox "
+                "WHERE status = 'failed' ORDER BY seq"
+            ).fetchall()
+        return [
+            {
+                "key": key,
+                "job": json.loads(job),
+                "attempts": attempts,
+                "error": error,
+            }
+            for key, job, attempts, error in rows
+        ]
+
+    def drain(self) -> Dict[str, int]:
+        """
+        Sends pending jobs until the outbox is empty or hyper fails.
+
+        Returns
+        -------
+        Dict of the number of jobs "sent", "failed", and still "pending".
+        """
+        sent = failed = 0
+
+        with self._drain_lock:
+            self._prune()
+            while True:
+                with self._lock:
+                    rows = self._db.execute(
+                        "SELECT seq, job FROM outbox WHERE status = 'pending' "
+                        "ORDER BY seq LIMIT ?",
+                        (self.batch_size,),
+                    ).fetchall()
+                if not rows:
+                    break
+
+                results = map_concurrently(
+                    lambda row: call_with_retries(
+                        lambda: self._queue.enqueue(json.loads(row[1])), 0
+                    ),
+                    rows,
+                    self.concurrency,
+                )
+
+                now = time.time()
+                done, rejected, retry = [], [], []
+                for (seq, _), result in zip(rows, results):
+                    if result.get("ok"):
+                        done.append((now, seq))
+                    elif is_retryable_status(result.get("status")):
+                        retry.append((result.get("msg"), now, seq))
+                    else:
+                        rejected.append((result.get("msg"), now, seq))
+
+                with self._lock, self._transaction():
+                    self._db.executemany(
+                        "UPDATE outbox SET status = 'sent', "
+                        "attempts = attempts + 1, updated_at = ? "
+                        "WHERE seq = ?",
+                        done,
+                    )
+                    self._db.executemany(
+                        "UPDATE outbox SET status = 'failed', "
+                        "attempts = attempts + 1, error = ?, updated_at = ? "
+                        "WHERE seq = ?",
+                        rejected,
+                    )
+                    self._db.executemany(
+                        "UPDATE outbox SET attempts = attempts + 1, "
+                        "error = ?, updated_at = ? WHERE seq = ?",
+                        retry,
+                    )
+
+                sent += len(done)
+                failed += len(rejected)
+                if retry:
+                    break
+
+        return {"sent": sent, "failed": failed, "pending": self.backlog()}
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # rolled back when a statement fails, eg SQLITE_BUSY, so later
+        # puts are not left inside a transaction that is never committed
+        self._db.execute("BEGIN")
+        try:
+            yield
+            self._db.execute("COMMIT")
+        except BaseException:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            raise
+
+    def _prune(self):
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND updated_at < ?",
+                (time.time() - self.sent_retention,),
+            )
+
+    def start(self) -> "QueueOutbox":
+        """Drains the outbox in a background thread until close."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="hyper-queue-outbox", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception:
+                # keeps draining: the jobs stay pending on disk
+                logger.exception("hyper queue outbox drain failed")
+            self._stop.wait(self.interval)
+
+    def close(self):
+        """Stops the background drain and closes the database."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "QueueOutbox":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
+
+WATCH_INTERVAL_SECONDS: float = 5.0
+WATCH_MIN_INTERVAL_SECONDS: float = 1.0
+WATCH_MAX_INTERVAL_SECONDS: float = 60.0
+
+# Applied to the interval after a poll finds nothing new or fails
+WATCH_BACKOFF: float = 1.5
+
+
+def _job_digest(job: Dict) -> int:
+    key = job.get("id")
+    if key is None:
+        key = json.dumps(job, sort_keys=True)
+    digest = hashlib.blake2b(str(key).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "little")
+
+
+class QueueWatcher:
+    """
+    Polls a queue's errored or ready jobs and yields only the jobs it has
+    not seen before.
+
+    The ids seen on the last poll are kept as 64 bit digests rather than
+    the jobs themselves, and ids that drop off the list are forgotten, so
+    memory follows the size of the list and not how long the watcher has
+    run.  The interval between polls halves, down to `min_interval`, when
+    a poll finds new jobs and grows by WATCH_BACKOFF, up to `max_interval`,
+    when it finds none or fails.
+
+    Jobs on the list when watching starts are skipped unless
+    `include_existing` is set.  Iterate with for or async for; close() ends
+    the iteration.
+
+    Example:
+
+        for job in hyper.queue.watch_errors():
+            alert(job)
+
+    ...
+
+    Attributes
+    ----------
+    interval : float
+        Seconds until the next poll.
+    last_error : Any
+        The exception or NotOkResult of the last failed poll, if any.
+    """
+
+    def __init__(
+        self,
+        poll: Callable[[], Dict],
+        poll_async: Optional[Callable[[], Any]] = None,
+        interval: float = WATCH_INTERVAL_SECONDS,
+        min_interval: float = WATCH_MIN_INTERVAL_SECONDS,
+        max_interval: float = WATCH_MAX_INTERVAL_SECONDS,
+        include_existing: bool = False,
+    ):
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError(
+                "intervals must satisfy 0 < min_interval <= interval "
+                "<= max_interval"
+            )
+
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.last_error: Any = None
+        self._poll = poll
+        self._poll_async = poll_async
+        self._seen: Optional[Set[int]] = set() if include_existing else None
+        self._closed = threading.Event()
+
+    def new_jobs(self, result: Dict) -> List[Dict]:
+        """
+        Returns the jobs in a queue errors or queued result that were not
+        in the previous one, and adjusts the interval.
+        """
+        if not result.get("ok"):
+            self.last_error = result
+            self._back_off()
+            return []
+
+        jobs: List[Dict] = result.get("jobs", [])
+        digests = [_job_digest(job) for job in jobs]
+
+        if self._seen is None:
+            # the first poll only learns which jobs already exist
+            self._seen = set(digests)
+            return []
+
+        seen = self._seen
+        new = [job for job, d in zip(jobs, digests) if d not in seen]
+        self._seen = set(digests)
+
+        if new:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self._back_off()
+        return new
+
+    def poll(self) -> List[Dict]:
+        """Polls once and returns the new jobs."""
+        try:
+            result = self._poll()
+        except Exception as error:
+            self.last_error = error
+            self._back_off()
+            return []
+        return self.new_jobs(result)
+
+    async def poll_async(self) -> List[Dict]:
+        """Asynchronously polls once and returns the new jobs."""
+        if self._poll_async is None:
+            raise TypeError("this watcher has no async poll")
+        try:
+            result = await self._poll_async()
+        except Exception as error:
+            self.last_error = error
+            self._back_off()
+            return []
+        return self.new_jobs(result)
+
+    def _back_off(self):
+        self.interval = min(self.max_interval, self.interval * WATCH_BACKOFF)
+
+    def close(self):
+        """Ends iteration, waking a watcher that is waiting to poll."""
+        self._closed.set()
+
+    def __iter__(self) -> Iterator[Dict]:
+        while not self._closed.is_set():
+            yield from self.poll()
+            self._closed.wait(self.interval)
+
+    async def __aiter__(self) -> AsyncIterator[Dict]:
+        while not self._closed.is_set():
+            for job in await self.poll_async():
+                yield job
+
+            waited = 0.0
+            # sleep in short steps so close() takes effect promptly
+            while waited < self.interval and not self._closed.is_set():
+                step = min(self.min_interval, self.interval - waited)
+                await asyncio.sleep(step)
+                waited += step
@@ -0,0 +1,287 @@
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from hyper_connect.utils import (
+    NONCE_CACHE_SIZE,
+    SIGNATURE_HEADER,
+    SIGNATURE_TOLERANCE_SECONDS,
+    SignatureVerifier,
+)
+
+logger = logging.getLogger(__name__)
+
+RECEIVER_WORKERS: int = 8
+
+# Jobs accepted but not yet finished by a worker
+RECEIVER_MAX_PENDING: int = 256
+
+# Seconds a delivery waits for a free slot before it is turned away
+RECEIVER_WAIT_SECONDS: float = 1.0
+
+
+class JobReceiver:
+    """
+    Receives the jobs hyper Queue posts to a target web hook.
+
+    Each delivery's signature is verified and replays are rejected (see
+    SignatureVerifier).  Verified jobs are handed to `handler` on a pool of
+    `workers` threads and acknowledged straight away with a 202.  At most
+    `max_pending` jobs wait for or run on a worker; once that many are in
+    flight a delivery waits up to `wait` seconds for a slot and is then
+    answered with a 503, so hyper retries it later instead of the receiver
+    queueing without bound.
+
+    Use WSGIJobReceiver or ASGIJobReceiver to mount a receiver in a web app.
+
+    Example:
+
+        def send_email(job: Dict):
+            ...
+
+        receiver = JobReceiver(send_email, secret=os.environ["QUEUE_SECRET"])
+        app = WSGIJobReceiver(receiver, path="/jobs")
+
+    ...
+
+    Attributes
+    ----------
+    handler : Callable[[Dict], Any]
+        Called with each verified job.
+    wait : float
+        Seconds a delivery waits for a slot when the receiver is full.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict], Any],
+        secret: str,
+        workers: int = RECEIVER_WORKERS,
+        max_pending: int = RECEIVER_MAX_PENDING,
+        wait: float = RECEIVER_WAIT_SECONDS,
+        tolerance: int = SIGNATURE_TOLERANCE_SECONDS,
+        nonce_cache_size: int = NONCE_CACHE_SIZE,
+    ):
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1")
+
+        self.handler = handler
+        self.wait = wait
+        self._verifier = SignatureVerifier(secret, tolerance, nonce_cache_size)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="hyper-job"
+        )
+
+    def receive(
+        self,
+        body: bytes,
+        signature: Optional[str],
+        wait: Optional[float] = None,
+    ) -> Dict:
+        """
+        Verifies a delivery and dispatches its job to a worker.
+
+        Parameters
+        ----------
+        body : bytes
+            The raw request body.
+        signature : str, optional
+            The X-Hyper-Signature header.
+        wait : float, optional
+            Overrides the receiver's wait for this delivery.
+
+        Returns
+        -------
+        Result (OkResult, NotOkResult).  The status is the HTTP status to
+        answer the delivery with.
+        """
+        result = self._verifier.check(body, signature)
+        if not result["ok"]:
+            return result
+
+        try:
+            job = json.loads(body)
+        except ValueError:
+            return {"ok": False, "status": 400, "msg": "invalid job"}
+
+        timeout = self.wait if wait is None else wait
+        if not self._slots.acquire(timeout=timeout):
+            return {"ok": False, "status": 503, "msg": "receiver busy"}
+
+        # remembered only once accepted, so a delivery turned away with a
+        # 503 is not mistaken for a replay when hyper sends it again
+        remembered = self._verifier.remember(result["nonce"])
+        if not remembered["ok"]:
+            self._slots.release()
+            return remembered
+
+        try:
+            self._executor.submit(self._run, job)
+        except RuntimeError:
+            self._slots.release()
+            return {"ok": False, "status": 503, "msg": "receiver closed"}
+
+        return {"ok": True, "status": 202}
+
+    def _run(self, job: Dict):
+        try:
+            self.handler(job)
+        except Exception:
+            logger.exception("hyper queue job handler failed")
+        finally:
+            self._slots.release()
+
+    def close(self, wait: bool = True):
+        """
+        Stops accepting jobs.  With `wait`, blocks until the accepted jobs
+        are handled.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+def _response_body(result: Dict) -> bytes:
+    return json.dumps(result).encode("utf-8")
+
+
+_REASONS = {
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    503: "Service Unavailable",
+}
+
+
+def _headers(body: bytes, status: int) -> List[Tuple[str, str]]:
+    headers = [
+        ("Content-Type", "application/json"),
+        ("Content-Length", str(len(body))),
+    ]
+    if status == 503:
+        headers.append(("Retry-After", "1"))
+    return headers
+
+
+class WSGIJobReceiver:
+    """
+    WSGI middleware that answers POSTs to `path` with a JobReceiver.  Other
+    requests go to `app`, or get a 404 when there is no app.
+
+    Example:
+
+        app.wsgi_app = WSGIJobReceiver(receiver, app.wsgi_app, path="/jobs")
+    """
+
+    def __init__(
+        self,
+        receiver: JobReceiver,
+        app: Optional[Callable] = None,
+        path: str = "/",
+    ):
+        self.receiver = receiver
+        self.app = app
+        self.path = path
+
+    def __call__(
+        self, environ: Dict, start_response: Callable
+    ) -> Iterable[bytes]:
+        if environ.get("PATH_INFO", "/") != self.path:
+            if self.app is not None:
+                return self.app(environ, start_response)
+            result: Dict = {"ok": False, "status": 404, "msg": "not found"}
+        elif environ["REQUEST_METHOD"] != "POST":
+            result = {"ok": False, "status": 405, "msg": "method not allowed"}
+        else:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+            body = environ["wsgi.input"].read(length) if length else b""
+            signature = environ.get(
+                "HTTP_" + SIGNATURE_HEADER.upper().replace("-", "_")
+            )
+            result = self.receiver.receive(body, signature)
+
+        status = result["status"]
+        response = _response_body(result)
+        start_response(
+            f"{status} {_REASONS.get(status, '')}".rstrip(),
+            _headers(response, status),
+        )
+        return [response]
+
+
+class ASGIJobReceiver:
+    """
+    ASGI middleware that answers POSTs to `path` with a JobReceiver.  Other
+    requests go to `app`, or get a 404 when there is no app.
+
+    Deliveries are verified on the event loop.  A delivery only leaves the
+    loop, to wait for a slot on a thread, when the receiver is full.
+
+    Example:
+
+        app = ASGIJobReceiver(receiver, app, path="/jobs")
+    """
+
+    def __init__(
+        self,
+        receiver: JobReceiver,
+        app: Optional[Callable] = None,
+        path: str = "/",
+    ):
+        self.receiver = receiver
+        self.app = app
+        self.path = path
+        self._header = SIGNATURE_HEADER.lower().encode("latin-1")
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            if self.app is not None:
+                return await self.app(scope, receive, send)
+            if scope["type"] != "http":
+                return
+            result: Dict = {"ok": False, "status": 404, "msg": "not found"}
+        elif scope["method"] != "POST":
+            result = {"ok": False, "status": 405, "msg": "method not allowed"}
+        else:
+            result = await self._receive(scope, receive)
+
+        status = result["status"]
+        response = _response_body(result)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in _headers(response, status)
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": response})
+
+    async def _receive(self, scope: Dict, receive: Callable) -> Dict:
+        chunks: List[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        signature: Optional[str] = None
+        for name, value in scope.get("headers", []):
+            if name.lower() == self._header:
+                signature = value.decode("latin-1")
+
+        result = self.receiver.receive(body, signature, wait=0)
+        if result["status"] == 503 and self.receiver.wait > 0:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None, self.receiver.receive, body, signature
+            )
+        return result
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from hyper_connect._hyper_connect import connect
+from hyper_connect.types import Compression, Hyper
+from hyper_connect.utils import COMPRESSION_THRESHOLD, Transport
+
+
+class HyperRegistry:
+    """
+    A least recently used cache of Hyper objects for multi-tenant apps.
+
+    Hyper objects are keyed by connection string and domain, so calling
+    get once per request with the tenant's connection string reuses the
+    tenant's Hyper object instead of connecting again.  Every tenant's
+    requests go over one shared transport (connection pool) while tokens
+    stay cached per tenant.
+
+    Example:
+
+        registry = HyperRegistry(maxsize=1000, timeout=5, cache_l1_size=100)
+
+        def handle(request):
+            hyper: Hyper = registry.get(request.tenant.connection_string)
+            return hyper.data.get(request.id)
+
+    ...
+
+    Attributes
+    ----------
+    maxsize : int
+        The most Hyper objects kept.  The least recently used is dropped
+        when a new tenant would exceed it.
+
+    Any other keyword arguments, eg timeout, cache_l1_size, or
+    rate_limits, are passed to connect for every tenant.  Each tenant gets
+    its own in-process caches and rate limits.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        compression: Optional[Compression] = None,
+        compression_threshold: int = COMPRESSION_THRESHOLD,
+        transport: Optional[Transport] = None,
+        **connect_options: Any,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+        self._transport = transport
+        self._connect_options: Dict[str, Any] = connect_options
+        self._hypers: "OrderedDict[Tuple[str, str], Hyper]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, connection_string: str, domain: str = "default") -> Hyper:
+        """
+        Returns the Hyper object for the connection string and domain,
+        connecting on first use.
+        """
+        key = (connection_string, domain)
+
+        with self._lock:
+            hyper = self._hypers.get(key)
+            if hyper is not None:
+                self._hypers.move_to_end(key)
+                return hyper
+
+            hyper = connect(
+                connection_string,
+                domain,
+                compression=self._compression,
+                compression_threshold=self._compression_threshold,
+                transport=self._transport,
+                **self._connect_options,
+            )
+            self._hypers[key] = hyper
+            while len(self._hypers) > self.maxsize:
+                self._hypers.popitem(last=False)
+
+            return hyper
+
+    def remove(self, connection_string: str, domain: str = "default"):
+        """
+        Drops a tenant's Hyper object, for example after its app key is
+        rotated.
+        """
+        with self._lock:
+            self._hypers.pop((connection_string, domain), None)
+
+    def clear(self):
+        with self._lock:
+            self._hypers.clear()
+
+    def __len__(self) -> int:
+        return len(self._hypers)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._hypers
@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from hyper_connect._batcher import (
+    BATCH_INTERVAL_SECONDS,
+    BATCH_MAX_BUFFER,
+    BATCH_SIZE,
+    BackgroundBatcher,
+    resolve_future,
+)
+from hyper_connect.utils import call_with_retries
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperData
+
+WRITE_BUFFER_RETRIES: int = 2
+
+# (doc, futures of every write coalesced into doc)
+_Write = Tuple[Dict, List["Future[Dict]"]]
+
+
+class DataWriteBuffer(BackgroundBatcher):
+    """
+    Buffers data service writes and sends them in the background through
+    hyper.data.bulk.
+
+    Writes are coalesced per `_id`: the last add, update, or remove of a
+    document before its batch is sent wins, and a remove becomes a
+    `_deleted: true` document.  Every write returns a Future of the
+    document's bulk result, and all writes coalesced into one document
+    share that result.
+
+    A batch is sent as soon as `batch_size` documents are buffered, or
+    `interval` seconds after its first write.  Failed bulk requests are
+    retried like hyper.queue.enqueue_many.  Call flush() before reading
+    documents you have just written.  Cancelling a write's Future does not
+    stop the write, since it may share its document with other writes.
+
+    Example:
+
+        with hyper.data.write_buffer(batch_size=200) as writes:
+            writes.add(movie)
+            writes.update("movie-1", movie_1)
+            writes.remove("movie-2")
+
+            writes.flush()
+            hyper.data.get("movie-1")
+
+    ...
+
+    Attributes
+    ----------
+    batch_size : int
+        The most documents sent per bulk request.
+    interval : float
+        Seconds a write waits for its batch to fill up.
+    max_buffer : int
+        The most documents waiting to be sent.
+    """
+
+    def __init__(
+        self,
+        hyper_data: "HyperData",
+        batch_size: int = BATCH_SIZE,
+        interval: float = BATCH_INTERVAL_SECONDS,
+        max_buffer: int = BATCH_MAX_BUFFER,
+        retries: int = WRITE_BUFFER_RETRIES,
+    ):
+        self._data = hyper_data
+        self._retries = retries
+        self._writes: "OrderedDict[str, _Write]" = OrderedDict()
+        super().__init__(
+            batch_size, interval, max_buffer, name="hyper-data-write-buffer"
+        )
+
+    def add(
+        self, doc: Dict, block: bool = True, timeout: Optional[float] = None
+    ) -> "Future[Dict]":
+        """
+        Buffers a document to be added, replacing any buffered write of the
+        same `_id`.
+
+        Returns
+        -------
+        A Future of the document's bulk result, eg: {'ok': True, 'id': 'movie-1'}
+        """
+        if "_id" not in doc:
+            raise ValueError("buffered documents need an _id")
+
+        future: "Future[Dict]" = Future()
+        key = doc["_id"]
+
+        def add() -> bool:
+            if key in self._writes:
+                futures = self._writes[key][1]
+                futures.append(future)
+                self._writes[key] = (doc, futures)
+                return False
+            self._writes[key] = (doc, [future])
+            return True
+
+        self._put(add, lambda: key not in self._writes, block, timeout)
+        return future
+
+    def update(
+        self,
+        id: str,
+        doc: Dict,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> "Future[Dict]":
+        """
+        Buffers a full document update, replacing any buffered write of the
+        same id.
+        """
+        return self.add({**doc, "_id": id}, block, timeout)
+
+    def remove(
+        self, id: str, block: bool = True, timeout: Optional[float] = None
+    ) -> "Future[Dict]":
+        """
+        Buffers a delete, replacing any buffered write of the same id.
+        """
+        return self.add({"_id": id, "_deleted": True}, block, timeout)
+
+    def _buffered(self) -> int:
+        return len(self._writes)
+
+    def _take(self, count: int) -> List[_Write]:
+        batch: List[_Write] = []
+        while self._writes and len(batch) < count:
+            batch.append(self._writes.popitem(last=False)[1])
+        return batch
+
+    def _send(self, batch: List[_Write]):
+        docs = [doc for doc, _ in batch]
+        result = call_with_retries(
+            lambda: self._data.bulk(docs), self._retries
+        )
+
+        results: List[Dict] = result.get("results") or []
+        by_id = {r.get("id"): r for r in results}
+
+        for doc, futures in batch:
+            if not result.get("ok"):
+                doc_result = result
+            else:
+                doc_result = by_id.get(
+                    doc["_id"],
+                    {"ok": False, "id": doc["_id"], "msg": "no result"},
+                )
+            for future in futures:
+                resolve_future(future, doc_result)
+
+    def _futures(self, batch: List[_Write]) -> Iterable[Future]:
+        return (future for _, futures in batch for future in futures)
@@ -1,63 +1,137 @@
 __version__ = "0.0.1"
 
-from ._cache import (
-    add_cache,
-    add_cache_async,
-    get_cache,
-    get_cache_async,
-    post_cache_query,
-    post_cache_query_async,
-    remove_cache,
-    remove_cache_async,
-    set_cache,
-    set_cache_async,
-)
-from ._data import (
-    add_data,
-    add_data_async,
-    get_data,
-    get_data_async,
-    get_data_list,
-    get_data_list_async,
-    post_bulk,
-    post_bulk_async,
-    post_index,
-    post_index_async,
-    post_query,
-    post_query_async,
-    remove_data,
-    remove_data_async,
-    update_data,
-    update_data_async,
-)
-from ._info import services, services_async
-from ._queue import (
-    queue_enqueue,
-    queue_enqueue_async,
-    queue_errors,
-    queue_errors_async,
-    queue_queued,
-    queue_queued_async,
-)
-from ._search import (
-    add_search,
-    add_search_async,
-    get_search,
-    get_search_async,
-    load_search,
-    load_search_async,
-    post_query_search,
-    post_query_search_async,
-    remove_search,
-    remove_search_async,
-    update_search,
-    update_search_async,
-)
-from ._storage import (
-    download,
-    download_async,
-    remove_storage,
-    remove_storage_async,
-    upload,
-    upload_async,
+from typing import TYPE_CHECKING
+
+from hyper_connect._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ._cache import (
+        add_cache,
+        add_cache_async,
+        get_cache,
+        get_cache_async,
+        post_cache_query,
+        post_cache_query_async,
+        remove_cache,
+        remove_cache_async,
+        set_cache,
+        set_cache_async,
+    )
+    from ._data import (
+        add_data,
+        add_data_async,
+        get_data,
+        get_data_async,
+        get_data_list,
+        get_data_list_async,
+        post_bulk,
+        post_bulk_async,
+        post_index,
+        post_index_async,
+        post_query,
+        post_query_async,
+        remove_data,
+        remove_data_async,
+        update_data,
+        update_data_async,
+    )
+    from ._info import services, services_async
+    from ._queue import (
+        queue_enqueue,
+        queue_enqueue_async,
+        queue_errors,
+        queue_errors_async,
+        queue_queued,
+        queue_queued_async,
+    )
+    from ._search import (
+        add_search,
+        add_search_async,
+        get_search,
+        get_search_async,
+        load_search,
+        load_search_async,
+        post_query_search,
+        post_query_search_async,
+        remove_search,
+        remove_search_async,
+        update_search,
+        update_search_async,
+    )
+    from ._storage import (
+        download,
+        download_async,
+        remove_storage,
+        remove_storage_async,
+        upload,
+        upload_async,
+    )
+
+# Each service module, and requests, promisio, etc. along with it,
+# is imported the first time one of its functions is looked up.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._cache": [
+            "add_cache",
+            "add_cache_async",
+            "get_cache",
+            "get_cache_async",
+            "post_cache_query",
+            "post_cache_query_async",
+            "remove_cache",
+            "remove_cache_async",
+            "set_cache",
+            "set_cache_async",
+        ],
+        "._data": [
+            "add_data",
+            "add_data_async",
+            "get_data",
+            "get_data_async",
+            "get_data_list",
+            "get_data_list_async",
+            "post_bulk",
+            "post_bulk_async",
+            "post_index",
+            "post_index_async",
+            "post_query",
+            "post_query_async",
+            "remove_data",
+            "remove_data_async",
+            "update_data",
+            "update_data_async",
+        ],
+        "._info": ["services", "services_async"],
+        "._queue": [
+            "queue_enqueue",
+            "queue_enqueue_async",
+            "queue_errors",
+            "queue_errors_async",
+            "queue_queued",
+            "queue_queued_async",
+        ],
+        "._search": [
+            "add_search",
+            "add_search_async",
+            "get_search",
+            "get_search_async",
+            "load_search",
+            "load_search_async",
+            "post_query_search",
+            "post_query_search_async",
+            "remove_search",
+            "remove_search_async",
+            "update_search",
+            "update_search_async",
+        ],
+        "._storage": [
+            "download",
+            "download_async",
+            "remove_storage",
+            "remove_storage_async",
+            "upload",
+            "upload_async",
+        ],
+    },
 )
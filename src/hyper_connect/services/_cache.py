@@ -1,12 +1,15 @@
 import json
 from typing import Dict, Optional
 
-import requests
 from promisio import promisify
 from ramda import assoc
 
 from hyper_connect.types import HyperRequest, HyperRequestParams
-from hyper_connect.utils import create_hyper_request_params
+from hyper_connect.utils import (
+    Transport,
+    create_hyper_request_params,
+    get_transport,
+)
 
 
 @promisify
@@ -16,8 +19,9 @@ def add_cache_async(
     ttl: Optional[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return add_cache(key, value, ttl, connection_string, domain)
+    return add_cache(key, value, ttl, connection_string, domain, transport)
 
 
 def add_cache(
@@ -26,6 +30,7 @@ def add_cache(
     ttl: Optional[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
     cache_doc = {"key": key, "value": value}
 
@@ -48,16 +53,28 @@ def add_cache(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    result = requests.post(url, headers=headers, data=json.dumps(body))
+    result = get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
     return result
 
 
 @promisify
-def get_cache_async(key: str, connection_string: str, domain: str = "default"):
-    return get_cache(key, connection_string, domain)
+def get_cache_async(
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
+    return get_cache(key, connection_string, domain, transport)
 
 
-def get_cache(key: str, connection_string: str, domain: str = "default"):
+def get_cache(
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "cache",
@@ -74,17 +91,25 @@ def get_cache(key: str, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
 
 
 @promisify
 def remove_cache_async(
-    key: str, connection_string: str, domain: str = "default"
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return remove_cache(key, connection_string, domain)
+    return remove_cache(key, connection_string, domain, transport)
 
 
-def remove_cache(key: str, connection_string: str, domain: str = "default"):
+def remove_cache(
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "cache",
@@ -101,7 +126,7 @@ def remove_cache(key: str, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.delete(url, headers=headers)
+    return get_transport(transport).request("DELETE", url, headers=headers)
 
 
 @promisify
@@ -111,8 +136,9 @@ def set_cache_async(
     ttl: Optional[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return set_cache(key, value, ttl, connection_string, domain)
+    return set_cache(key, value, ttl, connection_string, domain, transport)
 
 
 def set_cache(
@@ -121,6 +147,7 @@ def set_cache(
     ttl: Optional[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     if ttl is not None:
@@ -146,7 +173,9 @@ def set_cache(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    result = requests.put(url, headers=headers, data=json.dumps(value))
+    result = get_transport(transport).request(
+        "PUT", url, headers=headers, data=json.dumps(value)
+    )
     return result
 
 
@@ -155,14 +184,20 @@ def post_cache_query_async(
     pattern: Optional[str],
     connection_string: str,
     domain: str = "default",
+    stream: bool = False,
+    transport: Optional[Transport] = None,
 ):
-    return post_cache_query(pattern, connection_string, domain)
+    return post_cache_query(
+        pattern, connection_string, domain, stream, transport
+    )
 
 
 def post_cache_query(
     pattern: Optional[str],
     connection_string: str,
     domain: str = "default",
+    stream: bool = False,
+    transport: Optional[Transport] = None,
 ):
 
     if pattern is None:
@@ -184,7 +219,9 @@ def post_cache_query(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    results = requests.post(url, headers=headers, data=json.dumps(body))
+    results = get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body), stream=stream
+    )
 
     data = json.dumps(body)
     return results
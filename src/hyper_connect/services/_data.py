@@ -1,27 +1,43 @@
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import requests
 from promisio import promisify
 
 from hyper_connect.types import (
+    Compression,
     HyperRequest,
     HyperRequestParams,
     ListOptions,
     QueryOptions,
 )
-from hyper_connect.utils import create_hyper_request_params, to_data_query
+from hyper_connect.utils import (
+    COMPRESSION_THRESHOLD,
+    Transport,
+    compress_body,
+    conditional_headers,
+    create_hyper_request_params,
+    get_transport,
+    to_data_query,
+)
 
 
 @promisify
 def add_data_async(
-    body: Dict, connection_string: str, domain: str = "default"
+    body: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    result = add_data(body, connection_string, domain)
+    result = add_data(body, connection_string, domain, transport)
     return result
 
 
-def add_data(body: Dict, connection_string: str, domain: str = "default"):
+def add_data(
+    body: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "data",
@@ -51,15 +67,33 @@ def add_data(body: Dict, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
 
 
 @promisify
-def get_data_async(id: str, connection_string: str, domain: str = "default"):
-    return get_data(id, connection_string, domain)
+def get_data_async(
+    id: str,
+    connection_string: str,
+    domain: str = "default",
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    transport: Optional[Transport] = None,
+):
+    return get_data(
+        id, connection_string, domain, etag, last_modified, transport
+    )
 
 
-def get_data(id: str, connection_string: str, domain: str = "default"):
+def get_data(
+    id: str,
+    connection_string: str,
+    domain: str = "default",
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "data",
@@ -74,20 +108,28 @@ def get_data(id: str, connection_string: str, domain: str = "default"):
     )
 
     url: str = hyperRequestParams["url"]
-    headers = hyperRequestParams["options"]["headers"]
+    headers = conditional_headers(
+        hyperRequestParams["options"]["headers"], etag, last_modified
+    )
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
 
 
 @promisify
 def get_data_list_async(
-    options: ListOptions, connection_string: str, domain: str = "default"
+    options: ListOptions,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return get_data_list(options, connection_string, domain)
+    return get_data_list(options, connection_string, domain, transport)
 
 
 def get_data_list(
-    options: ListOptions, connection_string: str, domain: str = "default"
+    options: ListOptions,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -113,18 +155,26 @@ def get_data_list(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
 
 
 @promisify
 def update_data_async(
-    id: str, doc: Dict, connection_string: str, domain: str = "default"
+    id: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return update_data(id, doc, connection_string, domain)
+    return update_data(id, doc, connection_string, domain, transport)
 
 
 def update_data(
-    id: str, doc: Dict, connection_string: str, domain: str = "default"
+    id: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -142,17 +192,27 @@ def update_data(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.put(url, headers=headers, data=json.dumps(doc))
+    return get_transport(transport).request(
+        "PUT", url, headers=headers, data=json.dumps(doc)
+    )
 
 
 @promisify
 def remove_data_async(
-    id: str, connection_string: str, domain: str = "default"
+    id: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return remove_data(id, connection_string, domain)
+    return remove_data(id, connection_string, domain, transport)
 
 
-def remove_data(id: str, connection_string: str, domain: str = "default"):
+def remove_data(
+    id: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "data",
@@ -169,7 +229,7 @@ def remove_data(id: str, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.delete(url, headers=headers)
+    return get_transport(transport).request("DELETE", url, headers=headers)
 
 
 @promisify
@@ -178,8 +238,19 @@ def post_query_async(
     options: QueryOptions,
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
 ):
-    return post_query(selector, options, connection_string, domain)
+    return post_query(
+        selector,
+        options,
+        connection_string,
+        domain,
+        compression,
+        compression_threshold,
+        transport=transport,
+    )
 
 
 def post_query(
@@ -187,6 +258,10 @@ def post_query(
     options: QueryOptions,
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    stream: bool = False,
+    transport: Optional[Transport] = None,
 ):
 
     data_query: Dict = to_data_query(selector, options)
@@ -207,7 +282,13 @@ def post_query(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    data = compress_body(
+        json.dumps(body), headers, compression, compression_threshold
+    )
+
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=data, stream=stream
+    )
 
 
 @promisify
@@ -216,8 +297,9 @@ def post_index_async(
     fields: List[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return post_index(name, fields, connection_string, domain)
+    return post_index(name, fields, connection_string, domain, transport)
 
 
 def post_index(
@@ -225,6 +307,7 @@ def post_index(
     fields: List[str],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
     indexBody: Dict = {"name": name, "type": "json", "fields": fields}
 
@@ -244,7 +327,9 @@ def post_index(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
 
 
 @promisify
@@ -252,14 +337,27 @@ def post_bulk_async(
     docs: List[Dict],
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
 ):
-    return post_bulk(docs, connection_string, domain)
+    return post_bulk(
+        docs,
+        connection_string,
+        domain,
+        compression,
+        compression_threshold,
+        transport,
+    )
 
 
 def post_bulk(
     docs: List[Dict],
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -278,5 +376,11 @@ def post_bulk(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    results = requests.post(url, headers=headers, data=json.dumps(body))
+    data = compress_body(
+        json.dumps(body), headers, compression, compression_threshold
+    )
+
+    results = get_transport(transport).request(
+        "POST", url, headers=headers, data=data
+    )
     return results
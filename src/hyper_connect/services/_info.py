@@ -1,22 +1,29 @@
-import requests
+from typing import Optional
+
 from promisio import promisify
 
 from hyper_connect.types import HyperRequest, HyperRequestParams
-from hyper_connect.utils import create_hyper_request_params
+from hyper_connect.utils import (
+    Transport,
+    create_hyper_request_params,
+    get_transport,
+)
 
 
 @promisify
 def services_async(
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    result = services(connection_string, domain)
+    result = services(connection_string, domain, transport)
     return result
 
 
 def services(
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
     hyperRequest: HyperRequest = {
         "service": "info",
@@ -33,4 +40,4 @@ def services(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
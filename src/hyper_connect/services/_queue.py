@@ -1,21 +1,32 @@
 import json
-from typing import Dict
+from typing import Dict, Optional
 
-import requests
 from promisio import promisify
 
 from hyper_connect.types import HyperRequest, HyperRequestParams
-from hyper_connect.utils import create_hyper_request_params
+from hyper_connect.utils import (
+    Transport,
+    create_hyper_request_params,
+    get_transport,
+)
 
 
 @promisify
 def queue_enqueue_async(
-    job: Dict, connection_string: str, domain: str = "default"
+    job: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return queue_enqueue(job, connection_string, domain)
+    return queue_enqueue(job, connection_string, domain, transport)
 
 
-def queue_enqueue(job: Dict, connection_string: str, domain: str = "default"):
+def queue_enqueue(
+    job: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "queue",
@@ -33,15 +44,25 @@ def queue_enqueue(job: Dict, connection_string: str, domain: str = "default"):
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
 
 
 @promisify
-def queue_errors_async(connection_string: str, domain: str = "default"):
-    return queue_errors(connection_string, domain)
+def queue_errors_async(
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
+    return queue_errors(connection_string, domain, transport)
 
 
-def queue_errors(connection_string: str, domain: str = "default"):
+def queue_errors(
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "queue",
@@ -58,15 +79,23 @@ def queue_errors(connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
 
 
 @promisify
-def queue_queued_async(connection_string: str, domain: str = "default"):
-    queue_queued(connection_string, domain)
+def queue_queued_async(
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
+    return queue_queued(connection_string, domain, transport)
 
 
-def queue_queued(connection_string: str, domain: str = "default"):
+def queue_queued(
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "queue",
@@ -83,4 +112,4 @@ def queue_queued(connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
@@ -1,28 +1,42 @@
 import json
 from typing import Any, Dict, List, Optional
 
-import requests
 from promisio import promisify
 from ramda import merge
 
 from hyper_connect.types import (
+    Compression,
     HyperRequest,
     HyperRequestParams,
     SearchQueryOptions,
 )
-from hyper_connect.utils import create_hyper_request_params
+from hyper_connect.utils import (
+    COMPRESSION_THRESHOLD,
+    Transport,
+    compress_body,
+    create_hyper_request_params,
+    get_transport,
+)
 
 
 @promisify
 def add_search_async(
-    key: str, doc: Dict, connection_string: str, domain: str = "default"
+    key: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    result = add_search(key, doc, connection_string, domain)
+    result = add_search(key, doc, connection_string, domain, transport)
     return result
 
 
 def add_search(
-    key: str, doc: Dict, connection_string: str, domain: str = "default"
+    key: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -41,17 +55,27 @@ def add_search(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
 
 
 @promisify
 def get_search_async(
-    key: str, connection_string: str, domain: str = "default"
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return get_search(key, connection_string, domain)
+    return get_search(key, connection_string, domain, transport)
 
 
-def get_search(key: str, connection_string: str, domain: str = "default"):
+def get_search(
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "search",
@@ -68,18 +92,26 @@ def get_search(key: str, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.get(url, headers=headers)
+    return get_transport(transport).request("GET", url, headers=headers)
 
 
 @promisify
 def update_search_async(
-    key: str, doc: Dict, connection_string: str, domain: str = "default"
+    key: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return update_search(key, doc, connection_string, domain)
+    return update_search(key, doc, connection_string, domain, transport)
 
 
 def update_search(
-    key: str, doc: Dict, connection_string: str, domain: str = "default"
+    key: str,
+    doc: Dict,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -97,17 +129,27 @@ def update_search(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.put(url, headers=headers, data=json.dumps(doc))
+    return get_transport(transport).request(
+        "PUT", url, headers=headers, data=json.dumps(doc)
+    )
 
 
 @promisify
 def remove_search_async(
-    key: str, connection_string: str, domain: str = "default"
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return remove_search(key, connection_string, domain)
+    return remove_search(key, connection_string, domain, transport)
 
 
-def remove_search(key: str, connection_string: str, domain: str = "default"):
+def remove_search(
+    key: str,
+    connection_string: str,
+    domain: str = "default",
+    transport: Optional[Transport] = None,
+):
 
     hyperRequest: HyperRequest = {
         "service": "search",
@@ -124,7 +166,7 @@ def remove_search(key: str, connection_string: str, domain: str = "default"):
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.delete(url, headers=headers)
+    return get_transport(transport).request("DELETE", url, headers=headers)
 
 
 @promisify
@@ -133,8 +175,11 @@ def post_query_search_async(
     options: Optional[SearchQueryOptions],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return post_query_search(query, options, connection_string, domain)
+    return post_query_search(
+        query, options, connection_string, domain, transport
+    )
 
 
 def post_query_search(
@@ -142,6 +187,7 @@ def post_query_search(
     options: Optional[SearchQueryOptions],
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
 
     # {
@@ -171,7 +217,9 @@ def post_query_search(
     headers = hyperRequestParams["options"]["headers"]
     body: Any = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=json.dumps(body)
+    )
 
 
 @promisify
@@ -179,14 +227,27 @@ def load_search_async(
     docs: List[Dict],
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
 ):
-    return load_search(docs, connection_string, domain)
+    return load_search(
+        docs,
+        connection_string,
+        domain,
+        compression,
+        compression_threshold,
+        transport,
+    )
 
 
 def load_search(
     docs: List[Dict],
     connection_string: str,
     domain: str = "default",
+    compression: Optional[Compression] = None,
+    compression_threshold: int = COMPRESSION_THRESHOLD,
+    transport: Optional[Transport] = None,
 ):
 
     hyperRequest: HyperRequest = {
@@ -205,4 +266,10 @@ def load_search(
     headers = hyperRequestParams["options"]["headers"]
     body = hyperRequestParams["options"]["body"]
 
-    return requests.post(url, headers=headers, data=json.dumps(body))
+    data = compress_body(
+        json.dumps(body), headers, compression, compression_threshold
+    )
+
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=data
+    )
@@ -1,11 +1,16 @@
 import io
+from typing import Optional
 
-import requests
 from promisio import promisify
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from hyper_connect.types import HyperRequest, HyperRequestParams
-from hyper_connect.utils import create_hyper_request_params
+from hyper_connect.utils import (
+    Transport,
+    conditional_headers,
+    create_hyper_request_params,
+    get_transport,
+)
 
 
 @promisify
@@ -14,8 +19,9 @@ def upload_async(
     data: io.BufferedReader,
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return upload(name, data, connection_string, domain)
+    return upload(name, data, connection_string, domain, transport)
 
 
 def upload(
@@ -23,6 +29,7 @@ def upload(
     data: io.BufferedReader,
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
     m = MultipartEncoder(fields={"file": (name, data, "text/plain")})
 
@@ -43,7 +50,9 @@ def upload(
 
     headers["Content-Type"] = m.content_type
 
-    return requests.post(url, headers=headers, data=m)
+    return get_transport(transport).request(
+        "POST", url, headers=headers, data=m
+    )
 
 
 @promisify
@@ -51,14 +60,22 @@ def download_async(
     name: str,
     connection_string: str,
     domain: str = "default",
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    transport: Optional[Transport] = None,
 ):
-    return download(name, connection_string, domain)
+    return download(
+        name, connection_string, domain, etag, last_modified, transport
+    )
 
 
 def download(
     name: str,
     connection_string: str,
     domain: str = "default",
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    transport: Optional[Transport] = None,
 ):
     hyperRequest: HyperRequest = {
         "service": "storage",
@@ -73,9 +90,13 @@ def download(
     )
 
     url: str = hyperRequestParams["url"]
-    headers = hyperRequestParams["options"]["headers"]
+    headers = conditional_headers(
+        hyperRequestParams["options"]["headers"], etag, last_modified
+    )
 
-    return requests.get(url, headers=headers, stream=True)
+    return get_transport(transport).request(
+        "GET", url, headers=headers, stream=True
+    )
 
 
 @promisify
@@ -83,14 +104,16 @@ def remove_storage_async(
     name: str,
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
-    return remove_storage(name, connection_string, domain)
+    return remove_storage(name, connection_string, domain, transport)
 
 
 def remove_storage(
     name: str,
     connection_string: str,
     domain: str = "default",
+    transport: Optional[Transport] = None,
 ):
     hyperRequest: HyperRequest = {
         "service": "storage",
@@ -107,4 +130,4 @@ def remove_storage(
     url: str = hyperRequestParams["url"]
     headers = hyperRequestParams["options"]["headers"]
 
-    return requests.delete(url, headers=headers)
+    return get_transport(transport).request("DELETE", url, headers=headers)
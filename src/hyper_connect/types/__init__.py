@@ -1,9 +1,16 @@
 __version__ = "0.0.1"
 
 from ._types import (
+    CACHE_QUERY_PAGE_SIZE,
+    DATA_QUERY_PAGE_SIZE,
+    ENQUEUE_CONCURRENCY,
+    ENQUEUE_RETRIES,
+    STREAM_CHUNK_SIZE,
     Action,
+    Compression,
     Hyper,
     HyperCache,
+    HyperConnection,
     HyperData,
     HyperDocsResult,
     HyperGetResult,
@@ -25,6 +32,7 @@ from ._types import (
     OkResult,
     QueryOptions,
     QueueStatus,
+    RateLimit,
     RequestOptions,
     Result,
     SearchQueryOptions,
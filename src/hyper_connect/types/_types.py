@@ -1,9 +1,16 @@
+import copy
 import io
+import os
+import time
 from typing import (
+    IO,
+    TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Callable,
     ClassVar,
     Dict,
+    Iterator,
     List,
     Literal,
     Optional,
@@ -11,13 +18,36 @@ from typing import (
     Union,
 )
 
-import requests
+from hyper_connect import services as hyper_services
+from hyper_connect import utils as hyper_utils
+
+if TYPE_CHECKING:
+    import numpy
+    import requests
+
+    from hyper_connect._batcher import EnqueueBatcher
+    from hyper_connect._index_advisor import IndexRegistry, QueryAdvisor
+    from hyper_connect._outbox import QueueOutbox
+    from hyper_connect._queue_watcher import QueueWatcher
+    from hyper_connect._write_buffer import DataWriteBuffer
+    from hyper_connect.utils import LocalCache, Timeout, Transport
 
 SortOptions = Literal["DESC", "ASC"]
 ServiceType = Literal["data", "cache", "storage", "search", "queue", "info"]
 Method = Literal["GET", "POST", "PUT", "DELETE", "PATCH"]
 Action = Literal["_query", "_bulk", "_index"]
 QueueStatus = Literal["ERROR", "READY"]
+Compression = Literal["gzip", "deflate"]
+
+CACHE_QUERY_PAGE_SIZE: int = 100
+
+DATA_QUERY_PAGE_SIZE: int = 1000
+
+# Bytes read at a time from streamed responses
+STREAM_CHUNK_SIZE: int = 64 * 1024
+
+ENQUEUE_CONCURRENCY: int = 8
+ENQUEUE_RETRIES: int = 2
 
 
 class OkResult:
@@ -337,6 +367,33 @@ class SearchQueryOptions(TypedDict, total=False):
     filter: Optional[Dict[str, str]]
 
 
+class RateLimit(TypedDict, total=False):
+    """
+    A client side rate limit, for connect's rate_limits.
+
+    Example:
+
+        limits: RateLimit = {"requests_per_second": 50, "burst": 2}
+
+        hyper = connect(connection_string, rate_limits={"data": {"*": limits}})
+    ...
+
+    Attributes
+    ----------
+    requests_per_second : float, optional
+        The most requests sent per second, on average.
+    bytes_per_second : float, optional
+        The most request and response body bytes per second, on average.
+    burst : float, optional
+        The seconds of traffic that may be sent at once after a quiet
+        spell.  The default is 1.
+    """
+
+    requests_per_second: float
+    bytes_per_second: float
+    burst: float
+
+
 class HyperRequest(TypedDict):
     service: ServiceType
     method: Method
@@ -376,6 +433,113 @@ class WriteHyperDataError(Exception):
     pass
 
 
+class HyperConnection:
+    """
+    The settings a Hyper object's services use to reach a hyper app.
+    Created by connect and shared by all of a Hyper object's services.
+
+    ...
+
+    Attributes
+    ----------
+    connection_string : str
+        The hyper app's connection string.
+    domain : str
+        The service name.
+    compression : Compression, optional
+        Compression applied to large data query, data bulk, and search
+        load request bodies.
+    compression_threshold : int
+        Minimum request body size, in bytes, before compression is applied.
+    transport : Transport, optional
+        The transport requests are sent over.  None uses the process wide
+        default transport.
+    timeout : Timeout, optional
+        The seconds to wait for a connection and then for each read, as
+        (connect, read) or one number for both.  None uses DEFAULT_TIMEOUT.
+    """
+
+    __slots__ = (
+        "connection_string",
+        "domain",
+        "compression",
+        "compression_threshold",
+        "transport",
+        "timeout",
+    )
+
+    def __init__(
+        self,
+        connection_string: str,
+        domain: str,
+        compression: Optional[Compression],
+        compression_threshold: int,
+        transport: Optional["Transport"] = None,
+        timeout: Optional["Timeout"] = None,
+    ):
+        self.connection_string = connection_string
+        self.domain = domain
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.transport = transport
+        self.timeout = timeout
+
+    def call(self, service_fn: Callable, *args: Any, **kwargs: Any):
+        """
+        Calls a hyper_connect.services function for this connection, with
+        this connection's timeout, and returns what it returns.
+        """
+        with hyper_utils.default_timeout(self.timeout):
+            return service_fn(
+                *args,
+                self.connection_string,
+                self.domain,
+                transport=self.transport,
+                **kwargs,
+            )
+
+    def request(self, service_fn: Callable, *args: Any, **kwargs: Any):
+        """
+        Calls a hyper_connect.services function for this connection and
+        returns its handled response.
+        """
+        response = self.call(service_fn, *args, **kwargs)
+        return hyper_utils.handle_response_sync(response)
+
+    def request_async(self, service_fn: Callable, *args: Any, **kwargs: Any):
+        """
+        Calls an async hyper_connect.services function for this connection
+        and returns a promise of its handled response.
+        """
+        return self.call(service_fn, *args, **kwargs).then(
+            hyper_utils.handle_response
+        )
+
+
+def _remember_missing(
+    missing: Optional["LocalCache"], key: str, result: Any
+) -> Any:
+    """Keeps a copy of a 404 result for a key in a negative cache."""
+    if (
+        missing is not None
+        and isinstance(result, dict)
+        and result.get("status") == 404
+    ):
+        missing.set(key, copy.deepcopy(result))
+    return result
+
+
+def _forget_keys(
+    local: Optional["LocalCache"], keys: List[Any], result: Any
+) -> Any:
+    """Drops keys this client just wrote from a local cache."""
+    if local is not None:
+        for key in keys:
+            if isinstance(key, str):
+                local.delete(key)
+    return result
+
+
 class HyperCache:
     """
     The cache service improves the performance of your applications by allowing you to retrieve information from fast,
@@ -407,7 +571,8 @@ class HyperCache:
             - starts with "movie*"
             - ends with "*-1984"
             - in-bewteen "movie*1984"
-
+    iter_query(pattern, page_size)
+        Streams the matches of a query in pages.
 
     add_async(key, value, ttl):
         Asynchronously creates a cached key, value pair in the cache service.
@@ -428,36 +593,108 @@ class HyperCache:
             - starts with "movie*"
             - ends with "*-1984"
             - in-bewteen "movie*1984"
+    iter_query_async(pattern, page_size)
+        Asynchronously streams the matches of a query in pages.
+    stats():
+        Returns the hit ratios of the in-process (L1) cache.
+
+    When created with a LocalCache (see connect's cache_l1_size), get and
+    get_async answer from it before asking hyper.  Values read from hyper
+    or written by add and set are kept in it for their ttl, at most the
+    LocalCache's max_ttl.  Failed writes and remove drop the key from it.
+    Writes made by other clients are only seen once the local copy
+    expires, so keep max_ttl short.
+
+    When created with a `missing` LocalCache (see connect's
+    negative_cache_size), keys hyper reported missing (404) are answered
+    from it until its max_ttl passes, or this client writes the key.
     """
 
+    __slots__ = ("_connection", "_l1", "_missing", "_l2_hits", "_l2_misses")
+
     def __init__(
         self,
-        # ASYNC
-        add_cache_async_fn: Callable,
-        get_cache_async_fn: Callable,
-        set_cache_async_fn: Callable,
-        remove_cache_async_fn: Callable,
-        post_cache_query_async_fn: Callable,
-        # SYNC
-        add_cache_sync_fn: Callable,
-        get_cache_sync_fn: Callable,
-        set_cache_sync_fn: Callable,
-        remove_cache_sync_fn: Callable,
-        post_cache_query_sync_fn: Callable,
+        connection: HyperConnection,
+        l1: Optional["LocalCache"] = None,
+        missing: Optional["LocalCache"] = None,
     ):
-        # ASYNC
-        self._add_cache_async = add_cache_async_fn
-        self._get_cache_async = get_cache_async_fn
-        self._set_cache_async = set_cache_async_fn
-        self._remove_cache_async = remove_cache_async_fn
-        self._post_cache_query_async = post_cache_query_async_fn
-
-        # SYNC
-        self._add_cache_sync = add_cache_sync_fn
-        self._get_cache_sync = get_cache_sync_fn
-        self._set_cache_sync = set_cache_sync_fn
-        self._remove_cache_sync = remove_cache_sync_fn
-        self._post_cache_query_sync = post_cache_query_sync_fn
+        self._connection = connection
+        self._l1 = l1
+        self._missing = missing
+        self._l2_hits = 0
+        self._l2_misses = 0
+
+    def _cached(self, key: str) -> Optional[Dict]:
+        """
+        Returns a copy of the L1 value, or of the 404 result, cached for a
+        key, if there is one.
+        """
+        for local in (self._l1, self._missing):
+            if local is not None:
+                cached = local.get(key)
+                if cached is not None:
+                    return copy.deepcopy(cached)
+        return None
+
+    def _remember_read(self, key: str, result: Any) -> Any:
+        _remember_missing(self._missing, key, result)
+        if self._l1 is None:
+            return result
+        if isinstance(result, dict) and result.get("status") == 200:
+            self._l2_hits += 1
+            self._l1.set(key, copy.deepcopy(result))
+        else:
+            self._l2_misses += 1
+        return result
+
+    def _remember_write(
+        self, key: str, value: Dict, ttl: Optional[str], result: Any
+    ) -> Any:
+        if self._missing is not None:
+            self._missing.delete(key)
+        if self._l1 is None:
+            return result
+        if isinstance(result, dict) and result.get("ok"):
+            # a get of the key returns the value with its status
+            cached = copy.deepcopy(value)
+            cached["status"] = 200
+            self._l1.set(
+                key,
+                cached,
+                None if ttl is None else hyper_utils.parse_ttl(ttl),
+            )
+        else:
+            self._l1.delete(key)
+        return result
+
+    def _forget(self, key: str, result: Any) -> Any:
+        for local in (self._l1, self._missing):
+            if local is not None:
+                local.delete(key)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns how many get and get_async calls were answered by the
+        in-process cache (l1_hits), by hyper (l2_hits), or missed, and the
+        L1 and L2 hit ratios.  All zero when there is no in-process cache.
+
+        Example:
+            hyper.cache.stats()
+            # {'l1_hits': 90, 'l2_hits': 8, 'misses': 2, 'l1_hit_ratio': 0.9, 'l2_hit_ratio': 0.8}
+        """
+        l1_hits = self._l1.hits if self._l1 is not None else 0
+        l2_lookups = self._l2_hits + self._l2_misses
+        lookups = l1_hits + l2_lookups
+        return {
+            "l1_hits": l1_hits,
+            "l2_hits": self._l2_hits,
+            "misses": self._l2_misses,
+            "l1_hit_ratio": l1_hits / lookups if lookups else 0.0,
+            "l2_hit_ratio": (
+                self._l2_hits / l2_lookups if l2_lookups else 0.0
+            ),
+        }
 
     # ASYNC
     def add_async(self, key: str, value: Dict, ttl: Optional[str]) -> Result:
@@ -505,7 +742,9 @@ class HyperCache:
         -------
         Promise of a Result.
         """
-        return self._add_cache_async(key, value, ttl)
+        return self._connection.request_async(
+            hyper_services.add_cache_async, key, value, ttl
+        ).then(lambda result: self._remember_write(key, value, ttl, result))
 
     def get_async(self, key: str) -> HyperGetResult:
         """
@@ -530,7 +769,15 @@ class HyperCache:
         -------
         Promise of a HyperGetResult.
         """
-        return self._get_cache_async(key)
+        cached = self._cached(key)
+        if cached is not None:
+            from promisio import Promise
+
+            return Promise.resolve(cached)
+
+        return self._connection.request_async(
+            hyper_services.get_cache_async, key
+        ).then(lambda result: self._remember_read(key, result))
 
     def set_async(self, key: str, value: Dict, ttl: Optional[str]) -> Result:
         """
@@ -577,7 +824,9 @@ class HyperCache:
         Promise of a Result.
         """
 
-        return self._set_cache_async(key, value, ttl)
+        return self._connection.request_async(
+            hyper_services.set_cache_async, key, value, ttl
+        ).then(lambda result: self._remember_write(key, value, ttl, result))
 
     def remove_async(self, key: str) -> Result:
         """
@@ -603,7 +852,9 @@ class HyperCache:
         -------
         Promise of a Result.
         """
-        return self._remove_cache_async(key)
+        return self._connection.request_async(
+            hyper_services.remove_cache_async, key
+        ).then(lambda result: self._forget(key, result))
 
     def query_async(self, pattern: str) -> HyperDocsResult:
         """
@@ -632,7 +883,31 @@ class HyperCache:
         -------
         Promise of a HyperDocsResult.
         """
-        return self._post_cache_query_async(pattern)
+        return self._connection.request_async(
+            hyper_services.post_cache_query_async, pattern
+        )
+
+    def iter_query_async(
+        self, pattern: str, page_size: int = CACHE_QUERY_PAGE_SIZE
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Asynchronously streams the matches of a cache query in pages.  The
+        response is read on a thread, so the event loop keeps running.
+        See iter_query.
+
+        Example:
+            async for page in hyper.cache.iter_query_async("user-*"):
+                for doc in page:
+                    print(doc["key"])
+
+        Returns
+        -------
+        Async iterator of pages, each a List of {'key': ..., 'value': ...}
+        Dicts.
+        """
+        return hyper_utils.iterate_in_executor(
+            self.iter_query(pattern, page_size)
+        )
 
     # SYNC
     def add(self, key: str, value: Dict, ttl: Optional[str]) -> Result:
@@ -681,7 +956,10 @@ class HyperCache:
         -------
         Result.
         """
-        return self._add_cache_sync(key, value, ttl)
+        result = self._connection.request(
+            hyper_services.add_cache, key, value, ttl
+        )
+        return self._remember_write(key, value, ttl, result)
 
     def get(self, key: str) -> HyperGetResult:
         """
@@ -706,7 +984,12 @@ class HyperCache:
         -------
         HyperGetResult
         """
-        return self._get_cache_sync(key)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        result = self._connection.request(hyper_services.get_cache, key)
+        return self._remember_read(key, result)
 
     def set(self, key: str, value: Dict, ttl: Optional[str]) -> Result:
         """
@@ -751,7 +1034,10 @@ class HyperCache:
         -------
         Result.
         """
-        return self._set_cache_sync(key, value, ttl)
+        result = self._connection.request(
+            hyper_services.set_cache, key, value, ttl
+        )
+        return self._remember_write(key, value, ttl, result)
 
     def remove(self, key: str) -> Result:
         """
@@ -777,7 +1063,8 @@ class HyperCache:
         -------
         Result.
         """
-        return self._remove_cache_sync(key)
+        result = self._connection.request(hyper_services.remove_cache, key)
+        return self._forget(key, result)
 
     def query(self, pattern: str) -> HyperDocsResult:
         """
@@ -806,7 +1093,114 @@ class HyperCache:
         -------
         HyperDocsResult.
         """
-        return self._post_cache_query_sync(pattern)
+        return self._connection.request(
+            hyper_services.post_cache_query, pattern
+        )
+
+    def memoize(
+        self,
+        ttl: str = "5m",
+        key: Optional[Callable[..., str]] = None,
+        stale_ttl: str = "1h",
+        beta: float = 1.0,
+    ) -> Callable[[Callable], Callable]:
+        """
+        A decorator that caches a function's results in this cache service.
+        Works on both regular and async functions.
+
+        A result is fresh for `ttl`.  After that, and for up to `stale_ttl`
+        more, the cached result is still returned while a single background
+        call refreshes it.  Fresh results are also refreshed early, with a
+        chance that grows as they near expiry and with how long the function
+        takes, so a hot key is refreshed by one caller instead of all of
+        them at once.  When the cache cannot be read the function is called.
+
+        Results are stored as JSON, so they must be JSON serializable.
+
+        Example:
+
+            @hyper.cache.memoize(ttl="10m", key=lambda id: f"movie-{id}")
+            def movie_details(id: str) -> Dict:
+                ...
+
+            @hyper.cache.memoize(ttl="30s")
+            async def top_movies(limit: int) -> List[Dict]:
+                ...
+
+        Parameters
+        ----------
+        ttl : str
+            How long a result is fresh.  eg: "30s", "10m", "1h"
+        key : Callable, optional
+            Called with the function's arguments to build the cache key.
+            Defaults to a hash of the function's name and arguments.
+        stale_ttl : str
+            How long after `ttl` a stale result may be served.
+        beta : float
+            How eagerly results are refreshed before they expire.  0 turns
+            early refresh off.
+
+        Returns
+        -------
+        Decorator
+        """
+        from hyper_connect._memoize import memoize
+
+        return memoize(self, ttl, key, stale_ttl, beta)
+
+    def iter_query(
+        self, pattern: str, page_size: int = CACHE_QUERY_PAGE_SIZE
+    ) -> Iterator[List[Dict]]:
+        """
+        Streams the matches of a cache query in pages of up to `page_size`
+        documents.
+
+        hyper answers a query with every match at once.  iter_query reads
+        that response as it arrives and decodes one match at a time, so
+        memory holds a page, not the whole keyspace.
+
+        Example:
+            for page in hyper.cache.iter_query("user-*", page_size=500):
+                for doc in page:
+                    print(doc["key"], doc["value"])
+
+        Parameters
+        ----------
+        pattern : str
+            See query.
+        page_size : int
+            The most documents per page.
+
+        Returns
+        -------
+        Iterator of pages, each a List of {'key': ..., 'value': ...} Dicts.
+        Raises requests.HTTPError when hyper answers with an error.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        response = self._connection.call(
+            hyper_services.post_cache_query, pattern, stream=True
+        )
+        try:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = "utf-8"
+
+            page: List[Dict] = []
+            for doc in hyper_utils.iter_json_array(
+                response.iter_content(STREAM_CHUNK_SIZE, decode_unicode=True),
+                "docs",
+            ):
+                page.append(doc)
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+                    hyper_utils.check_deadline()
+            if page:
+                yield page
+        finally:
+            response.close()
 
 
 class HyperData:
@@ -832,10 +1226,20 @@ class HyperData:
         Inserts documents.
     query(selector, options)
         Queries documents.
+    iter_query(selector, options, page_size)
+        Streams the documents of a query in pages.
+    query_columns(selector, fields, dtypes, options, page_size)
+        Queries documents into numpy columns.
     list(options)
         Lists documents.
     index(name, fields)
         Creates an index to speed data retrieval.
+    ensure_indexes(indexes, registry)
+        Creates the indexes that were not created before.
+    export(target, selector, **options)
+        Writes documents to newline delimited JSON.
+    import_(source, **options)
+        Writes documents from newline delimited JSON.
     add_async(doc):
         Asynchronously adds a document to the data service.
     remove_async(id):
@@ -852,48 +1256,138 @@ class HyperData:
         Asynchronously lists documents.
     index_async(name, fields)
         Asynchronously creates an index to speed data retrieval.
+
+    When created with a `missing` LocalCache (see connect's
+    negative_cache_size), ids hyper reported missing (404) are answered
+    from it until its max_ttl passes, or this client writes the id.
+
+    When created with a `versions` LocalCache (see connect's
+    conditional_cache_size), the last copy of each doc read is kept with
+    its ETag (or `_rev`) and Last-Modified validators.  get asks hyper to
+    send the doc only if it changed, and returns the kept copy when hyper
+    answers 304 Not Modified.
+
+    When created with a QueryAdvisor (see connect's query_advisor), the
+    shape and latency of every query are recorded in it.
     """
 
+    __slots__ = (
+        "_connection",
+        "_missing",
+        "_versions",
+        "_advisor",
+        "_indexes",
+    )
+
     def __init__(
         self,
-        # ASYNC
-        add_data_doc_async_fn: Callable,
-        get_data_doc_async_fn: Callable,
-        list_data_docs_async_fn: Callable,
-        update_data_doc_async_fn: Callable,
-        remove_data_doc_async_fn: Callable,
-        query_docs_async_fn: Callable,
-        index_docs_async_fn: Callable,
-        bulk_docs_async_fn: Callable,
-        # SYNC
-        add_data_doc_sync_fn: Callable,
-        get_data_doc_sync_fn: Callable,
-        list_data_docs_sync_fn: Callable,
-        update_data_doc_sync_fn: Callable,
-        remove_data_doc_sync_fn: Callable,
-        query_docs_sync_fn: Callable,
-        index_docs_sync_fn: Callable,
-        bulk_docs_sync_fn: Callable,
+        connection: HyperConnection,
+        missing: Optional["LocalCache"] = None,
+        versions: Optional["LocalCache"] = None,
+        advisor: Optional["QueryAdvisor"] = None,
     ):
-        # ASYNC
-        self._add_data_async_doc = add_data_doc_async_fn
-        self._get_data_async_doc = get_data_doc_async_fn
-        self._list_data_async_docs = list_data_docs_async_fn
-        self._update_data_async_doc = update_data_doc_async_fn
-        self._remove_data_async_doc = remove_data_doc_async_fn
-        self._query_async_docs = query_docs_async_fn
-        self._index_async_docs = index_docs_async_fn
-        self._bulk_async_docs = bulk_docs_async_fn
-
-        # SYNC
-        self._add_data_sync_doc = add_data_doc_sync_fn
-        self._get_data_sync_doc = get_data_doc_sync_fn
-        self._list_data_sync_docs = list_data_docs_sync_fn
-        self._update_data_sync_doc = update_data_doc_sync_fn
-        self._remove_data_sync_doc = remove_data_doc_sync_fn
-        self._query_sync_docs = query_docs_sync_fn
-        self._index_sync_docs = index_docs_sync_fn
-        self._bulk_sync_docs = bulk_docs_sync_fn
+        self._connection = connection
+        self._missing = missing
+        self._versions = versions
+        self._advisor = advisor
+        self._indexes: Optional["IndexRegistry"] = None
+
+    @property
+    def advisor(self) -> Optional["QueryAdvisor"]:
+        """The QueryAdvisor queries are recorded in, or None."""
+        return self._advisor
+
+    def _recorded(
+        self,
+        selector: Dict,
+        options: QueryOptions,
+        started: float,
+    ) -> Callable[[Any], Any]:
+        def record(result: Any) -> Any:
+            if self._advisor is not None:
+                self._advisor.record(
+                    selector, options, time.monotonic() - started, result
+                )
+            return result
+
+        return record
+
+    def _cached_missing(self, id: str) -> Optional[Dict]:
+        if self._missing is None:
+            return None
+        cached = self._missing.get(id)
+        return None if cached is None else copy.deepcopy(cached)
+
+    def _written(self, ids: List[Any]) -> Callable[[Any], Any]:
+        def forget(result: Any) -> Any:
+            _forget_keys(self._versions, ids, result)
+            return _forget_keys(self._missing, ids, result)
+
+        return forget
+
+    def _revalidated(
+        self, version: Any, response: "requests.Response"
+    ) -> Optional[Dict]:
+        """Returns the kept copy of a doc when hyper says it is unchanged."""
+        if version is not None and response.status_code == 304:
+            response.close()
+            return copy.deepcopy(version[2])
+        return None
+
+    def _remember_version(
+        self, id: str, response: "requests.Response", result: Any
+    ) -> Any:
+        if self._versions is None:
+            return result
+        if isinstance(result, dict) and result.get("status") == 200:
+            etag, last_modified = hyper_utils.response_validators(response)
+            if etag is None and isinstance(result.get("_rev"), str):
+                etag = f'"{result["_rev"]}"'
+            if etag is not None or last_modified is not None:
+                self._versions.set(
+                    id, (etag, last_modified, copy.deepcopy(result))
+                )
+                return result
+        self._versions.delete(id)
+        return result
+
+    def _get_conditional(self, id: str) -> Any:
+        assert self._versions is not None
+        c = self._connection
+        version = self._versions.get(id)
+        etag, last_modified = version[:2] if version else (None, None)
+        response = c.call(
+            hyper_services.get_data,
+            id,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        kept = self._revalidated(version, response)
+        if kept is not None:
+            return kept
+        result = hyper_utils.handle_response_sync(response)
+        return self._remember_version(id, response, result)
+
+    def _get_conditional_async(self, id: str) -> Any:
+        assert self._versions is not None
+        c = self._connection
+        version = self._versions.get(id)
+        etag, last_modified = version[:2] if version else (None, None)
+
+        def handle(response: "requests.Response") -> Any:
+            kept = self._revalidated(version, response)
+            if kept is not None:
+                return kept
+            return hyper_utils.handle_response(response).then(
+                lambda result: self._remember_version(id, response, result)
+            )
+
+        return c.call(
+            hyper_services.get_data_async,
+            id,
+            etag=etag,
+            last_modified=last_modified,
+        ).then(handle)
 
     # ASYNC
     def add_async(self, doc: Dict) -> IdResult:
@@ -935,7 +1429,9 @@ class HyperData:
         -------
         Promise of a IdResult (OkIdResult, NotOkResult).
         """
-        return self._add_data_async_doc(doc)
+        return self._connection.request_async(
+            hyper_services.add_data_async, doc
+        ).then(self._written([doc.get("_id")]))
 
     def get_async(self, id: str) -> HyperGetResult:
         """
@@ -958,7 +1454,21 @@ class HyperData:
         -------
         Promise of a HyperGetResult (Dict, NotOkResult).
         """
-        return self._get_data_async_doc(id)
+        cached = self._cached_missing(id)
+        if cached is not None:
+            from promisio import Promise
+
+            return Promise.resolve(cached)
+
+        if self._versions is not None:
+            promise = self._get_conditional_async(id)
+        else:
+            promise = self._connection.request_async(
+                hyper_services.get_data_async, id
+            )
+        return promise.then(
+            lambda result: _remember_missing(self._missing, id, result)
+        )
 
     def list_async(self, options: ListOptions) -> HyperDocsResult:
         """
@@ -984,7 +1494,9 @@ class HyperData:
         -------
         Promise of a HyperDocsResult (OkDocsResult, NotOkDocsResult).
         """
-        return self._list_data_async_docs(options)
+        return self._connection.request_async(
+            hyper_services.get_data_list_async, options
+        )
 
     def update_async(self, id: str, doc: Dict) -> IdResult:
         """
@@ -1026,7 +1538,9 @@ class HyperData:
         -------
         Promise of a IdResult (OkIdResult, NotOkResult).
         """
-        return self._update_data_async_doc(id, doc)
+        return self._connection.request_async(
+            hyper_services.update_data_async, id, doc
+        ).then(self._written([id]))
 
     def remove_async(self, id: str) -> IdResult:
         """
@@ -1049,7 +1563,9 @@ class HyperData:
         -------
         Promise of a IdResult (OkIdResult, NotOkResult).
         """
-        return self._remove_data_async_doc(id)
+        return self._connection.request_async(
+            hyper_services.remove_data_async, id
+        ).then(self._written([id]))
 
     def query_async(
         self, selector: Dict, options: QueryOptions
@@ -1087,7 +1603,15 @@ class HyperData:
         -------
         Promise of a HyperDocsResult (OkDocsResult, NotOkDocsResult)
         """
-        return self._query_async_docs(selector, options)
+        c = self._connection
+        started = time.monotonic()
+        return c.request_async(
+            hyper_services.post_query_async,
+            selector,
+            options,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        ).then(self._recorded(selector, options, started))
 
     def index_async(self, name: str, fields: List[str]) -> Result:
         """
@@ -1130,7 +1654,9 @@ class HyperData:
         -------
         Promise of a Result (OkResult, NotOkResult)
         """
-        return self._index_async_docs(name, fields)
+        return self._connection.request_async(
+            hyper_services.post_index_async, name, fields
+        )
 
     def bulk_async(self, docs: List[Dict]) -> HyperDocsResult:
         """
@@ -1190,7 +1716,13 @@ class HyperData:
         -------
         Promise of a HyperDocsResult (OkDocsResult, NotOkDocsResult)
         """
-        return self._bulk_async_docs(docs)
+        c = self._connection
+        return c.request_async(
+            hyper_services.post_bulk_async,
+            docs,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        ).then(self._written([doc.get("_id") for doc in docs]))
 
     # SYNC
     def add(self, doc: Dict) -> IdResult:
@@ -1232,7 +1764,8 @@ class HyperData:
         -------
         IdResult (OkIdResult, NotOkResult).
         """
-        return self._add_data_sync_doc(doc)
+        result = self._connection.request(hyper_services.add_data, doc)
+        return self._written([doc.get("_id")])(result)
 
     def get(self, id: str) -> HyperGetResult:
         """
@@ -1255,7 +1788,15 @@ class HyperData:
         -------
         HyperGetResult (Dict, NotOkResult).
         """
-        return self._get_data_sync_doc(id)
+        cached = self._cached_missing(id)
+        if cached is not None:
+            return cached
+
+        if self._versions is not None:
+            result = self._get_conditional(id)
+        else:
+            result = self._connection.request(hyper_services.get_data, id)
+        return _remember_missing(self._missing, id, result)
 
     def list(self, options: ListOptions) -> HyperDocsResult:
         """
@@ -1281,7 +1822,7 @@ class HyperData:
         -------
         HyperDocsResult (OkDocsResult, NotOkDocsResult).
         """
-        return self._list_data_sync_docs(options)
+        return self._connection.request(hyper_services.get_data_list, options)
 
     def update(self, id: str, doc: Dict) -> IdResult:
         """
@@ -1323,7 +1864,8 @@ class HyperData:
         -------
         IdResult (OkIdResult, NotOkResult).
         """
-        return self._update_data_sync_doc(id, doc)
+        result = self._connection.request(hyper_services.update_data, id, doc)
+        return self._written([id])(result)
 
     def remove(self, id: str) -> IdResult:
         """
@@ -1346,7 +1888,87 @@ class HyperData:
         -------
         IdResult (OkIdResult, NotOkResult).
         """
-        return self._remove_data_sync_doc(id)
+        result = self._connection.request(hyper_services.remove_data, id)
+        return self._written([id])(result)
+
+    def write_buffer(self, **options: Any) -> "DataWriteBuffer":
+        """
+        Returns a DataWriteBuffer that coalesces add, update, and remove
+        calls per _id and sends them in the background with bulk.
+        `options` are passed to DataWriteBuffer.
+
+        Example:
+
+            writes = hyper.data.write_buffer(batch_size=200, interval=0.1)
+
+            writes.add(movie)
+            writes.remove("movie-5001")
+            writes.flush()  # both written
+
+        Returns
+        -------
+        DataWriteBuffer
+        """
+        from hyper_connect._write_buffer import DataWriteBuffer
+
+        return DataWriteBuffer(self, **options)
+
+    def export(
+        self,
+        target: Union[str, "os.PathLike[str]", IO],
+        selector: Optional[Dict] = None,
+        **options: Any,
+    ) -> Dict[str, Any]:
+        """
+        Writes every document, or those matching `selector`, to a file or
+        stream as newline delimited JSON, a page at a time, so memory holds
+        one page.  A path is replaced only once the export succeeds, and
+        paths ending in ".gz" are gzipped.
+
+        `options` are page_size, compress, to gzip or not, and progress, a
+        function called after every page with the counts so far.
+
+        Example:
+
+            hyper.data.export("backup.ndjson.gz")
+            hyper.data.export(sys.stdout, {"type": "movie"})
+
+        Returns
+        -------
+        {'ok': True, 'docs': ..., 'bytes': ...}, or a NotOkResult.
+        """
+        from hyper_connect._ndjson import export_data
+
+        return export_data(self, target, selector, **options)
+
+    def import_(
+        self, source: Union[str, "os.PathLike[str]", IO], **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Writes the documents of a newline delimited JSON file or stream,
+        eg one written by export, with concurrent bulk requests.  Lines are
+        read as batches are sent, and gzipped files are read as they are.
+
+        `options` are batch_size and max_batch_bytes, the most documents
+        and bytes per bulk request, concurrency, retries, checkpoint, and
+        progress, a function called after every batch with the counts so
+        far.  With a checkpoint path, an import that failed carries on
+        from the last batch hyper accepted when it is run again.
+
+        Example:
+
+            hyper.data.import_(
+                "backup.ndjson.gz", checkpoint="backup.checkpoint"
+            )
+
+        Returns
+        -------
+        {'ok': True, 'docs': ..., 'failed': ..., 'line': ...}, or a
+        NotOkResult with the same counts.
+        """
+        from hyper_connect._ndjson import import_data
+
+        return import_data(self, source, **options)
 
     def query(self, selector: Dict, options: QueryOptions) -> HyperDocsResult:
         """
@@ -1382,7 +2004,132 @@ class HyperData:
         -------
         HyperDocsResult (OkDocsResult, NotOkDocsResult)
         """
-        return self._query_sync_docs(selector, options)
+        c = self._connection
+        started = time.monotonic()
+        result = c.request(
+            hyper_services.post_query,
+            selector,
+            options,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        )
+        return self._recorded(selector, options, started)(result)
+
+    def iter_query(
+        self,
+        selector: Dict,
+        options: Optional[QueryOptions] = None,
+        page_size: int = DATA_QUERY_PAGE_SIZE,
+    ) -> Iterator[List[Dict]]:
+        """
+        Streams the documents of a query in pages of up to `page_size`.
+
+        hyper answers a query with every match at once.  iter_query reads
+        that response as it arrives and decodes one document at a time, so
+        memory holds a page, not every match.
+
+        Example:
+            for page in hyper.data.iter_query({"type": "movie"}):
+                for doc in page:
+                    print(doc["title"])
+
+        Parameters
+        ----------
+        selector : Dict
+            See query.
+        options : QueryOptions, optional
+            See query.
+        page_size : int
+            The most documents per page.
+
+        Returns
+        -------
+        Iterator of pages, each a List of documents.
+        Raises requests.HTTPError when hyper answers with an error.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        c = self._connection
+        response = c.call(
+            hyper_services.post_query,
+            selector,
+            {"useIndex": None, **(options or {})},
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+            stream=True,
+        )
+        try:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = "utf-8"
+
+            page: List[Dict] = []
+            for doc in hyper_utils.iter_json_array(
+                response.iter_content(STREAM_CHUNK_SIZE, decode_unicode=True),
+                "docs",
+            ):
+                page.append(doc)
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+                    hyper_utils.check_deadline()
+            if page:
+                yield page
+        finally:
+            response.close()
+
+    def query_columns(
+        self,
+        selector: Dict,
+        fields: List[str],
+        dtypes: Optional[Dict[str, Any]] = None,
+        options: Optional[QueryOptions] = None,
+        page_size: int = DATA_QUERY_PAGE_SIZE,
+    ) -> Dict[str, "numpy.ma.MaskedArray"]:
+        """
+        Queries documents and returns their fields as numpy columns, for
+        vectorized aggregations.
+
+        Only `fields` are requested from hyper.  The response is streamed
+        and decoded a page at a time straight into arrays, so the matches
+        are never held as a list of Dicts.  Missing and null values are
+        masked.
+
+        Example:
+            columns = hyper.data.query_columns(
+                {"type": "movie"}, ["year", "rating"], {"year": "int32"}
+            )
+            columns["rating"][columns["year"] >= 1980].mean()
+
+        Parameters
+        ----------
+        selector : Dict
+            See query.
+        fields : List[str]
+            The fields to return, one column each.
+        dtypes : Dict[str, Any], optional
+            numpy dtypes by field, see hyper_connect.utils.to_columns.
+        options : QueryOptions, optional
+            See query.  Its fields are replaced with `fields`.
+        page_size : int
+            The most documents decoded at a time.
+
+        Returns
+        -------
+        Dict of field to numpy.ma.MaskedArray.
+        Raises requests.HTTPError when hyper answers with an error.
+        Requires numpy, install it with: pip install "hyper-connect[numpy]"
+        """
+        pages = self.iter_query(
+            selector, {**(options or {}), "fields": fields}, page_size
+        )
+        return hyper_utils.to_columns(
+            (doc for page in pages for doc in page),
+            fields,
+            dtypes,
+            chunk_size=page_size,
+        )
 
     def index(self, name: str, fields: List[str]) -> Result:
         """
@@ -1425,7 +2172,73 @@ class HyperData:
         -------
         Result (OkResult, NotOkResult)
         """
-        return self._index_sync_docs(name, fields)
+        return self._connection.request(
+            hyper_services.post_index, name, fields
+        )
+
+    def ensure_indexes(
+        self,
+        indexes: Optional[List[Dict]] = None,
+        registry: Optional["IndexRegistry"] = None,
+    ) -> List[Dict]:
+        """
+        Creates each index that is not in the registry yet, and adds the
+        ones hyper creates to it, so calling it again, eg on every deploy,
+        only creates new or changed indexes.
+
+        Example:
+
+            hyper.data.ensure_indexes(
+                [{"name": "idx_type_published", "fields": ["type", "published"]}],
+                registry=IndexRegistry(".hyper-indexes.json"),
+            )
+
+        Parameters
+        ----------
+        indexes : List[Dict], optional
+            Dicts with the "name" and "fields" of each index.  The default
+            is the query advisor's recommendations.
+        registry : IndexRegistry, optional
+            Where created indexes are remembered.  The default is kept in
+            memory by this Hyper object.
+
+        Returns
+        -------
+        List of Result (OkResult, NotOkResult), one per index in order,
+        each with the index's "name".  Indexes that were created before
+        are {'ok': True, 'skipped': True, 'name': ...}.
+        """
+        from urllib.parse import urlparse
+
+        from hyper_connect._index_advisor import IndexRegistry
+
+        if indexes is None:
+            if self._advisor is None:
+                raise ValueError(
+                    "pass indexes, or connect with query_advisor=True"
+                )
+            indexes = self._advisor.recommendations()
+        if registry is None:
+            if self._indexes is None:
+                self._indexes = IndexRegistry()
+            registry = self._indexes
+
+        # the app and domain, without the connection string's secret
+        url = urlparse(self._connection.connection_string)
+        app = f"{url.hostname}{url.path}/{self._connection.domain}"
+
+        results: List[Dict] = []
+        for index in indexes:
+            name, fields = index["name"], list(index["fields"])
+            if registry.has(app, name, fields):
+                results.append({"ok": True, "skipped": True, "name": name})
+                continue
+
+            result: Any = self.index(name, fields)
+            if result.get("ok"):
+                registry.add(app, name, fields)
+            results.append({**result, "name": name})
+        return results
 
     def bulk(self, docs: List[Dict]) -> HyperDocsResult:
         """
@@ -1485,7 +2298,14 @@ class HyperData:
         -------
         HyperDocsResult (OkDocsResult, NotOkDocsResult)
         """
-        return self._bulk_sync_docs(docs)
+        c = self._connection
+        result = c.request(
+            hyper_services.post_bulk,
+            docs,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        )
+        return self._written([doc.get("_id") for doc in docs])(result)
 
 
 class HyperStorage:
@@ -1509,27 +2329,60 @@ class HyperStorage:
         Asynchronously retrieves an object from a storage service bucket.
     remove_async(name: str)
         Asynchronously deletes the object from the storage service bucket.
+
+    When created with a `versions` LocalCache (see connect's
+    conditional_cache_size), downloads of up to CONDITIONAL_MAX_BODY bytes
+    that carry an ETag or Last-Modified header are kept.  download asks
+    hyper to send the object only if it changed, and returns a copy of
+    the kept response when hyper answers 304 Not Modified.
     """
 
+    __slots__ = ("_connection", "_versions")
+
     def __init__(
         self,
-        # ASYNC
-        upload_async_fn: Callable,
-        download_async_fn: Callable,
-        remove_async_fn: Callable,
-        # SYNC
-        upload_sync_fn: Callable,
-        download_sync_fn: Callable,
-        remove_sync_fn: Callable,
+        connection: HyperConnection,
+        versions: Optional["LocalCache"] = None,
     ):
-        # ASYNC
-        self._upload_async_fn = upload_async_fn
-        self._download_async_fn = download_async_fn
-        self._remove_async_fn = remove_async_fn
-        # SYNC
-        self._upload_sync_fn = upload_sync_fn
-        self._download_sync_fn = download_sync_fn
-        self._remove_sync_fn = remove_sync_fn
+        self._connection = connection
+        self._versions = versions
+
+    def _forget_version(self, name: str):
+        if self._versions is not None:
+            self._versions.delete(name)
+
+    def _version(self, name: str) -> Any:
+        if self._versions is None:
+            return None
+        return self._versions.get(name)
+
+    def _downloaded(
+        self, name: str, version: Any, response: "requests.Response"
+    ) -> "requests.Response":
+        if self._versions is None:
+            return response
+        if version is not None and response.status_code == 304:
+            response.close()
+            kept = copy.copy(version[2])
+            kept.headers = kept.headers.copy()
+            return kept
+
+        etag, last_modified = hyper_utils.response_validators(response)
+        length = response.headers.get("Content-Length", "")
+        if (
+            response.status_code == 200
+            and (etag is not None or last_modified is not None)
+            and length.isdigit()
+            and int(length) <= hyper_utils.CONDITIONAL_MAX_BODY
+        ):
+            # reading the body lets the kept response be read again
+            response.content
+            self._versions.set(
+                name, (etag, last_modified, copy.copy(response))
+            )
+        else:
+            self._versions.delete(name)
+        return response
 
     # ASYNC
     def upload_async(self, name: str, data: io.BufferedReader) -> Result:
@@ -1564,9 +2417,12 @@ class HyperStorage:
         -------
         Promise of a Result (OkResult, NotOkResult)
         """
-        return self._upload_async_fn(name, data)
+        self._forget_version(name)
+        return self._connection.request_async(
+            hyper_services.upload_async, name, data
+        )
 
-    def download_async(self, name: str) -> requests.Response:
+    def download_async(self, name: str) -> "requests.Response":
         """
         Asynchronously retrieves an object from a storage service bucket.
 
@@ -1601,9 +2457,17 @@ class HyperStorage:
         Promise of a Response See https://requests.readthedocs.io/en/latest/api/#requests.Response
         """
         #
-        return self._download_async_fn(name)
-
-    def remove_async(self, name: str) -> requests.Response:
+        c = self._connection
+        version = self._version(name)
+        etag, last_modified = version[:2] if version else (None, None)
+        return c.call(
+            hyper_services.download_async,
+            name,
+            etag=etag,
+            last_modified=last_modified,
+        ).then(lambda response: self._downloaded(name, version, response))
+
+    def remove_async(self, name: str) -> "requests.Response":
         """
         Asynchronously deletes the object from the storage service bucket.
 
@@ -1621,7 +2485,10 @@ class HyperStorage:
         Promise of a Result (OkResult, NotOkResult)
         """
 
-        return self._remove_async_fn(name)
+        self._forget_version(name)
+        return self._connection.request_async(
+            hyper_services.remove_storage_async, name
+        )
 
     # SYNC
     def upload(self, name: str, data: io.BufferedReader):
@@ -1654,7 +2521,8 @@ class HyperStorage:
         -------
         Result (OkResult, NotOkResult)
         """
-        return self._upload_sync_fn(name, data)
+        self._forget_version(name)
+        return self._connection.request(hyper_services.upload, name, data)
 
     def download(self, name: str):
         """
@@ -1689,7 +2557,16 @@ class HyperStorage:
         -------
         Response See https://requests.readthedocs.io/en/latest/api/#requests.Response
         """
-        return self._download_sync_fn(name)
+        c = self._connection
+        version = self._version(name)
+        etag, last_modified = version[:2] if version else (None, None)
+        response = c.call(
+            hyper_services.download,
+            name,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        return self._downloaded(name, version, response)
 
     def remove(self, name: str):
         """
@@ -1708,49 +2585,192 @@ class HyperStorage:
         -------
         Result (OkResult, NotOkResult)
         """
-        return self._remove_sync_fn(name)
+        self._forget_version(name)
+        return self._connection.request(hyper_services.remove_storage, name)
 
 
 class HyperQueue:
-    def __init__(
-        self,
-        # ASYNC
-        enqueue_async_fn: Callable,
-        list_job_errors_async_fn: Callable,
-        list_job_queued_async_fn: Callable,
-        # SYNC
-        enqueue_sync_fn: Callable,
-        list_job_errors_sync_fn: Callable,
-        list_job_queued_sync_fn: Callable,
-    ):
-        # ASYNC
-        self._enqueue_async_fn = enqueue_async_fn
-        self._list_errors_async_fn = list_job_errors_async_fn
-        self._list_queued_async_fn = list_job_queued_async_fn
-        # SYNC
-        self._enqueue_sync_fn = enqueue_sync_fn
-        self._list_errors_sync_fn = list_job_errors_sync_fn
-        self._list_queued_sync_fn = list_job_queued_sync_fn
+    __slots__ = ("_connection",)
+
+    def __init__(self, connection: HyperConnection):
+        self._connection = connection
 
     # ASYNC
     def enqueue_async(self, job: Dict):
-        return self._enqueue_async_fn(job)
+        return self._connection.request_async(
+            hyper_services.queue_enqueue_async, job
+        )
 
     def errors_async(self):
-        return self._list_errors_async_fn()
+        return self._connection.request_async(
+            hyper_services.queue_errors_async
+        )
 
     def queued_async(self):
-        return self._list_queued_async_fn()
+        return self._connection.request_async(
+            hyper_services.queue_queued_async
+        )
+
+    def enqueue_many_async(
+        self,
+        jobs: List[Dict],
+        concurrency: int = ENQUEUE_CONCURRENCY,
+        retries: int = ENQUEUE_RETRIES,
+    ):
+        """
+        Asynchronously posts many jobs to the queue.  See enqueue_many.
+
+        Example:
+            results: List[Result] = await hyper.queue.enqueue_many_async(
+                jobs, concurrency=16
+            )
+
+        Returns
+        -------
+        A promise of a List of Result (OkResult, NotOkResult), one per job
+        """
+        # imported here, asyncio alone nearly doubles the cost of connect()
+        import asyncio
+
+        from promisio import Promise
+
+        return Promise.resolve(
+            asyncio.ensure_future(
+                hyper_utils.map_concurrently_async(
+                    self._enqueue_with_retries(retries), jobs, concurrency
+                )
+            )
+        )
 
     # SYNC
     def enqueue(self, job: Dict):
-        return self._enqueue_sync_fn(job)
+        return self._connection.request(hyper_services.queue_enqueue, job)
 
     def errors(self):
-        return self._list_errors_sync_fn()
+        return self._connection.request(hyper_services.queue_errors)
 
     def queued(self):
-        return self._list_queued_sync_fn()
+        return self._connection.request(hyper_services.queue_queued)
+
+    def enqueue_many(
+        self,
+        jobs: List[Dict],
+        concurrency: int = ENQUEUE_CONCURRENCY,
+        retries: int = ENQUEUE_RETRIES,
+    ) -> List[Dict]:
+        """
+        Posts many jobs to the queue, `concurrency` at a time, over the
+        Hyper object's keep-alive connections.
+
+        Jobs that fail with a connection error, a 5xx error, or a 429 are
+        retried up to `retries` times with exponential backoff.  A failed
+        job does not stop the others.  Keep `concurrency` at or below the
+        transport's pool_maxsize so every request reuses a connection.
+
+        Example:
+            results: List[Result] = hyper.queue.enqueue_many(
+                jobs, concurrency=16
+            )
+            failed = [job for job, r in zip(jobs, results) if not r["ok"]]
+
+        Parameters
+        ----------
+        jobs : List[Dict]
+            The jobs to post.
+        concurrency : int
+            The most jobs posted at the same time.
+        retries : int
+            How many times a failed job is posted again.
+
+        Returns
+        -------
+        List of Result (OkResult, NotOkResult), in the order of `jobs`.
+        Each result has an "attempts" count.
+        """
+        return hyper_utils.map_concurrently(
+            self._enqueue_with_retries(retries), jobs, concurrency
+        )
+
+    def batcher(self, **options: Any) -> "EnqueueBatcher":
+        """
+        Returns an EnqueueBatcher that enqueues jobs in the background, in
+        batches.  `options` are passed to EnqueueBatcher.
+
+        Example:
+            with hyper.queue.batcher(batch_size=50, interval=0.1) as batcher:
+                for job in jobs:
+                    batcher.submit(job)
+
+        Returns
+        -------
+        EnqueueBatcher
+        """
+        from hyper_connect._batcher import EnqueueBatcher
+
+        return EnqueueBatcher(self, **options)
+
+    def outbox(self, path: str, **options: Any) -> "QueueOutbox":
+        """
+        Returns a QueueOutbox that keeps jobs in a SQLite database at
+        `path` until hyper accepts them.  `options` are passed to
+        QueueOutbox.
+
+        Example:
+            outbox = hyper.queue.outbox("jobs.db").start()
+            outbox.put(job, key="welcome-42")
+
+        Returns
+        -------
+        QueueOutbox
+        """
+        from hyper_connect._outbox import QueueOutbox
+
+        return QueueOutbox(self, path, **options)
+
+    def watch_errors(self, **options: Any) -> "QueueWatcher":
+        """
+        Returns a QueueWatcher that polls the queue's errored jobs and
+        yields each job once.  `options` are passed to QueueWatcher.
+
+        Example:
+            for job in hyper.queue.watch_errors(max_interval=30):
+                alert(job)
+
+            async for job in hyper.queue.watch_errors():
+                await alert_async(job)
+
+        Returns
+        -------
+        QueueWatcher
+        """
+        from hyper_connect._queue_watcher import QueueWatcher
+
+        return QueueWatcher(self.errors, self.errors_async, **options)
+
+    def watch_queued(self, **options: Any) -> "QueueWatcher":
+        """
+        Returns a QueueWatcher that polls the queue's ready jobs and yields
+        each job once.  `options` are passed to QueueWatcher.
+
+        Example:
+            for job in hyper.queue.watch_queued(interval=10):
+                print("queued", job)
+
+        Returns
+        -------
+        QueueWatcher
+        """
+        from hyper_connect._queue_watcher import QueueWatcher
+
+        return QueueWatcher(self.queued, self.queued_async, **options)
+
+    def _enqueue_with_retries(self, retries: int) -> Callable[[Dict], Dict]:
+        def enqueue(job: Dict) -> Dict:
+            return hyper_utils.call_with_retries(
+                lambda: self.enqueue(job), retries
+            )
+
+        return enqueue
 
 
 class HyperSearch:
@@ -1790,38 +2810,10 @@ class HyperSearch:
         Asynchronously queries a search service.  options argument is optional.
     """
 
-    def __init__(
-        self,
-        # ASYNC
-        add_search_doc_async_fn: Callable,
-        remove_search_doc_async_fn: Callable,
-        get_search_doc_async_fn: Callable,
-        update_search_doc_async_fn: Callable,
-        load_search_async_fn: Callable,
-        query_search_async_fn: Callable,
-        # SYNC
-        add_search_doc_sync_fn: Callable,
-        remove_search_doc_sync_fn: Callable,
-        get_search_doc_sync_fn: Callable,
-        update_search_doc_sync_fn: Callable,
-        load_search_sync_fn: Callable,
-        query_search_sync_fn: Callable,
-    ):
-        # ASYNC
-        self._add_search_async_doc = add_search_doc_async_fn
-        self._remove_search_async_doc = remove_search_doc_async_fn
-        self._get_search_async_doc = get_search_doc_async_fn
-        self._update_search_async_doc = update_search_doc_async_fn
-        self._load_search_async = load_search_async_fn
-        self._query_search_async = query_search_async_fn
-
-        # SYNC
-        self._add_search_sync_doc = add_search_doc_sync_fn
-        self._remove_search_sync_doc = remove_search_doc_sync_fn
-        self._get_search_sync_doc = get_search_doc_sync_fn
-        self._update_search_sync_doc = update_search_doc_sync_fn
-        self._load_search_sync = load_search_sync_fn
-        self._query_search_sync = query_search_sync_fn
+    __slots__ = ("_connection",)
+
+    def __init__(self, connection: HyperConnection):
+        self._connection = connection
 
     # ASYNC
     def add_async(self, key: str, doc: Dict) -> IdResult:
@@ -1842,7 +2834,9 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._add_search_async_doc(key, doc)
+        return self._connection.request_async(
+            hyper_services.add_search_async, key, doc
+        )
 
     def remove_async(self, key: str) -> Result:
         """
@@ -1860,7 +2854,9 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._remove_search_async_doc(key)
+        return self._connection.request_async(
+            hyper_services.remove_search_async, key
+        )
 
     def get_async(self, key: str) -> HyperGetResult:
         """
@@ -1878,7 +2874,9 @@ class HyperSearch:
         -------
         Promise of a HyperGetResult.
         """
-        return self._get_search_async_doc(key)
+        return self._connection.request_async(
+            hyper_services.get_search_async, key
+        )
 
     def update_async(self, key: str, doc: Dict) -> Result:
         """
@@ -1898,7 +2896,9 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._update_search_async_doc(key, doc)
+        return self._connection.request_async(
+            hyper_services.update_search_async, key, doc
+        )
 
     def load_async(self, docs: List[Dict]) -> HyperSearchLoadResult:
         """
@@ -1916,7 +2916,13 @@ class HyperSearch:
          -------
          Promise of a HyperSearchLoadResult.
         """
-        return self._load_search_async(docs)
+        c = self._connection
+        return c.request_async(
+            hyper_services.load_search_async,
+            docs,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        )
 
     def query_async(
         self, query: str, options: Optional[SearchQueryOptions]
@@ -1939,7 +2945,9 @@ class HyperSearch:
         -------
         Promise of a HyperSearchQueryResult (HyperSearchQueryOKResult or NotOkResult).
         """
-        return self._query_search_async(query, options)
+        return self._connection.request_async(
+            hyper_services.post_query_search_async, query, options
+        )
 
     # SYNC
     def add(self, key: str, doc: Dict) -> Result:
@@ -1960,7 +2968,7 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._add_search_sync_doc(key, doc)
+        return self._connection.request(hyper_services.add_search, key, doc)
 
     def remove(self, key: str) -> Result:
         """
@@ -1978,7 +2986,7 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._remove_search_sync_doc(key)
+        return self._connection.request(hyper_services.remove_search, key)
 
     def get(self, key: str) -> HyperGetResult:
         """
@@ -1996,7 +3004,7 @@ class HyperSearch:
         -------
         Promise of a HyperGetResult.
         """
-        return self._get_search_sync_doc(key)
+        return self._connection.request(hyper_services.get_search, key)
 
     def update(self, key: str, doc: Dict) -> Result:
         """
@@ -2016,7 +3024,7 @@ class HyperSearch:
         -------
         Promise of a Result (OkResult or NotOkResult).
         """
-        return self._update_search_sync_doc(key, doc)
+        return self._connection.request(hyper_services.update_search, key, doc)
 
     def load(self, docs: List[Dict]) -> HyperSearchLoadResult:
         """
@@ -2034,7 +3042,13 @@ class HyperSearch:
         -------
         Promise of a HyperSearchLoadResult.
         """
-        return self._load_search_sync(docs)
+        c = self._connection
+        return c.request(
+            hyper_services.load_search,
+            docs,
+            compression=c.compression,
+            compression_threshold=c.compression_threshold,
+        )
 
     def query(
         self, query: str, options: Optional[SearchQueryOptions]
@@ -2056,21 +3070,24 @@ class HyperSearch:
         -------
         Promise of a HyperSearchQueryResult (HyperSearchQueryOKResult or NotOkResult).
         """
-        return self._query_search_sync(query, options)
+        return self._connection.request(
+            hyper_services.post_query_search, query, options
+        )
 
 
 class HyperInfo:
-    def __init__(self, services_async_fn: Callable, services_fn: Callable):
-        self._services_async_fn = services_async_fn
-        self._services_fn = services_fn
+    __slots__ = ("_connection",)
+
+    def __init__(self, connection: HyperConnection):
+        self._connection = connection
 
     def services_async(self):
-        return self._services_async_fn()
+        return self._connection.request_async(hyper_services.services_async)
 
     def services(
         self,
     ):
-        return self._services_fn()
+        return self._connection.request(hyper_services.services)
 
 
 # Hyper Classes
@@ -2099,8 +3116,16 @@ class Hyper:
         The hyper app's Queue service
     info: HyperInfo
         The hyper app's Info service
+
+    Methods
+    -------
+    rate_limit_stats():
+        Returns how often and how long each service's requests waited for
+        its rate limits.
     """
 
+    __slots__ = ("_data", "_cache", "_search", "_storage", "_queue", "_info")
+
     def __init__(
         self,
         data: HyperData,
@@ -2164,3 +3189,25 @@ class Hyper:
     @info.setter
     def info(self, value):
         raise WriteHyperError("info service property is read-only")
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Returns, per service whose requests pass through a
+        RateLimitedTransport (see connect's rate_limits), the stats of its
+        rate limits: the requests each let through, how many of them
+        waited, and the total and longest waits in seconds.
+
+        Example:
+            hyper.rate_limit_stats()
+            # {'data': {'*': {'requests': 120, 'waits': 14, 'wait_seconds': 0.61, 'max_wait_seconds': 0.05}}}
+        """
+        stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for name in ("data", "cache", "search", "storage", "queue", "info"):
+            # the rate limits may sit under hedging or another wrapper
+            transport = getattr(self, f"_{name}")._connection.transport
+            while transport is not None:
+                if isinstance(transport, hyper_utils.RateLimitedTransport):
+                    stats[name] = transport.stats()
+                    break
+                transport = getattr(transport, "transport", None)
+        return stats
@@ -1,9 +1,159 @@
 __version__ = "0.0.1"
 
-from ._create_hyper_request_params import create_hyper_request_params
-from ._generate_token import decode_token, generate_token
-from ._get_host import get_host
-from ._get_key import get_key
-from ._get_secret import get_secret
-from ._handle_response import handle_response, handle_response_sync
-from ._to_data_query import to_data_query
+from typing import TYPE_CHECKING
+
+from hyper_connect._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ._adaptive import (
+        ADAPTIVE_INITIAL_LIMIT,
+        ADAPTIVE_MAX_LIMIT,
+        OVERLOAD_STATUSES,
+        AdaptiveConcurrencyTransport,
+    )
+    from ._checkpoint import save_checkpoint
+    from ._columns import COLUMNS_CHUNK_SIZE, iter_columns, to_columns
+    from ._compress_body import COMPRESSION_THRESHOLD, compress_body
+    from ._concurrent import (
+        RETRY_STATUSES,
+        call_with_retries,
+        is_retryable_status,
+        iter_concurrently,
+        iterate_in_executor,
+        map_concurrently,
+        map_concurrently_async,
+    )
+    from ._conditional import (
+        CONDITIONAL_MAX_BODY,
+        conditional_headers,
+        response_validators,
+    )
+    from ._create_hyper_request_params import create_hyper_request_params
+    from ._deadline import (
+        DEFAULT_TIMEOUT,
+        DeadlineExceeded,
+        Timeout,
+        check_deadline,
+        deadline,
+        default_timeout,
+        remaining_time,
+        request_timeout,
+        resolve_timeout,
+    )
+    from ._generate_token import decode_token, generate_token, get_token
+    from ._get_host import get_host
+    from ._get_key import get_key
+    from ._get_secret import get_secret
+    from ._handle_response import handle_response, handle_response_sync
+    from ._hedge import HEDGE_MAX_EXTRA, HEDGE_PERCENTILE, HedgedTransport
+    from ._iter_json_array import iter_json_array
+    from ._local_cache import LocalCache
+    from ._pages import ListPagesError, list_pages
+    from ._rate_limit import (
+        ANY_METHOD,
+        RATE_LIMIT_BURST,
+        RateLimitedTransport,
+        TokenBucket,
+    )
+    from ._selector import collation_key, compile_selector, filter_docs
+    from ._to_data_query import to_data_query
+    from ._transport import (
+        HTTP2_MAX_CONNECTIONS,
+        POOL_MAXSIZE,
+        HTTP2Transport,
+        Transport,
+        default_transport,
+        get_transport,
+    )
+    from ._ttl import TTL_UNITS, format_ttl, parse_ttl
+    from ._typechecked import TYPECHECK_ENV, typecheck_enabled, typechecked
+    from ._verify_signature import (
+        NONCE_CACHE_SIZE,
+        SIGNATURE_HEADER,
+        SIGNATURE_TOLERANCE_SECONDS,
+        SignatureVerifier,
+        parse_signature,
+        verify_signature,
+    )
+
+# ramda, PyJWT, and promisio are imported the first time a util that
+# needs them is looked up.
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "._adaptive": [
+            "ADAPTIVE_INITIAL_LIMIT",
+            "ADAPTIVE_MAX_LIMIT",
+            "OVERLOAD_STATUSES",
+            "AdaptiveConcurrencyTransport",
+        ],
+        "._checkpoint": ["save_checkpoint"],
+        "._columns": ["COLUMNS_CHUNK_SIZE", "iter_columns", "to_columns"],
+        "._compress_body": ["COMPRESSION_THRESHOLD", "compress_body"],
+        "._conditional": [
+            "CONDITIONAL_MAX_BODY",
+            "conditional_headers",
+            "response_validators",
+        ],
+        "._concurrent": [
+            "RETRY_STATUSES",
+            "call_with_retries",
+            "is_retryable_status",
+            "iter_concurrently",
+            "iterate_in_executor",
+            "map_concurrently",
+            "map_concurrently_async",
+        ],
+        "._create_hyper_request_params": ["create_hyper_request_params"],
+        "._deadline": [
+            "DEFAULT_TIMEOUT",
+            "DeadlineExceeded",
+            "Timeout",
+            "check_deadline",
+            "deadline",
+            "default_timeout",
+            "remaining_time",
+            "request_timeout",
+            "resolve_timeout",
+        ],
+        "._generate_token": ["decode_token", "generate_token", "get_token"],
+        "._get_host": ["get_host"],
+        "._get_key": ["get_key"],
+        "._get_secret": ["get_secret"],
+        "._handle_response": ["handle_response", "handle_response_sync"],
+        "._hedge": ["HEDGE_MAX_EXTRA", "HEDGE_PERCENTILE", "HedgedTransport"],
+        "._iter_json_array": ["iter_json_array"],
+        "._local_cache": ["LocalCache"],
+        "._pages": ["ListPagesError", "list_pages"],
+        "._rate_limit": [
+            "ANY_METHOD",
+            "RATE_LIMIT_BURST",
+            "RateLimitedTransport",
+            "TokenBucket",
+        ],
+        "._selector": ["collation_key", "compile_selector", "filter_docs"],
+        "._to_data_query": ["to_data_query"],
+        "._transport": [
+            "HTTP2_MAX_CONNECTIONS",
+            "POOL_MAXSIZE",
+            "HTTP2Transport",
+            "Transport",
+            "default_transport",
+            "get_transport",
+        ],
+        "._ttl": ["TTL_UNITS", "format_ttl", "parse_ttl"],
+        "._typechecked": [
+            "TYPECHECK_ENV",
+            "typecheck_enabled",
+            "typechecked",
+        ],
+        "._verify_signature": [
+            "NONCE_CACHE_SIZE",
+            "SIGNATURE_HEADER",
+            "SIGNATURE_TOLERANCE_SECONDS",
+            "SignatureVerifier",
+            "parse_signature",
+            "verify_signature",
+        ],
+    },
+)
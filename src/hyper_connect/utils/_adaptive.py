@@ -0,0 +1,176 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ._deadline import DeadlineExceeded, Timeout, remaining_time
+from ._transport import Transport, get_transport
+
+if TYPE_CHECKING:
+    import requests
+
+# Statuses hyper answers with when it is overloaded
+OVERLOAD_STATUSES = (429, 503)
+
+# Requests in flight allowed per service before any latency is known
+ADAPTIVE_INITIAL_LIMIT: int = 8
+
+# Most requests in flight allowed per service
+ADAPTIVE_MAX_LIMIT: int = 256
+
+# Weight of each new latency in the smoothed latency
+_SMOOTHING = 0.1
+
+# Share of the gap closed each time a latency is above the baseline, so the
+# baseline follows a lasting change in latency over ~1000 requests
+_BASELINE_DRIFT = 0.001
+
+
+class AdaptiveConcurrencyTransport(Transport):
+    """
+    Limits the requests in flight over another transport to a limit that
+    adapts to how hyper responds, rather than to a fixed concurrency.
+
+    The limit grows by one for every `limit` requests that complete while
+    it is in use and latency stays flat (additive increase).  It is cut
+    by `backoff` when hyper answers 429 or 503, a request times out, or
+    the smoothed latency grows past `tolerance` times the lowest latency
+    seen (multiplicative decrease), at most once per smoothed latency so
+    that the requests already in flight when hyper slowed count once.
+    Requests over the limit wait for one in flight to complete.
+
+    Example:
+
+        transport = AdaptiveConcurrencyTransport(max_limit=64)
+        hyper = connect(connection_string, transport=transport)
+        hyper.queue.enqueue_many(jobs, concurrency=64)
+        transport.stats()  # {'limit': 23.4, 'in_flight': 0, ...}
+
+    ...
+
+    Attributes
+    ----------
+    transport : Transport, optional
+        The transport requests are sent over.  None uses the process wide
+        default transport.
+    min_limit : int
+        The fewest requests in flight allowed.
+    max_limit : int
+        The most requests in flight allowed.
+    backoff : float
+        The share of the limit kept when it is cut.
+    tolerance : float
+        How many times the lowest latency seen the smoothed latency may
+        grow to before the limit is cut.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        initial_limit: int = ADAPTIVE_INITIAL_LIMIT,
+        min_limit: int = 1,
+        max_limit: int = ADAPTIVE_MAX_LIMIT,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit "
+                "<= max_limit"
+            )
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.transport = transport
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._baseline: Optional[float] = None
+        self._smoothed: Optional[float] = None
+        self._last_cut = 0.0
+        self._cuts = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Any = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> "requests.Response":
+        import requests
+
+        self._acquire()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            response = get_transport(self.transport).request(
+                method, url, headers, data, stream=stream, timeout=timeout
+            )
+            overloaded = response.status_code in OVERLOAD_STATUSES
+            return response
+        except (requests.Timeout, requests.ConnectionError):
+            overloaded = True
+            raise
+        finally:
+            self._release(time.monotonic() - started, overloaded)
+
+    def _acquire(self):
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                remaining = remaining_time()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(
+                        "the deadline for hyper calls has passed"
+                    )
+                self._condition.wait(remaining)
+            self._in_flight += 1
+
+    def _release(self, latency: float, overloaded: bool):
+        with self._condition:
+            busy = self._in_flight >= self._limit / 2
+            self._in_flight -= 1
+
+            if self._baseline is None or latency < self._baseline:
+                self._baseline = latency
+            else:
+                self._baseline += (latency - self._baseline) * _BASELINE_DRIFT
+            if self._smoothed is None:
+                self._smoothed = latency
+            else:
+                self._smoothed += (latency - self._smoothed) * _SMOOTHING
+
+            if overloaded or self._smoothed > self._baseline * self.tolerance:
+                self._cut()
+            elif busy:
+                self._limit = min(
+                    self._limit + 1 / self._limit, float(self.max_limit)
+                )
+            self._condition.notify_all()
+
+    def _cut(self):
+        now = time.monotonic()
+        if now - self._last_cut < (self._smoothed or 0):
+            return
+        self._last_cut = now
+        self._cuts += 1
+        self._limit = max(self._limit * self.backoff, float(self.min_limit))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the current limit, the requests in flight, how many times
+        the limit was cut, and the lowest and smoothed latencies, in
+        seconds.
+        """
+        with self._condition:
+            return {
+                "limit": self._limit,
+                "in_flight": self._in_flight,
+                "cuts": self._cuts,
+                "baseline_latency": self._baseline,
+                "smoothed_latency": self._smoothed,
+            }
@@ -0,0 +1,18 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """
+    Writes `checkpoint` to `path` as JSON, replacing what was there.
+
+    It is written to a temporary file next to `path` first, so a crash
+    never leaves a half written checkpoint.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+    os.replace(temporary, path)
@@ -0,0 +1,269 @@
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+)
+
+from ._selector import _MISSING, _get, _parse_field
+
+if TYPE_CHECKING:
+    import numpy
+
+# Documents decoded into arrays at a time by to_columns
+COLUMNS_CHUNK_SIZE: int = 1000
+
+# The range of the int64 columns integers are inferred into
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+# dtype kinds that must hold values exactly: bools, integers, and
+# unicode strings.  Floats may round, and datetimes parse strings.
+_EXACT_KINDS = "biuU"
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "columns require numpy, install it with: "
+            'pip install "hyper-connect[numpy]"'
+        ) from error
+    return numpy
+
+
+# Stands for integers too large for int64 in a set of value kinds
+_BIG_INT = "big int"
+
+
+def _kinds(values: List[Any]) -> Set[Any]:
+    kinds: Set[Any] = set()
+    for value in values:
+        if value is None:
+            continue
+        kind = type(value)
+        if kind is int and not _INT64_MIN <= value <= _INT64_MAX:
+            kinds.add(_BIG_INT)
+        else:
+            kinds.add(kind)
+    return kinds
+
+
+def _infer_dtype(kinds: Set[Any]) -> Any:
+    # JSON has one number type: ints become int64 unless a float is
+    # present, or one is too large for int64, and anything else, eg
+    # strings, is kept as objects
+    if not kinds:
+        return object
+    if kinds == {bool}:
+        return bool
+    if kinds == {int}:
+        return "int64"
+    if float in kinds and kinds <= {int, _BIG_INT, float}:
+        return "float64"
+    # including ints too large for int64, kept exact rather than rounded
+    return object
+
+
+def _cast(
+    numpy: Any, column: "numpy.ma.MaskedArray", dtype: Any
+) -> "numpy.ma.MaskedArray":
+    if column.dtype == numpy.dtype(dtype):
+        return column
+    if not column.count():
+        return numpy.ma.masked_all(len(column), dtype)
+    # masked objects are None, which only objects can hold
+    data = (
+        column.filled(_fill_value(numpy, dtype))
+        if column.dtype.kind == "O"
+        else column.data
+    )
+    return numpy.ma.MaskedArray(
+        data.astype(dtype), mask=numpy.ma.getmaskarray(column)
+    )
+
+
+def _fill_value(numpy: Any, dtype: Any) -> Any:
+    kind = numpy.dtype(dtype).kind
+    if kind == "O":
+        return None
+    if kind == "U":
+        return ""
+    if kind == "S":
+        return b""
+    if kind == "M" or kind == "m":
+        return "NaT"
+    return 0
+
+
+def _decode(
+    numpy: Any,
+    docs: List[Dict],
+    fields: List[str],
+    dtypes: Dict[str, Any],
+    kinds: Optional[Dict[str, Set[Any]]] = None,
+) -> Dict[str, "numpy.ma.MaskedArray"]:
+    # adds the kinds of the values of each field to `kinds`
+    columns = {}
+    for field in fields:
+        parts = _parse_field(field)
+        if len(parts) == 1:
+            [name] = parts
+            values = [
+                doc.get(name) if type(doc) is dict else _get(doc, parts)
+                for doc in docs
+            ]
+        else:
+            values = [_get(doc, parts) for doc in docs]
+        values = [None if value is _MISSING else value for value in values]
+
+        value_kinds = _kinds(values)
+        if kinds is not None:
+            kinds.setdefault(field, set()).update(value_kinds)
+        dtype = dtypes.get(field) or _infer_dtype(value_kinds)
+        mask = numpy.fromiter(
+            (value is None for value in values), dtype=bool, count=len(values)
+        )
+        columns[field] = numpy.ma.MaskedArray(
+            _array(numpy, field, values, dtype, mask), mask=mask
+        )
+    return columns
+
+
+def _array(
+    numpy: Any, field: str, values: List[Any], dtype: Any, mask: Any
+) -> "numpy.ndarray":
+    kind = numpy.dtype(dtype).kind
+    if kind == "O":
+        # assigned one by one, so lists of equal length stay values
+        # rather than becoming a second dimension
+        array = numpy.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+        return array
+
+    if mask.any():
+        fill = _fill_value(numpy, dtype)
+        values = [fill if value is None else value for value in values]
+    try:
+        array = numpy.array(values, dtype=dtype)
+    except (OverflowError, TypeError) as error:
+        raise ValueError(f"{field} does not fit {dtype}: {error}") from error
+    if array.ndim != 1:
+        raise ValueError(f"{field} holds lists, which do not fit {dtype}")
+
+    if kind in _EXACT_KINDS:
+        # numpy truncates strings and floats to fit, eg "Ghostbusters" to
+        # "Ghos" in U4 and 1.7 to 1 in int32, and wraps some integers
+        for value, decoded, missing in zip(values, array.tolist(), mask):
+            if kind == "U":
+                value = str(value)
+            if not missing and decoded != value:
+                raise ValueError(
+                    f"{field} value {value!r} does not fit {dtype}"
+                )
+    return array
+
+
+def iter_columns(
+    pages: Iterable[List[Dict]],
+    fields: List[str],
+    dtypes: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, "numpy.ma.MaskedArray"]]:
+    """
+    Decodes pages of documents, eg from hyper.data.iter_query, into numpy
+    columns, one page at a time.
+
+    Yields, for every page, a Dict of `fields` to masked arrays holding
+    that page's values, so aggregations can run page by page over more
+    documents than fit in memory.  See to_columns for fields and dtypes.
+
+    Example:
+
+        total = 0.0
+        for columns in iter_columns(pages, ["price"], {"price": "float64"}):
+            total += columns["price"].sum()
+
+    Requires numpy, install it with: pip install "hyper-connect[numpy]"
+    """
+    numpy = _numpy()
+    for page in pages:
+        yield _decode(numpy, list(page), fields, dtypes or {})
+
+
+def to_columns(
+    docs: Iterable[Dict],
+    fields: List[str],
+    dtypes: Optional[Dict[str, Any]] = None,
+    chunk_size: int = COLUMNS_CHUNK_SIZE,
+) -> Dict[str, "numpy.ma.MaskedArray"]:
+    """
+    Decodes documents into one numpy masked array per field.
+
+    Documents are read `chunk_size` at a time and decoded into compact
+    arrays as they are read, so a stream of documents, eg from
+    hyper.data.iter_query, never has to be held as a list of Dicts.
+    Fields may be dotted, eg "director.name".  Missing and null values are
+    masked.
+
+    Example:
+
+        columns = to_columns(
+            result["docs"], ["year", "rating"], {"year": "int32"}
+        )
+        columns["rating"].mean()  # ignores docs without a rating
+
+    Parameters
+    ----------
+    docs : Iterable[Dict]
+        The documents, eg the docs of a hyper.data.query or list result.
+    fields : List[str]
+        The fields to decode, one column each.
+    dtypes : Dict[str, Any], optional
+        numpy dtypes by field.  Fields without one are inferred from their
+        values: int64 for integers, float64 for numbers, bool for
+        booleans, and object for anything else, eg strings, lists, or
+        integers too large for int64.  Give strings a dtype, eg "U32", to
+        store them compactly.
+    chunk_size : int
+        The most documents decoded at a time.
+
+    Returns
+    -------
+    Dict of field to numpy.ma.MaskedArray, in document order.
+    Raises ValueError when a value does not fit its field's dtype, eg a
+    string longer than a "U4" or 1.7 in an "int32".
+    Requires numpy, install it with: pip install "hyper-connect[numpy]"
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    numpy = _numpy()
+    dtypes = dtypes or {}
+    docs = iter(docs)
+    chunks: Dict[str, List[Any]] = {field: [] for field in fields}
+    kinds: Dict[str, Set[Any]] = {}
+    while True:
+        chunk = list(islice(docs, chunk_size))
+        if not chunk:
+            break
+        decoded = _decode(numpy, chunk, fields, dtypes, kinds)
+        for field, column in decoded.items():
+            chunks[field].append(column)
+
+    columns = {}
+    for field in fields:
+        # inferred from the values of every chunk, so the dtype does not
+        # depend on chunk_size, eg a bool in one chunk and an int in
+        # another make objects, as they would in one chunk
+        dtype = dtypes.get(field) or _infer_dtype(kinds.get(field, set()))
+        columns[field] = numpy.ma.concatenate(
+            [_cast(numpy, chunk, dtype) for chunk in chunks[field]]
+            or [numpy.ma.masked_all(0, dtype)]
+        )
+    return columns
@@ -0,0 +1,59 @@
+import gzip
+import zlib
+from typing import Dict, Optional, Union
+
+from hyper_connect.types import Compression
+
+# Bodies smaller than this are sent as-is.  Compressing a few hundred bytes
+# of JSON costs more CPU than it saves on the wire.
+COMPRESSION_THRESHOLD: int = 1024
+
+COMPRESSION_LEVEL: int = 6
+
+
+def compress_body(
+    data: str,
+    headers: Dict[str, str],
+    compression: Optional[Compression],
+    threshold: int = COMPRESSION_THRESHOLD,
+) -> Union[str, bytes]:
+    """
+    Compresses a serialized JSON request body.
+
+    The body is only compressed when a compression is requested and the
+    encoded body is at least `threshold` bytes.  When the body is compressed
+    the matching `Content-Encoding` header is set on `headers`.
+
+    Parameters
+    ----------
+    data : str
+        The serialized JSON body.
+    headers : Dict[str, str]
+        The request headers.  Updated in place.
+    compression : Compression, optional
+        "gzip" or "deflate".  None leaves the body uncompressed.
+    threshold : int
+        Minimum body size, in bytes, before compression is applied.
+
+    Returns
+    -------
+    The body to send, either the original str or the compressed bytes.
+    """
+    if compression is None:
+        return data
+
+    raw: bytes = data.encode("utf-8")
+
+    if len(raw) < threshold:
+        return data
+
+    if compression == "gzip":
+        compressed = gzip.compress(raw, compresslevel=COMPRESSION_LEVEL)
+    elif compression == "deflate":
+        # HTTP "deflate" is the zlib format (RFC 1950), not raw deflate
+        compressed = zlib.compress(raw, COMPRESSION_LEVEL)
+    else:
+        raise ValueError(f"unsupported compression: {compression}")
+
+    headers["Content-Encoding"] = compression
+    return compressed
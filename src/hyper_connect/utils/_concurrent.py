@@ -0,0 +1,198 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from ._deadline import DeadlineExceeded, remaining_time
+
+T = TypeVar("T")
+
+# Statuses worth sending the same request again for, besides every other
+# 5xx, see is_retryable_status
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Seconds to wait before the first retry.  Doubled for every retry after.
+RETRY_DELAY_SECONDS: float = 0.1
+
+
+def _error_status(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable_status(status: Optional[int]) -> bool:
+    """
+    Whether a request that failed with `status` is worth sending again:
+    None, ie hyper could not be reached, any 5xx, or a status in
+    RETRY_STATUSES.
+    """
+    return status is None or status >= 500 or status in RETRY_STATUSES
+
+
+def call_with_retries(
+    fn: Callable[[], Any],
+    retries: int,
+    retry_delay: float = RETRY_DELAY_SECONDS,
+) -> Dict:
+    """
+    Calls `fn` until it returns a result that is not retryable or the
+    retries run out, and returns that result.
+
+    Connection errors, and errors and results with a 5xx status or one in
+    RETRY_STATUSES, are retried, see is_retryable_status.  Errors talking
+    to hyper, ie a
+    requests.RequestException, are returned, not raised, as a NotOkResult,
+    so one failure does not hide the outcome of the rest of a batch.  Any
+    other exception is a bug, not an outage, and is raised at once.  The
+    number of calls made is added to the result as "attempts".
+
+    Inside a deadline, no retry is made that could not start before it
+    passes; the last result is returned instead.
+    """
+    import requests
+
+    attempt = 0
+
+    while True:
+        attempt += 1
+        try:
+            result = fn()
+            # a result without a status was answered, not unreachable
+            status = result.get("status")
+            retryable = status is not None and is_retryable_status(status)
+        except DeadlineExceeded as error:
+            result = {"ok": False, "status": None, "msg": str(error)}
+            retryable = False
+        except requests.RequestException as error:
+            result = {
+                "ok": False,
+                "status": _error_status(error),
+                "msg": str(error),
+            }
+            retryable = is_retryable_status(result["status"])
+
+        delay = retry_delay * 2 ** (attempt - 1)
+        remaining = remaining_time()
+        if (
+            not retryable
+            or attempt > retries
+            or (remaining is not None and remaining <= delay)
+        ):
+            result["attempts"] = attempt
+            return result
+
+        time.sleep(delay)
+
+
+def _in_context(fn: Callable[[T], Any]) -> Callable[[T], Any]:
+    """
+    Returns `fn` run in a copy of the caller's context, so deadlines and
+    timeouts set around a batch apply on the threads it runs on.
+    """
+    context = contextvars.copy_context()
+    return lambda item: context.copy().run(fn, item)
+
+
+def map_concurrently(
+    fn: Callable[[T], Any], items: Iterable[T], concurrency: int
+) -> List[Any]:
+    """
+    Calls `fn` for every item on at most `concurrency` threads and returns
+    the results in the order of `items`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(_in_context(fn), items))
+
+
+def iter_concurrently(
+    fn: Callable[[T], Any], items: Iterable[T], concurrency: int
+) -> Iterator[Tuple[T, Any]]:
+    """
+    Calls `fn` for every item on at most `concurrency` threads and yields
+    (item, result) pairs as the calls finish.
+
+    Unlike map_concurrently, items are read only as threads free up, so a
+    lazy iterable, eg of batches read from a file, is never read further
+    ahead than the calls in flight.  An error raised by `fn` is raised
+    here once the calls in flight finish.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    fn = _in_context(fn)
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: Dict["Future[Any]", T] = {
+            executor.submit(fn, item): item
+            for item in islice(items, concurrency)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            finished = [(pending.pop(future), future) for future in done]
+            # refill before yielding, so slow consumers do not idle threads
+            for item in islice(items, concurrency - len(pending)):
+                pending[executor.submit(fn, item)] = item
+            for item, future in finished:
+                yield item, future.result()
+
+
+async def map_concurrently_async(
+    fn: Callable[[T], Any], items: Iterable[T], concurrency: int
+) -> List[Any]:
+    """
+    Calls `fn` for every item on at most `concurrency` threads without
+    blocking the event loop, and returns the results in the order of
+    `items`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    fn = _in_context(fn)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(
+            await asyncio.gather(
+                *[loop.run_in_executor(executor, fn, item) for item in items]
+            )
+        )
+
+
+async def iterate_in_executor(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Yields the items of a blocking iterator, advancing it on a thread so
+    the event loop keeps running.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    done = object()
+
+    def advance() -> Any:
+        return context.run(next, iterator, done)
+
+    while True:
+        item: Any = await loop.run_in_executor(None, advance)
+        if item is done:
+            return
+        yield item
@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+# Largest downloaded body, in bytes, kept to answer conditional downloads
+CONDITIONAL_MAX_BODY: int = 1024 * 1024
+
+
+def conditional_headers(
+    headers: Dict[str, str],
+    etag: Optional[str],
+    last_modified: Optional[str],
+) -> Dict[str, str]:
+    """
+    Returns request headers that ask hyper to answer 304 Not Modified when
+    the resource still has the given ETag or Last-Modified validators.
+    """
+    headers = dict(headers)
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    if last_modified is not None:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def response_validators(
+    response: "requests.Response",
+) -> Tuple[Optional[str], Optional[str]]:
+    """Returns a response's ETag and Last-Modified headers."""
+    return response.headers.get("ETag"), response.headers.get("Last-Modified")
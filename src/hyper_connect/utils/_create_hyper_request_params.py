@@ -2,7 +2,6 @@ from typing import Dict, Optional
 from urllib.parse import urlencode, urlparse
 
 from ramda import join, pick_by
-from typeguard import typechecked
 
 from hyper_connect.types import (
     Action,
@@ -11,10 +10,11 @@ from hyper_connect.types import (
     RequestOptions,
 )
 
-from ._generate_token import generate_token
+from ._generate_token import get_token
 from ._get_host import get_host
 from ._get_key import get_key
 from ._get_secret import get_secret
+from ._typechecked import typechecked
 
 
 @typechecked
@@ -43,14 +43,19 @@ def create_hyper_request_params(
         is_cloud = False
         protocol = f"{parsed_url.scheme}:"
 
-    headers: Dict[str, str] = {"Content-Type": "application/json"}
+    # Ask for compressed responses.  requests decodes gzip and deflate
+    # incrementally as the body is read, including streamed downloads.
+    headers: Dict[str, str] = {
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+    }
 
     public_key = get_key(parsed_url.netloc)
     secret = get_secret(parsed_url.netloc)
 
     if public_key is not None and secret is not None:
 
-        token = generate_token(public_key, secret)
+        token = get_token(public_key, secret)
         headers["Authorization"] = f"Bearer {token}"
 
     host = get_host(parsed_url.netloc)
@@ -0,0 +1,123 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+
+# Seconds, for both connecting and reading, or (connect, read)
+Timeout = Union[float, Tuple[float, float]]
+
+# Seconds to wait for a connection to hyper and then between bytes of its
+# response.  See https://requests.readthedocs.io/en/latest/user/advanced/#timeouts
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30.0)
+
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    "hyper_deadline", default=None
+)
+_default_timeout: ContextVar[Optional[Timeout]] = ContextVar(
+    "hyper_default_timeout", default=None
+)
+_request_timeout: ContextVar[Optional[Timeout]] = ContextVar(
+    "hyper_request_timeout", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of sending a request once the deadline has passed."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Gives every hyper call made inside the block, including retries, pages,
+    and calls made on other threads by hyper_connect's batch helpers, a
+    shared budget of `seconds`.  Each request's timeouts are cut to the
+    time left, and requests are not sent once it runs out; DeadlineExceeded
+    is raised instead.  A nested deadline cannot outlast the one around it.
+
+    Example:
+
+        with deadline(2):
+            movie = hyper.data.get("movie-1")
+            hyper.cache.set("movie-1", movie, "1h")
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        expires = min(expires, outer)
+
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def request_timeout(timeout: Timeout) -> Iterator[None]:
+    """
+    Overrides the timeouts of the hyper calls made inside the block.
+
+    Example:
+
+        with request_timeout((1, 60)):
+            hyper.storage.download("video.mp4")
+    """
+    token = _request_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _request_timeout.reset(token)
+
+
+@contextmanager
+def default_timeout(timeout: Optional[Timeout]) -> Iterator[None]:
+    """
+    Sets the timeouts of the hyper calls made inside the block, unless
+    request_timeout overrides them.  Used by a service's connection.
+    """
+    token = _default_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _default_timeout.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Returns the seconds left before the deadline, or None without one."""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def check_deadline():
+    """Raises DeadlineExceeded if the deadline has passed."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded("the deadline for hyper calls has passed")
+
+
+def resolve_timeout(
+    timeout: Optional[Timeout] = None,
+) -> Tuple[float, float]:
+    """
+    Returns the (connect, read) timeouts for a request: request_timeout's,
+    else `timeout`, else default_timeout's, else DEFAULT_TIMEOUT, each cut
+    to the time left before the deadline.
+    """
+    chosen = (
+        _request_timeout.get()
+        or timeout
+        or _default_timeout.get()
+        or DEFAULT_TIMEOUT
+    )
+    if isinstance(chosen, tuple):
+        connect, read = chosen
+    else:
+        connect = read = chosen
+
+    check_deadline()
+    remaining = remaining_time()
+    if remaining is not None:
+        connect, read = min(connect, remaining), min(read, remaining)
+    return connect, read
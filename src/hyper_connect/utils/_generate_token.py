@@ -1,8 +1,20 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import jwt
-from typeguard import typechecked
+
+from ._typechecked import typechecked
+
+TOKEN_TTL_SECONDS: int = 600
+
+# A cached token is replaced once less than this much of its life is left
+TOKEN_REFRESH_MARGIN_SECONDS: int = 60
+
+# Number of tenants (key, secret pairs) whose tokens are cached
+TOKEN_CACHE_SIZE: int = 1024
 
 
 @typechecked
@@ -11,7 +23,8 @@ def generate_token(public_key: str, secret: str) -> str:
     encoded_jwt = jwt.encode(
         {
             "sub": public_key,
-            "exp": datetime.now(tz=timezone.utc) + timedelta(seconds=600),
+            "exp": datetime.now(tz=timezone.utc)
+            + timedelta(seconds=TOKEN_TTL_SECONDS),
         },
         secret,
         algorithm="HS256",
@@ -22,3 +35,37 @@ def generate_token(public_key: str, secret: str) -> str:
 
 def decode_token(token: str, secret: str) -> Dict[str, Any]:
     return jwt.decode(token, secret, algorithms=["HS256"])
+
+
+_tokens: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+_tokens_lock = threading.Lock()
+
+
+def get_token(public_key: str, secret: str) -> str:
+    """
+    Returns a token for the app key, reusing a cached one until it is
+    close to expiring.
+
+    Tokens are cached per key and secret, so each tenant has its own
+    tokens.  The least recently used tenants are dropped once more than
+    TOKEN_CACHE_SIZE are cached.
+    """
+    cache_key = (public_key, secret)
+    now = time.monotonic()
+
+    with _tokens_lock:
+        cached = _tokens.get(cache_key)
+        if cached is not None and cached[1] > now:
+            _tokens.move_to_end(cache_key)
+            return cached[0]
+
+    token = generate_token(public_key, secret)
+    refresh_at = now + TOKEN_TTL_SECONDS - TOKEN_REFRESH_MARGIN_SECONDS
+
+    with _tokens_lock:
+        _tokens[cache_key] = (token, refresh_at)
+        _tokens.move_to_end(cache_key)
+        while len(_tokens) > TOKEN_CACHE_SIZE:
+            _tokens.popitem(last=False)
+
+    return token
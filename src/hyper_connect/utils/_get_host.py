@@ -1,7 +1,8 @@
 from typing import Union
 
 from ramda import compose, is_empty, last, split
-from typeguard import typechecked
+
+from ._typechecked import typechecked
 
 # network_location example 1: "hyper app key:hyper app secret@cloud.hyper.io"
 # network_location example 2: "api.github.com"
@@ -1,7 +1,8 @@
 from typing import Union
 
 from ramda import compose, head, is_empty, last, split
-from typeguard import typechecked
+
+from ._typechecked import typechecked
 
 
 @typechecked
@@ -0,0 +1,222 @@
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+from ._deadline import Timeout, remaining_time
+from ._transport import Transport, get_transport
+
+if TYPE_CHECKING:
+    import requests
+
+# Percentile of recent first attempt latencies after which a GET is hedged
+HEDGE_PERCENTILE: float = 95.0
+
+# Most hedged requests, as a share of all the GETs sent
+HEDGE_MAX_EXTRA: float = 0.05
+
+# Latencies kept to compute the hedge delay from
+_WINDOW = 1000
+
+# Latencies needed before any request is hedged
+_MIN_SAMPLES = 20
+
+# New latencies recorded before the hedge delay is computed again
+_RECOMPUTE_EVERY = 32
+
+# Hedges that may be sent in a burst, before the budget earned by earlier
+# requests runs out
+_MAX_BUDGET = 10.0
+
+
+class HedgedTransport(Transport):
+    """
+    Hedges GET requests sent over another transport: when hyper has not
+    answered a GET by the `percentile` of recent GET latencies, the same
+    request is sent again and the first response to arrive is returned.
+    The other is cancelled if it has not been sent yet, or closed when it
+    arrives.  Other requests, and streamed GETs, are sent once.
+
+    Hedging cuts the latency of the occasional slow response at the cost
+    of extra requests, which `max_extra` caps: every GET earns `max_extra`
+    of a hedge, and a GET is only hedged when a whole one has been earned.
+
+    Example:
+
+        transport = HedgedTransport(percentile=95, max_extra=0.05)
+        hyper = connect(connection_string, transport=transport)
+        transport.stats()  # {'requests': ..., 'hedged': ..., ...}
+
+    ...
+
+    Attributes
+    ----------
+    transport : Transport, optional
+        The transport requests are sent over.  None uses the process wide
+        default transport.
+    percentile : float
+        The percentile of recent latencies, 0 to 100, waited for before a
+        GET is hedged.
+    max_extra : float
+        The most hedged GETs, as a share of all GETs.
+    min_delay : float
+        The least seconds waited before a GET is hedged.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        percentile: float = HEDGE_PERCENTILE,
+        max_extra: float = HEDGE_MAX_EXTRA,
+        min_delay: float = 0.0,
+        max_workers: int = 64,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if max_extra < 0:
+            raise ValueError("max_extra must not be negative")
+
+        # imported here so that connect() stays cheap
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.transport = transport
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_delay = min_delay
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hyper-hedge"
+        )
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=_WINDOW)
+        self._new_latencies = 0
+        self._delay: Optional[float] = None
+        self._budget = 0.0
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Any = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> "requests.Response":
+        transport = get_transport(self.transport)
+        if method != "GET" or stream:
+            return transport.request(
+                method, url, headers, data, stream=stream, timeout=timeout
+            )
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        # attempts run on the executor's threads with the caller's timeouts
+        # and deadline
+        context = contextvars.copy_context()
+
+        def send() -> "requests.Response":
+            return context.copy().run(
+                transport.request, method, url, headers, timeout=timeout
+            )
+
+        delay = self._start()
+        started = time.monotonic()
+        first = self._executor.submit(send)
+        first.add_done_callback(
+            lambda future: self._record(time.monotonic() - started)
+        )
+
+        remaining = remaining_time()
+        if delay is None or (remaining is not None and remaining <= delay):
+            return first.result()
+
+        wait([first], timeout=delay)
+        if first.done() or not self._take_hedge():
+            return first.result()
+
+        second = self._executor.submit(send)
+        attempts = [first, second]
+        done, _ = wait(attempts, return_when=FIRST_COMPLETED)
+        if not any(attempt.exception() is None for attempt in done):
+            # the first to answer failed, give the other its chance
+            wait(attempts)
+
+        winner = next(
+            (attempt for attempt in attempts if _succeeded(attempt)), first
+        )
+        for attempt in attempts:
+            if attempt is not winner and not attempt.cancel():
+                attempt.add_done_callback(_close_response)
+        if winner is second:
+            with self._lock:
+                self._hedge_wins += 1
+        return winner.result()
+
+    def _start(self) -> Optional[float]:
+        """
+        Counts a GET, earns its share of a hedge, and returns the delay
+        before hedging it, or None while too few latencies are known.
+        """
+        with self._lock:
+            self._requests += 1
+            self._budget = min(self._budget + self.max_extra, _MAX_BUDGET)
+            if len(self._latencies) >= _MIN_SAMPLES and (
+                self._delay is None or self._new_latencies >= _RECOMPUTE_EVERY
+            ):
+                self._new_latencies = 0
+                self._delay = max(
+                    _percentile(sorted(self._latencies), self.percentile),
+                    self.min_delay,
+                )
+            return self._delay
+
+    def _record(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+            self._new_latencies += 1
+
+    def _take_hedge(self) -> bool:
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            self._hedged += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the GETs sent, how many were hedged and how many of those
+        the hedge answered first, and the current hedge delay in seconds.
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "hedge_ratio": (
+                    self._hedged / self._requests if self._requests else 0.0
+                ),
+                "delay": self._delay,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Returns the `percentile` of sorted `values`, nearest rank."""
+    rank = math.ceil(percentile / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+def _succeeded(future: Any) -> bool:
+    return future.done() and future.exception() is None
+
+
+def _close_response(future: Any):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
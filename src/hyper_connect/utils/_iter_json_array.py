@@ -0,0 +1,109 @@
+import json
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+
+
+class _Buffer:
+    """Text read from a stream of chunks, decoded value by value."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+
+    def _read(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                # drop what has been decoded so memory stays bounded
+                self.text = self.text[self.pos :] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def next_char(self) -> str:
+        """Skips whitespace and returns the next character, unconsumed."""
+        while True:
+            while (
+                self.pos < len(self.text)
+                and self.text[self.pos] in _WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._read():
+                raise ValueError("unexpected end of JSON")
+
+    def expect(self, char: str):
+        if self.next_char() != char:
+            raise ValueError(
+                f"expected {char!r} at {self.text[self.pos:][:20]!r}"
+            )
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next JSON value, reading more chunks as needed."""
+        self.next_char()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # a number or literal cut off at the end of a chunk decodes as
+            # a shorter value, so wait for the delimiter that follows it
+            if not isinstance(value, (dict, list, str)) and (
+                end == len(self.text) or self.text[end] not in _DELIMITERS
+            ):
+                if self._read():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[str], key: str) -> Iterator[Any]:
+    """
+    Yields the items of the array at `key` in a JSON object read from
+    `chunks`, decoding one item at a time.
+
+    Only the item being decoded and the rest of the current chunk are held
+    in memory, however long the array is.  Other top level values are
+    decoded and discarded.
+
+    Example:
+
+        response = transport.request("GET", url, stream=True)
+        for doc in iter_json_array(
+            response.iter_content(65536, decode_unicode=True), "docs"
+        ):
+            ...
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.next_char() == "}":
+        return
+
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+
+        if name == key and buffer.next_char() == "[":
+            buffer.expect("[")
+            if buffer.next_char() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.value()
+                    if buffer.next_char() == "]":
+                        buffer.pos += 1
+                        break
+                    buffer.expect(",")
+        else:
+            buffer.value()
+
+        if buffer.next_char() == "}":
+            return
+        buffer.expect(",")
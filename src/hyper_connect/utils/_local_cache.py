@@ -0,0 +1,127 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class LocalCache:
+    """
+    A thread-safe, in-process cache with a size bound and per-entry ttls.
+
+    Entries are kept in least recently used order and dropped, oldest
+    first, once more than `maxsize` are cached.  Each entry expires after
+    its ttl, capped at `max_ttl` seconds.  Expiries are kept in a heap so
+    expired entries are removed as soon as they are noticed rather than
+    holding LRU slots until they are evicted.
+
+    Example:
+
+        local = LocalCache(maxsize=10000, max_ttl=30)
+        local.set("movie-1", movie, ttl=5)
+        local.get("movie-1")  # movie, for up to 5 seconds
+
+    ...
+
+    Attributes
+    ----------
+    maxsize : int
+        The most entries kept.
+    max_ttl : float
+        The longest, in seconds, an entry is kept.
+    hits : int
+        Lookups answered from the cache.
+    misses : int
+        Lookups for missing or expired entries.
+    """
+
+    def __init__(self, maxsize: int, max_ttl: float):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, expires)
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        expiries = self._expiries
+        while expiries and expiries[0][0] <= now:
+            expires, key = heapq.heappop(expiries)
+            entry = self._entries.get(key)
+            # the key may have been set again with a later expiry
+            if entry is not None and entry[1] == expires:
+                del self._entries[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value, or `default` when there is none."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Caches a value for `ttl` seconds, or max_ttl when `ttl` is None or
+        longer.
+        """
+        if ttl is None or ttl > self.max_ttl:
+            ttl = self.max_ttl
+        if ttl <= 0:
+            self.delete(key)
+            return
+
+        now = time.monotonic()
+        expires = now + ttl
+        with self._lock:
+            self._expire(now)
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            heapq.heappush(self._expiries, (expires, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            # evicted and overwritten keys leave stale heap items behind
+            if len(self._expiries) > 2 * self.maxsize:
+                self._expiries = [
+                    (expires, key)
+                    for key, (_, expires) in self._entries.items()
+                ]
+                heapq.heapify(self._expiries)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expiries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._expire(time.monotonic())
+            return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit and miss counts and the hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,50 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from hyper_connect.types import HyperData
+
+
+class ListPagesError(Exception):
+    """
+    Raised by list_pages when hyper fails to list a page.
+
+    ...
+
+    Attributes
+    ----------
+    result : Dict
+        The NotOkResult of the failed hyper.data.list.
+    """
+
+    def __init__(self, result: Dict):
+        super().__init__(result.get("msg"))
+        self.result = result
+
+
+def list_pages(
+    data: "HyperData", page_size: int, startkey: Optional[str] = None
+) -> Iterator[List[Dict]]:
+    """
+    Yields every document of a data service, from `startkey` on, in pages
+    of up to `page_size` documents in _id order, read with
+    hyper.data.list one page at a time.
+
+    Example:
+
+        for page in list_pages(hyper.data, 500):
+            print(len(page))
+
+    Raises ListPagesError when hyper fails to list a page.
+    """
+    # asks for one more document than a page, whose id starts the next
+    while True:
+        result: Any = data.list({"startkey": startkey, "limit": page_size + 1})
+        if not result.get("ok", False):
+            raise ListPagesError(result)
+
+        docs = result.get("docs") or []
+        if len(docs) <= page_size:
+            yield docs
+            return
+        startkey = docs[page_size]["_id"]
+        yield docs[:page_size]
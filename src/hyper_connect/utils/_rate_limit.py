@@ -0,0 +1,226 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from hyper_connect.types import RateLimit
+
+from ._deadline import DeadlineExceeded, Timeout, remaining_time
+from ._transport import Transport, get_transport
+
+if TYPE_CHECKING:
+    import requests
+
+# Seconds of traffic a rate limit lets through at once after a quiet spell
+RATE_LIMIT_BURST: float = 1.0
+
+# The rate limit key applied to every method
+ANY_METHOD = "*"
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket holding up to `capacity` tokens, refilled
+    at `rate` tokens per second.  Starts full.
+
+    Tokens are reserved rather than taken: a reservation larger than the
+    tokens left is granted on credit, and returns how long the caller must
+    wait for the bucket to earn it back.  Callers are served in the order
+    they reserve, and one larger than `capacity` still gets through.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float) -> float:
+        """Reserves tokens and returns the seconds to wait before use."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate,
+                self.capacity,
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return max(-self._tokens / self.rate, 0.0)
+
+    def refund(self, tokens: float):
+        """Gives back reserved tokens that were not used."""
+        with self._lock:
+            self._tokens = min(self._tokens + tokens, self.capacity)
+
+
+class _Limit:
+    """A RateLimit's buckets and the waits they caused."""
+
+    def __init__(self, limit: RateLimit):
+        burst = limit.get("burst", RATE_LIMIT_BURST)
+        self.requests: Optional[TokenBucket] = None
+        self.bytes: Optional[TokenBucket] = None
+        if "requests_per_second" in limit:
+            rate = limit["requests_per_second"]
+            self.requests = TokenBucket(rate, max(rate * burst, 1.0))
+        if "bytes_per_second" in limit:
+            rate = limit["bytes_per_second"]
+            self.bytes = TokenBucket(rate, rate * burst)
+
+        self.lock = threading.Lock()
+        self.count = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def reservations(self, size: int) -> List[Tuple[TokenBucket, float]]:
+        reservations: List[Tuple[TokenBucket, float]] = []
+        if self.requests is not None:
+            reservations.append((self.requests, 1.0))
+        if self.bytes is not None and size:
+            reservations.append((self.bytes, float(size)))
+        return reservations
+
+    def record(self, wait: float):
+        with self.lock:
+            self.count += 1
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "requests": self.count,
+                "waits": self.waits,
+                "wait_seconds": self.wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+
+class RateLimitedTransport(Transport):
+    """
+    Sends requests over another transport no faster than its rate limits,
+    making callers wait for their turn rather than letting bursts through
+    for hyper to throttle.
+
+    `limits` maps "*" and methods, eg "POST", to a RateLimit.  A request
+    waits until it is within the "*" limit and its method's limit.  Body
+    bytes are counted when the request is sent, and response bytes, taken
+    from Content-Length, once it is answered; large responses make the
+    requests after them wait.
+
+    Inside a deadline, a request that would have to wait past it raises
+    DeadlineExceeded at once instead.
+
+    Example:
+
+        transport = RateLimitedTransport(
+            limits={
+                "*": {"requests_per_second": 50},
+                "POST": {"bytes_per_second": 1_000_000},
+            }
+        )
+        hyper = connect(connection_string, transport=transport)
+        transport.stats()  # {'*': {'requests': ..., 'wait_seconds': ...}}
+
+    ...
+
+    Attributes
+    ----------
+    transport : Transport, optional
+        The transport requests are sent over.  None uses the process wide
+        default transport.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        limits: Optional[Dict[str, RateLimit]] = None,
+    ):
+        self.transport = transport
+        self._limits = {
+            method: _Limit(limit) for method, limit in (limits or {}).items()
+        }
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Any = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> "requests.Response":
+        limits = [
+            limit
+            for limit in (
+                self._limits.get(ANY_METHOD),
+                self._limits.get(method),
+            )
+            if limit is not None
+        ]
+        self._wait(limits, _body_size(data))
+
+        response = get_transport(self.transport).request(
+            method, url, headers, data, stream=stream, timeout=timeout
+        )
+
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit():
+            for limit in limits:
+                if limit.bytes is not None:
+                    limit.bytes.reserve(float(length))
+        return response
+
+    def _wait(self, limits: List[_Limit], size: int):
+        reservations = [
+            reservation
+            for limit in limits
+            for reservation in limit.reservations(size)
+        ]
+        # the buckets refill at the same time, so the longest wait covers
+        # them all
+        wait = max(
+            (bucket.reserve(tokens) for bucket, tokens in reservations),
+            default=0.0,
+        )
+
+        remaining = remaining_time()
+        if remaining is not None and wait >= remaining:
+            for bucket, tokens in reservations:
+                bucket.refund(tokens)
+            raise DeadlineExceeded(
+                f"the rate limit wait of {wait:.3f}s would pass the deadline"
+            )
+
+        for limit in limits:
+            limit.record(wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns, per rate limit key, the requests it let through, how many
+        of them waited, and the total and longest waits in seconds.
+        """
+        return {
+            method: limit.stats() for method, limit in self._limits.items()
+        }
+
+
+def _body_size(data: Any) -> int:
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+
+    from requests.utils import super_len
+
+    return super_len(data)
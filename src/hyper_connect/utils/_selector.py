@@ -0,0 +1,552 @@
+import heapq
+import operator
+import re
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from hyper_connect.types import QueryOptions
+
+Predicate = Callable[[Any], bool]
+
+# The value of a field a document does not have
+_MISSING: Any = object()
+
+# The order of JSON types when comparing values of different types, as
+# in CouchDB's collation: null < false < true < numbers < strings <
+# arrays < objects
+_RANKS = {
+    type(None): 0,
+    bool: 1,
+    int: 2,
+    float: 2,
+    str: 3,
+    list: 4,
+    dict: 5,
+}
+
+_TYPE_NAMES = {
+    "null": 0,
+    "boolean": 1,
+    "number": 2,
+    "string": 3,
+    "array": 4,
+    "object": 5,
+}
+
+_COMPARISONS = {
+    "$lt": operator.lt,
+    "$lte": operator.le,
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+}
+
+_FIELD_SEPARATOR = re.compile(r"(?<!\\)\.")
+
+
+def _rank(value: Any) -> Optional[int]:
+    rank = _RANKS.get(type(value))
+    if rank is not None or value is _MISSING:
+        return rank
+    # subclasses, eg OrderedDict
+    for json_type, json_rank in _RANKS.items():
+        if json_type is not bool and isinstance(value, json_type):
+            return json_rank
+    return None
+
+
+def collation_key(value: Any) -> Tuple:
+    """
+    Returns a key that orders JSON values as hyper's data service does:
+    null, then false and true, then numbers, strings, arrays, and objects.
+    Arrays compare element by element.
+
+    Strings compare by code point, where CouchDB collates them with ICU,
+    so strings differing only in case may sort differently.
+    """
+    rank = _rank(value)
+    if rank is None:
+        raise TypeError(f"not a JSON value: {value!r}")
+    if rank == 4:
+        return (4, tuple(map(collation_key, value)))
+    if rank == 5:
+        return (
+            5,
+            tuple(
+                sorted(
+                    (key, collation_key(item)) for key, item in value.items()
+                )
+            ),
+        )
+    if rank == 0:
+        return (0, 0)
+    return (rank, value)
+
+
+def _parse_field(field: str) -> Tuple[str, ...]:
+    # "a.b" is field b of field a, "a\\.b" is field "a.b"
+    return tuple(
+        part.replace("\\.", ".") for part in _FIELD_SEPARATOR.split(field)
+    )
+
+
+def _getter(parts: Tuple[str, ...]) -> Callable[[Any], Any]:
+    if len(parts) == 1:
+        [name] = parts
+
+        def get_one(value: Any) -> Any:
+            if type(value) is dict:
+                return value.get(name, _MISSING)
+            return _get(value, parts)
+
+        return get_one
+
+    return lambda value: _get(value, parts)
+
+
+def _get(value: Any, parts: Tuple[str, ...]) -> Any:
+    for part in parts:
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit():
+            index = int(part)
+            value = value[index] if index < len(value) else _MISSING
+        else:
+            return _MISSING
+    return value
+
+
+def _all(predicates: List[Predicate]) -> Predicate:
+    if len(predicates) == 1:
+        return predicates[0]
+    if len(predicates) == 2:
+        first, second = predicates
+        return lambda value: first(value) and second(value)
+
+    def match_all(value: Any) -> bool:
+        for predicate in predicates:
+            if not predicate(value):
+                return False
+        return True
+
+    return match_all
+
+
+def _any(predicates: List[Predicate]) -> Predicate:
+    def match_any(value: Any) -> bool:
+        for predicate in predicates:
+            if predicate(value):
+                return True
+        return False
+
+    return match_any
+
+
+def _selectors(op: str, arg: Any) -> List[Predicate]:
+    if not isinstance(arg, list) or not arg:
+        raise ValueError(f"{op} takes a non-empty list of selectors")
+    return [_compile(selector) for selector in arg]
+
+
+def _eq(arg: Any) -> Predicate:
+    rank = _rank(arg)
+    if rank is None:
+        raise ValueError(f"not a JSON value: {arg!r}")
+    if rank == 0:
+        return lambda value: value is None
+    if rank == 1:
+        return lambda value: value is arg
+    if rank == 2:
+        # True == 1 in python, but not in JSON
+        return lambda value: value == arg and type(value) is not bool
+    if rank == 3:
+        return lambda value: value == arg
+
+    key = collation_key(arg)
+    return lambda value: _rank(value) == rank and collation_key(value) == key
+
+
+def _compare(op: str, arg: Any) -> Predicate:
+    compare = _COMPARISONS[op]
+    rank = _rank(arg)
+    if rank is None:
+        raise ValueError(f"not a JSON value: {arg!r}")
+
+    if rank in (1, 2, 3):
+
+        def compare_scalar(value: Any) -> bool:
+            value_rank = _RANKS.get(type(value))
+            if value_rank is None:
+                value_rank = _rank(value)
+                if value_rank is None:
+                    return False
+            if value_rank == rank:
+                return compare(value, arg)
+            return compare(value_rank, rank)
+
+        return compare_scalar
+
+    key = collation_key(arg)
+
+    def compare_key(value: Any) -> bool:
+        value_rank = _rank(value)
+        if value_rank is None:
+            return False
+        if value_rank == rank:
+            return compare(collation_key(value), key)
+        return compare(value_rank, rank)
+
+    return compare_key
+
+
+def _in(op: str, arg: Any) -> Predicate:
+    if not isinstance(arg, list):
+        raise ValueError(f"{op} takes a list")
+
+    # strings and numbers are looked up in a set, the rest compared
+    hashable = {item for item in arg if _rank(item) in (2, 3)}
+    others = _any([_eq(item) for item in arg if _rank(item) not in (2, 3)])
+
+    def contains(value: Any) -> bool:
+        kind = type(value)
+        if (kind is str or kind is int or kind is float) and value in hashable:
+            return True
+        return others(value)
+
+    def match_in(value: Any) -> bool:
+        if type(value) is list:
+            # an array matches when any of its elements do
+            for item in value:
+                if contains(item):
+                    return True
+            return False
+        return contains(value)
+
+    if op == "$in":
+        return match_in
+    return lambda value: value is not _MISSING and not match_in(value)
+
+
+def _mod(arg: Any) -> Predicate:
+    if (
+        not isinstance(arg, list)
+        or len(arg) != 2
+        or not all(_rank(item) == 2 and item == int(item) for item in arg)
+        or arg[0] == 0
+    ):
+        raise ValueError("$mod takes [divisor, remainder], non-zero integers")
+    divisor, remainder = int(arg[0]), int(arg[1])
+
+    def match_mod(value: Any) -> bool:
+        if type(value) is not int:
+            return False
+        # the remainder takes the sign of the value, as in CouchDB
+        result = abs(value) % abs(divisor)
+        return (-result if value < 0 else result) == remainder
+
+    return match_mod
+
+
+def _regex(arg: Any) -> Predicate:
+    if not isinstance(arg, str):
+        raise ValueError("$regex takes a string")
+    try:
+        search = re.compile(arg).search
+    except re.error as error:
+        raise ValueError(
+            f"$regex takes a regular expression: {error}"
+        ) from error
+    return lambda value: type(value) is str and search(value) is not None
+
+
+def _condition(op: str, arg: Any) -> Predicate:
+    if op == "$and":
+        return _all(_selectors(op, arg))
+    if op == "$or":
+        return _any(_selectors(op, arg))
+    if op == "$nor":
+        match_any = _any(_selectors(op, arg))
+        return lambda value: not match_any(value)
+    if op == "$not":
+        match = _compile(arg)
+        return lambda value: not match(value)
+    if op == "$eq":
+        return _eq(arg)
+    if op == "$ne":
+        equals = _eq(arg)
+        return lambda value: value is not _MISSING and not equals(value)
+    if op in _COMPARISONS:
+        return _compare(op, arg)
+    if op in ("$in", "$nin"):
+        return _in(op, arg)
+    if op == "$exists":
+        exists = bool(arg)
+        return lambda value: (value is not _MISSING) is exists
+    if op == "$type":
+        if arg not in _TYPE_NAMES:
+            raise ValueError(f"$type takes one of {', '.join(_TYPE_NAMES)}")
+        rank = _TYPE_NAMES[arg]
+        return lambda value: _rank(value) == rank
+    if op == "$size":
+        if _rank(arg) != 2 or arg < 0 or not float(arg).is_integer():
+            raise ValueError("$size takes a non-negative integer")
+        return lambda value: type(value) is list and len(value) == arg
+    if op == "$mod":
+        return _mod(arg)
+    if op == "$regex":
+        return _regex(arg)
+    if op == "$beginsWith":
+        if not isinstance(arg, str):
+            raise ValueError("$beginsWith takes a string")
+        return lambda value: type(value) is str and value.startswith(arg)
+    if op == "$all":
+        if not isinstance(arg, list):
+            raise ValueError("$all takes a list")
+        elements = [_eq(item) for item in arg]
+        return lambda value: type(value) is list and all(
+            any(equals(item) for item in value) for equals in elements
+        )
+    if op == "$elemMatch":
+        match = _compile(arg)
+        return lambda value: type(value) is list and any(map(match, value))
+    if op == "$allMatch":
+        match = _compile(arg)
+        return lambda value: (
+            type(value) is list and bool(value) and all(map(match, value))
+        )
+    if op == "$keyMapMatch":
+        match = _compile(arg)
+        return lambda value: type(value) is dict and any(map(match, value))
+    raise ValueError(f"unsupported selector operator: {op}")
+
+
+def _field_equals(name: str, arg: str) -> Predicate:
+    # the most common condition, a top level field equal to a string,
+    # in one call
+    def field_equals(value: Any) -> bool:
+        if type(value) is dict:
+            return value.get(name) == arg
+        return _get(value, (name,)) == arg
+
+    return field_equals
+
+
+def _field(get: Callable[[Any], Any], condition: Predicate) -> Predicate:
+    return lambda value: condition(get(value))
+
+
+def _compile(selector: Any) -> Predicate:
+    """Compiles a selector, or a field's condition, over one value."""
+    if not isinstance(selector, dict):
+        raise ValueError(f"a selector must be a dict, not {selector!r}")
+
+    predicates: List[Predicate] = []
+    for key, arg in selector.items():
+        if key.startswith("$"):
+            predicates.append(_condition(key, arg))
+            continue
+
+        parts = _parse_field(key)
+        if len(parts) == 1 and type(arg) is str:
+            predicates.append(_field_equals(parts[0], arg))
+            continue
+
+        get = _getter(parts)
+        if isinstance(arg, dict) and arg:
+            # operators, eg {"$gt": 1}, or subfields, eg {"name": "x"}
+            condition = _compile(arg)
+        else:
+            condition = _eq(arg)
+        predicates.append(_field(get, condition))
+
+    if not predicates:
+        return lambda value: True
+    return _all(predicates)
+
+
+def compile_selector(selector: Dict) -> Predicate:
+    """
+    Compiles a data query selector into a function that tells whether a
+    document matches it.
+
+    The selector is the one hyper.data.query takes, and is read once:
+    matching a document runs a tree of closures rather than walking the
+    selector again.  Supports the CouchDB selector operators $and, $or,
+    $nor, $not, $eq, $ne, $lt, $lte, $gt, $gte, $in, $nin, $exists, $type,
+    $size, $mod, $regex, $beginsWith, $all, $elemMatch, $allMatch, and
+    $keyMapMatch, dotted field names, and nested field selectors.
+
+    As in CouchDB, only $exists: false and $not match a missing field,
+    values of different types compare in collation order (see
+    collation_key), and an array matches $in when any element does.
+
+    Example:
+
+        is_old_comedy = compile_selector(
+            {"type": "movie", "year": {"$lt": "1990"}, "genre": "comedy"}
+        )
+        old_comedies = [doc for doc in docs if is_old_comedy(doc)]
+
+    Raises ValueError for unsupported operators and malformed arguments.
+    """
+    return _compile(selector)
+
+
+class _Descending:
+    """Reverses the order of a sort key, for mixed direction sorts."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Tuple):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: Any) -> bool:
+        return self.key == other.key
+
+
+def _sort_key(
+    fields: List[Tuple[Callable[[Any], Any], bool]], mixed: bool
+) -> Callable[[Dict], Any]:
+    if len(fields) == 1:
+        [(get, _)] = fields
+
+        def field_key(doc: Dict) -> Any:
+            return collation_key(get(doc))
+
+        return field_key
+
+    if not mixed:
+
+        def fields_key(doc: Dict) -> Any:
+            return tuple(collation_key(get(doc)) for get, _ in fields)
+
+        return fields_key
+
+    def mixed_key(doc: Dict) -> Any:
+        return tuple(
+            _Descending(collation_key(get(doc)))
+            if desc
+            else collation_key(get(doc))
+            for get, desc in fields
+        )
+
+    return mixed_key
+
+
+def _sort(
+    docs: Iterable[Dict], sort: List[Any], limit: Optional[int]
+) -> List[Dict]:
+    fields: List[Tuple[Callable[[Any], Any], bool]] = []
+    for clause in sort:
+        # {"year": "DESC"}, or a field name, ascending
+        items = clause.items() if isinstance(clause, dict) else [(clause, "")]
+        for field, direction in items:
+            fields.append(
+                (
+                    _getter(_parse_field(field)),
+                    str(direction).upper() == "DESC",
+                )
+            )
+
+    # as in hyper, documents without the sort fields are not in the index
+    # that sorts them, so they are left out
+    getters = [get for get, _ in fields]
+    docs = (
+        doc for doc in docs if all(get(doc) is not _MISSING for get in getters)
+    )
+
+    descending = {desc for _, desc in fields}
+    key = _sort_key(fields, mixed=len(descending) > 1)
+    reverse = descending == {True}
+    if limit is None:
+        return sorted(docs, key=key, reverse=reverse)
+    # keeps `limit` documents in memory, not every match
+    if reverse:
+        return heapq.nlargest(limit, docs, key=key)
+    return heapq.nsmallest(limit, docs, key=key)
+
+
+def _projection(fields: List[str]) -> Callable[[Dict], Dict]:
+    paths = [_parse_field(field) for field in fields]
+
+    def project(doc: Dict) -> Dict:
+        projected: Dict = {}
+        for parts in paths:
+            value = _get(doc, parts)
+            if value is _MISSING:
+                continue
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+        return projected
+
+    return project
+
+
+def filter_docs(
+    docs: Iterable[Dict],
+    selector: Union[Dict, Predicate],
+    options: Optional[QueryOptions] = None,
+) -> Iterator[Dict]:
+    """
+    Returns the documents in `docs` that match a data query selector, in
+    process, applying the query's sort, limit, and fields options.
+
+    Use it to filter documents already at hand, eg a page from
+    hyper.data.list, hyper.cache.iter_query values, or a local copy,
+    with the selectors used for hyper.data.query.  `selector` may be one
+    compiled once by compile_selector, to filter many iterables with it.
+
+    Without a sort, documents are matched as they are read, so `docs` can
+    be a stream larger than memory.  A sort reads all of `docs`, keeping
+    every match, or only `limit` of them when a limit is given.
+
+    Example:
+
+        selector = compile_selector({"type": "movie", "year": {"$gt": "1980"}})
+        for page in pages:
+            for doc in filter_docs(page, selector, {"sort": [{"year": "ASC"}]}):
+                print(doc["title"])
+
+    Parameters
+    ----------
+    docs : Iterable[Dict]
+        The documents to filter.
+    selector : Dict or Callable[[Dict], bool]
+        A selector, see compile_selector, or the function it returns.
+    options : QueryOptions, optional
+        sort, limit, and fields, as for hyper.data.query.  useIndex is
+        ignored.
+
+    Returns
+    -------
+    Iterator of the matching documents.
+    """
+    match = selector if callable(selector) else compile_selector(selector)
+    options = options or {}
+    sort = options.get("sort")
+    limit = options.get("limit")
+    fields = options.get("fields")
+
+    matches: Iterable[Dict] = filter(match, docs)
+    if sort:
+        matches = _sort(matches, sort, limit)
+    elif limit is not None:
+        matches = islice(matches, limit)
+
+    if fields:
+        return map(_projection(fields), matches)
+    return iter(matches)
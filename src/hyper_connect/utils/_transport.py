@@ -0,0 +1,312 @@
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional, Union
+
+from ._deadline import Timeout, resolve_timeout
+
+if TYPE_CHECKING:
+    import requests
+
+# Keep-alive connections kept open per host
+POOL_MAXSIZE: int = 32
+
+# HTTP/2 connections kept open per host.  Each carries many requests at once.
+HTTP2_MAX_CONNECTIONS: int = 4
+
+
+class Transport:
+    """
+    Sends requests to hyper over a pooled, keep-alive requests.Session.
+
+    A transport is safe to share between threads and between Hyper objects,
+    including Hyper objects for different tenants.  Cookies are never
+    stored, so nothing leaks from one tenant's responses into another
+    tenant's requests.
+
+    Example:
+
+        transport = Transport(pool_maxsize=64)
+        hyper_a = connect(connection_string_a, transport=transport)
+        hyper_b = connect(connection_string_b, transport=transport)
+
+    ...
+
+    Attributes
+    ----------
+    pool_maxsize : int
+        The number of keep-alive connections kept open per host.
+    """
+
+    def __init__(self, pool_maxsize: int = POOL_MAXSIZE):
+        # imported here so that importing hyper_connect stays cheap
+        from http.cookiejar import DefaultCookiePolicy
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.pool_maxsize = pool_maxsize
+        self._session = requests.Session()
+        self._session.cookies.set_policy(
+            DefaultCookiePolicy(allowed_domains=[])
+        )
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Any = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> "requests.Response":
+        """
+        Sends a request.  `timeout` is resolved, and cut to the deadline,
+        by resolve_timeout.
+        """
+        return self._session.request(
+            method,
+            url,
+            headers=headers,
+            data=data,
+            stream=stream,
+            timeout=resolve_timeout(timeout),
+        )
+
+    def close(self):
+        self._session.close()
+
+
+# Bytes read at a time from request bodies that are file-like objects
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamedBody:
+    """
+    The file-like `raw` of a requests.Response converted from a streamed
+    httpx.Response, so iter_content reads the body as it arrives.
+    """
+
+    def __init__(self, transport: "HTTP2Transport", response: Any):
+        self._transport = transport
+        self._response = response
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+        self._closed = False
+
+    def _next_chunk(self) -> Optional[bytes]:
+        async def next_chunk() -> Optional[bytes]:
+            try:
+                return await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        return self._transport._run(next_chunk())
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        while not self._closed and (amt is None or len(self._buffer) < amt):
+            chunk = self._next_chunk()
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        if not data:
+            self.close()
+        return data
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._transport._run(self._response.aclose())
+
+
+class HTTP2Transport(Transport):
+    """
+    Sends requests to hyper over HTTP/2 with httpx.
+
+    Concurrent requests, from any thread and any service, are multiplexed
+    as streams over at most `max_connections` connections per host,
+    rather than each holding a socket of its own.  The connections are
+    driven by one background thread running an event loop, and callers
+    wait for their responses.  Responses are returned as requests.Response
+    objects, so services and callers see the same responses as with
+    Transport.  Servers that do not speak HTTP/2 are sent HTTP/1.1.
+
+    Requires httpx with HTTP/2 support:
+
+        pip install "hyper-connect[http2]"
+
+    Example:
+
+        transport = HTTP2Transport()
+        hyper = connect(connection_string, transport=transport)
+
+    ...
+
+    Attributes
+    ----------
+    max_connections : int
+        The most connections kept open per host.
+    verify : bool or str
+        Verify TLS certificates, against the CA bundle at this path when a
+        str.  The default is True.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP2_MAX_CONNECTIONS,
+        verify: Union[bool, str] = True,
+    ):
+        try:
+            import httpx
+        except ImportError as error:
+            raise ImportError(
+                "HTTP2Transport requires httpx with HTTP/2 support, "
+                'install it with: pip install "hyper-connect[http2]"'
+            ) from error
+        import asyncio
+        import ssl
+        from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+        self.max_connections = max_connections
+        self.verify = verify
+
+        # httpx's HTTP/2 connections are not safe to write from many
+        # threads at once, so only the loop's thread uses them
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="hyper-http2", daemon=True
+        )
+        self._thread.start()
+
+        async def create_client() -> Any:
+            return httpx.AsyncClient(
+                http2=True,
+                verify=(
+                    ssl.create_default_context(cafile=verify)
+                    if isinstance(verify, str)
+                    else verify
+                ),
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                # never store cookies, as Transport
+                cookies=CookieJar(
+                    policy=DefaultCookiePolicy(allowed_domains=[])
+                ),
+                timeout=None,
+            )
+
+        self._client = self._run(create_client())
+
+    def _run(self, coroutine: Any) -> Any:
+        """Runs a coroutine on the transport's loop and waits for it."""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Any = None,
+        stream: bool = False,
+        timeout: Optional[Timeout] = None,
+    ) -> "requests.Response":
+        import httpx
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers, super_len
+
+        if hasattr(data, "read"):
+            # eg: the MultipartEncoder of storage uploads.  Sent in chunks,
+            # with its length when known, as requests does.
+            length = super_len(data)
+            if length:
+                headers = dict(
+                    headers or {}, **{"Content-Length": str(length)}
+                )
+            reader = data
+
+            async def read_chunks() -> AsyncIterator[bytes]:
+                while True:
+                    chunk = reader.read(_UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        return
+                    yield chunk
+
+            data = read_chunks()
+
+        connect, read = resolve_timeout(timeout)
+
+        async def send() -> Any:
+            return await self._client.send(
+                self._client.build_request(
+                    method,
+                    url,
+                    headers=headers,
+                    content=data,
+                    timeout=httpx.Timeout(read, connect=connect),
+                ),
+                stream=stream,
+            )
+
+        try:
+            sent = self._run(send())
+        except httpx.TimeoutException as error:
+            # raised as Transport would, so callers handle one error type
+            raise requests.Timeout(str(error)) from error
+        except httpx.TransportError as error:
+            raise requests.ConnectionError(str(error)) from error
+
+        response = requests.Response()
+        response.status_code = sent.status_code
+        response.headers = CaseInsensitiveDict(sent.headers)
+        response.url = str(sent.url)
+        response.reason = sent.reason_phrase
+        response.encoding = get_encoding_from_headers(response.headers)
+        if stream:
+            response.raw = _StreamedBody(self, sent)
+        else:
+            response._content = sent.content
+            response._content_consumed = True
+        return response
+
+    def close(self):
+        if not self._loop.is_closed():
+            self._run(self._client.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+_default_transport: Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def default_transport() -> Transport:
+    """
+    Returns the process wide transport used by Hyper objects that were not
+    given one.  Created on first use.
+    """
+    global _default_transport
+
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def get_transport(transport: Optional[Transport]) -> Transport:
+    if transport is None:
+        return default_transport()
+    return transport
@@ -0,0 +1,48 @@
+import re
+
+# Seconds per unit of hyper's ttl strings, eg: "500ms", "30s", "1h", "1w"
+TTL_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+    "y": 365.25 * 24 * 60 * 60,
+}
+
+_TTL = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w|y)?\s*$", re.I)
+
+
+def parse_ttl(ttl: str) -> float:
+    """
+    Returns the number of seconds in a hyper cache ttl string.
+
+    A number without a unit is milliseconds, as in hyper.
+
+    Example:
+
+        parse_ttl("30s")  # 30.0
+        parse_ttl("1h")  # 3600.0
+    """
+    match = _TTL.match(ttl)
+    if match is None:
+        raise ValueError(f"invalid ttl: {ttl!r}")
+
+    amount, unit = match.groups()
+    return float(amount) * TTL_UNITS[(unit or "ms").lower()]
+
+
+def format_ttl(seconds: float) -> str:
+    """
+    Returns a hyper cache ttl string for a number of seconds, rounded up
+    to whole seconds.
+
+    Example:
+
+        format_ttl(90)  # "90s"
+    """
+    whole = int(seconds)
+    if whole < seconds:
+        whole += 1
+    return f"{max(whole, 1)}s"
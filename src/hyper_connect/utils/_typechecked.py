@@ -0,0 +1,32 @@
+import os
+from typing import Callable, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+# Set HYPER_CONNECT_TYPECHECK=0 in production to skip runtime type checks.
+TYPECHECK_ENV: str = "HYPER_CONNECT_TYPECHECK"
+
+
+def typecheck_enabled() -> bool:
+    """
+    Returns False when the HYPER_CONNECT_TYPECHECK environment variable
+    is set to 0, false, no, or off.  Type checking is on by default.
+    """
+    value = os.environ.get(TYPECHECK_ENV, "1").strip().lower()
+    return value not in ("0", "false", "no", "off")
+
+
+def typechecked(func: F) -> F:
+    """
+    Applies typeguard's runtime type checking to `func`.
+
+    The environment variable is read once, when the decorated module is
+    imported.  With type checking turned off the function is returned
+    unchanged, so calls pay nothing for it.
+    """
+    if not typecheck_enabled():
+        return func
+
+    from typeguard import typechecked as typeguard_typechecked
+
+    return typeguard_typechecked(func)
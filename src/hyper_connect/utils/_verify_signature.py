@@ -0,0 +1,223 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+# The header hyper Queue sends the signature in, as "t=<time>,sig=<hex>"
+SIGNATURE_HEADER: str = "X-Hyper-Signature"
+
+# Jobs signed longer ago than this, in seconds, are rejected
+SIGNATURE_TOLERANCE_SECONDS: int = 300
+
+# Most unexpired signatures remembered to reject replays
+NONCE_CACHE_SIZE: int = 10000
+
+
+def parse_signature(signature: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits a "t=<time>,sig=<hex>" signature header into its time and
+    signature.  Returns None when the header is malformed.
+    """
+    parts: Dict[str, str] = {}
+    for part in signature.split(","):
+        name, sep, value = part.strip().partition("=")
+        if sep:
+            parts[name] = value
+
+    if "t" not in parts or "sig" not in parts:
+        return None
+    return parts["t"], parts["sig"]
+
+
+def _to_seconds(timestamp: str) -> Optional[float]:
+    try:
+        value = float(timestamp)
+    except ValueError:
+        return None
+    # hyper signs with milliseconds since the epoch (JavaScript Date.now())
+    if value > 1e11:
+        value = value / 1000
+    return value
+
+
+class SignatureVerifier:
+    """
+    Verifies the signatures hyper Queue puts on the jobs it posts to a
+    target web hook.
+
+    The signature is the hex sha256 HMAC of "<time>.<body>" keyed with the
+    queue's secret.  The HMAC key is prepared once and copied for every
+    job, signatures are compared in constant time, and each signature is
+    accepted only once while it is within `tolerance` seconds.
+
+    Example:
+
+        verifier = SignatureVerifier(secret)
+        result = verifier.verify(body, headers["X-Hyper-Signature"])
+        if not result["ok"]:
+            ...
+
+    ...
+
+    Attributes
+    ----------
+    tolerance : int
+        How old, in seconds, a signature may be.
+    nonce_cache_size : int
+        The most unexpired signatures remembered to reject replays.  Once
+        it is reached, deliveries get a 503 until some expire.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        tolerance: int = SIGNATURE_TOLERANCE_SECONDS,
+        nonce_cache_size: int = NONCE_CACHE_SIZE,
+    ):
+        self.tolerance = tolerance
+        self.nonce_cache_size = nonce_cache_size
+        self._hmac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        self._nonces: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(
+        self,
+        body: Union[str, bytes],
+        signature: Optional[str],
+        now: Optional[float] = None,
+    ) -> Dict:
+        """
+        Checks the signature and its age without remembering it.
+
+        Returns
+        -------
+        Result (OkResult, NotOkResult).  An OkResult has the signature's
+        "nonce".
+        """
+        if not signature:
+            return {"ok": False, "status": 401, "msg": "missing signature"}
+
+        parsed = parse_signature(signature)
+        if parsed is None:
+            return {"ok": False, "status": 401, "msg": "malformed signature"}
+        timestamp, sig = parsed
+
+        signed_at = _to_seconds(timestamp)
+        if signed_at is None:
+            return {"ok": False, "status": 401, "msg": "malformed signature"}
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        mac = self._hmac.copy()
+        mac.update(timestamp.encode("utf-8") + b"." + body)
+        if not hmac.compare_digest(mac.hexdigest(), sig):
+            return {"ok": False, "status": 401, "msg": "invalid signature"}
+
+        if now is None:
+            now = time.time()
+        if abs(now - signed_at) > self.tolerance:
+            return {"ok": False, "status": 401, "msg": "signature expired"}
+
+        return {"ok": True, "status": 200, "nonce": f"{timestamp}.{sig}"}
+
+    def remember(self, nonce: str, now: Optional[float] = None) -> Dict:
+        """
+        Records a nonce returned by check, until its signature expires.
+
+        A nonce is only forgotten once check would reject its signature as
+        expired, so a replay is always caught.  When `nonce_cache_size`
+        signatures that have not expired are remembered, no more are
+        accepted until some expire: the delivery is turned away with a 503
+        so hyper sends it again later.
+
+        Returns
+        -------
+        Result (OkResult, NotOkResult), with a 409 status for a replay and
+        a 503 when the cache is full.
+        """
+        if now is None:
+            now = time.time()
+        timestamp, _, _ = nonce.rpartition(".")
+        signed_at = _to_seconds(timestamp)
+        expires = (now if signed_at is None else signed_at) + self.tolerance
+
+        with self._lock:
+            if nonce in self._nonces:
+                return {
+                    "ok": False,
+                    "status": 409,
+                    "msg": "replayed signature",
+                }
+
+            while self._nonces and next(iter(self._nonces.values())) < now:
+                self._nonces.popitem(last=False)
+
+            if len(self._nonces) >= self.nonce_cache_size:
+                # deliveries arrive out of signing order, so an expired
+                # nonce may sit behind one that has not expired
+                self._nonces = OrderedDict(
+                    (seen, until)
+                    for seen, until in self._nonces.items()
+                    if until >= now
+                )
+                if len(self._nonces) >= self.nonce_cache_size:
+                    return {
+                        "ok": False,
+                        "status": 503,
+                        "msg": "too many recent deliveries",
+                    }
+
+            self._nonces[nonce] = expires
+            return {"ok": True, "status": 200}
+
+    def verify(
+        self,
+        body: Union[str, bytes],
+        signature: Optional[str],
+        now: Optional[float] = None,
+    ) -> Dict:
+        """
+        Checks the signature and rejects it if it was seen before.
+
+        Returns
+        -------
+        Result (OkResult, NotOkResult)
+        """
+        result = self.check(body, signature, now)
+        if not result["ok"]:
+            return result
+        remembered = self.remember(result["nonce"], now)
+        return result if remembered["ok"] else remembered
+
+
+def verify_signature(
+    secret: str,
+    body: Union[str, bytes],
+    signature: Optional[str],
+    tolerance: int = SIGNATURE_TOLERANCE_SECONDS,
+) -> Dict:
+    """
+    Verifies a single hyper Queue job signature.
+
+    Replays are only detected by a long lived SignatureVerifier, so use one
+    of those, or a JobReceiver, in a web hook that receives many jobs.
+
+    Parameters
+    ----------
+    secret : str
+        The secret the queue was created with.
+    body : str or bytes
+        The raw request body.
+    signature : str, optional
+        The X-Hyper-Signature header.
+    tolerance : int
+        How old, in seconds, the signature may be.
+
+    Returns
+    -------
+    Result (OkResult, NotOkResult)
+    """
+    return SignatureVerifier(secret, tolerance).check(body, signature)
@@ -1,4 +1,11 @@
 __version__ = "0.0.1"
 
 from ._book_doc_artifacts import book_bulk_doc_artifacts, book_doc_artifacts
+from ._fake_hyper_app import FakeHyperApp
+from ._fake_hyper_server import (
+    FakeHyperServer,
+    FakeResponse,
+    json_response,
+    ok_responder,
+)
 from ._movie_doc_artifacts import movie_bulk_doc_artifacts, movie_doc_artifacts
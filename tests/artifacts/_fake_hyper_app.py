@@ -0,0 +1,211 @@
+import fnmatch
+import hashlib
+import json
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from ._fake_hyper_server import FakeResponse, json_response
+
+_NOT_FOUND = json_response(404, {"ok": False, "msg": "not found"})
+
+
+class FakeHyperApp:
+    """
+    An in-memory hyper app with data, cache, search, and storage services,
+    to pass to FakeHyperServer as its responder.
+
+    Its state is public so tests can seed and inspect it: data `docs` by
+    _id, cache `values` by key with their `ttls`, `search` documents by
+    key, and storage `files` by name.
+
+    Example:
+
+        app = FakeHyperApp(docs=[{"_id": "movie-1", "title": "Jaws"}])
+        with FakeHyperServer(app) as server:
+            hyper = connect(server.connection_string)
+            hyper.data.get("movie-1")
+            app.gets  # [("/data/test/movie-1", 200)]
+
+    ...
+
+    Attributes
+    ----------
+    etags : bool
+        Answer data and storage gets with an ETag, and with a 304 when the
+        request's If-None-Match matches it.
+    reject : Callable[[Dict], bool], optional
+        Marks the documents a data bulk write rejects in its results.
+    fail_ids : Set[str]
+        A data bulk write of any of these ids fails with a 400.
+    down : bool
+        Answer every request with a 503.
+    bulk_sizes : List[int]
+        The number of documents of every data bulk write.
+    gets : List[Tuple[str, int]]
+        The path and status of every GET.
+    """
+
+    def __init__(
+        self,
+        docs: Optional[List[Dict]] = None,
+        values: Optional[Dict[str, Dict]] = None,
+        search: Optional[Dict[str, Dict]] = None,
+        etags: bool = False,
+        reject: Optional[Callable[[Dict], bool]] = None,
+    ):
+        self.docs: Dict[str, Dict] = {doc["_id"]: doc for doc in docs or []}
+        self.values: Dict[str, Dict] = dict(values or {})
+        self.ttls: Dict[str, Optional[str]] = {}
+        self.search: Dict[str, Dict] = dict(search or {})
+        self.files: Dict[str, bytes] = {}
+        self.etags = etags
+        self.reject = reject
+        self.fail_ids: Set[str] = set()
+        self.down = False
+        self.bulk_sizes: List[int] = []
+        self.gets: List[Tuple[str, int]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: Dict) -> FakeResponse:
+        if self.down:
+            return json_response(503, {"ok": False, "msg": "down"})
+
+        url = urlparse(request["path"])
+        service, _, *rest = url.path.strip("/").split("/", 2)
+        name = unquote(rest[0]) if rest else None
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            body = json.loads(request["body"]) if request["body"] else None
+        except ValueError:
+            # storage uploads are multipart, not JSON
+            body = request["body"]
+
+        handle = getattr(self, f"_{service}")
+        response = handle(request["method"], name, params, body, request)
+        if request["method"] == "GET":
+            with self.lock:
+                self.gets.append((url.path, response[0]))
+        return response
+
+    def _versioned(
+        self, request: Dict, body: bytes, content_type: str
+    ) -> FakeResponse:
+        if not self.etags:
+            return 200, {"Content-Type": content_type}, body
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request["headers"].get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": content_type, "ETag": etag}, body
+
+    def _data(self, method, id, params, body, request) -> FakeResponse:
+        if id == "_bulk":
+            if self.fail_ids & {doc["_id"] for doc in body}:
+                return json_response(400, {"ok": False, "msg": "bad batch"})
+            with self.lock:
+                self.bulk_sizes.append(len(body))
+                for doc in body:
+                    self.docs[doc["_id"]] = doc
+            results = [
+                {
+                    "ok": self.reject is None or not self.reject(doc),
+                    "id": doc["_id"],
+                }
+                for doc in body
+            ]
+            return json_response(201, {"ok": True, "results": results})
+
+        ids = sorted(self.docs)
+        if id == "_query":
+            docs = [
+                self.docs[id]
+                for id in ids
+                if all(
+                    self.docs[id].get(field) == value
+                    for field, value in body["selector"].items()
+                )
+            ]
+            return json_response(200, {"ok": True, "docs": docs})
+
+        if id is None and method == "GET":
+            start = params.get("startkey", "")
+            limit = int(params.get("limit", "1000"))
+            docs = [self.docs[id] for id in ids if id >= start][:limit]
+            return json_response(200, {"ok": True, "docs": docs})
+
+        if method == "GET":
+            if id not in self.docs:
+                return _NOT_FOUND
+            doc = json.dumps(self.docs[id]).encode("utf-8")
+            return self._versioned(request, doc, "application/json")
+
+        with self.lock:
+            if method == "DELETE":
+                self.docs.pop(id, None)
+            else:
+                id = id or body["_id"]
+                self.docs[id] = body
+        return json_response(201 if method == "POST" else 200, {"ok": True})
+
+    def _cache(self, method, key, params, body, request) -> FakeResponse:
+        if key == "_query":
+            pattern = params.get("pattern", "*")
+            docs = [
+                {"key": key, "value": value}
+                for key, value in sorted(self.values.items())
+                if fnmatch.fnmatchcase(key, pattern)
+            ]
+            return json_response(200, {"ok": True, "docs": docs})
+
+        if method == "GET":
+            if key not in self.values:
+                return _NOT_FOUND
+            return json_response(200, self.values[key])
+
+        with self.lock:
+            if method == "DELETE":
+                self.values.pop(key, None)
+                self.ttls.pop(key, None)
+            elif method == "POST":
+                self.values[body["key"]] = body["value"]
+                self.ttls[body["key"]] = body.get("ttl")
+            else:
+                self.values[key] = body
+                self.ttls[key] = params.get("ttl")
+        return json_response(201 if method == "POST" else 200, {"ok": True})
+
+    def _search(self, method, key, params, body, request) -> FakeResponse:
+        if key == "_bulk":
+            with self.lock:
+                for doc in body:
+                    self.search[doc["_id"]] = doc
+            results = [{"ok": True, "id": doc["_id"]} for doc in body]
+            return json_response(201, {"ok": True, "results": results})
+
+        if method == "GET":
+            if key not in self.search:
+                return _NOT_FOUND
+            return json_response(
+                200, {"ok": True, "key": key, "doc": self.search[key]}
+            )
+
+        with self.lock:
+            if method == "DELETE":
+                self.search.pop(key, None)
+            elif method == "POST":
+                self.search[body["key"]] = body["doc"]
+            else:
+                self.search[key] = body
+        return json_response(201 if method == "POST" else 200, {"ok": True})
+
+    def _storage(self, method, name, params, body, request) -> FakeResponse:
+        if method == "GET":
+            if name not in self.files:
+                return _NOT_FOUND
+            return self._versioned(
+                request, self.files[name], "application/octet-stream"
+            )
+
+        with self.lock:
+            self.files.pop(name, None)
+        return json_response(200, {"ok": True})
@@ -0,0 +1,122 @@
+import gzip
+import json
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# (status, headers, body)
+FakeResponse = Tuple[int, Dict[str, str], bytes]
+
+
+def json_response(status: int, doc: Any) -> FakeResponse:
+    return (
+        status,
+        {"Content-Type": "application/json"},
+        json.dumps(doc).encode("utf-8"),
+    )
+
+
+def ok_responder(request: Dict) -> FakeResponse:
+    return json_response(200, {"ok": True})
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # clients that time out hang up before their response is written
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class FakeHyperServer:
+    """
+    A local HTTP server standing in for hyper in unit tests.
+
+    Every request is recorded in `requests` as a Dict with method, path,
+    headers, and the decoded body.  Responses come from `responder`.
+
+    Example:
+
+        with FakeHyperServer() as server:
+            hyper = connect(server.connection_string)
+            hyper.data.get("movie-1")
+            server.requests[0]["path"]  # "/data/test/movie-1"
+    """
+
+    def __init__(
+        self, responder: Optional[Callable[[Dict], FakeResponse]] = None
+    ):
+        self.responder = responder or ok_responder
+        self.requests: List[Dict] = []
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    @property
+    def connection_string(self) -> str:
+        assert self._server is not None
+        return f"http://127.0.0.1:{self._server.server_port}/test"
+
+    def start(self) -> "FakeHyperServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, answer without
+            # waiting for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "gzip":
+                    raw = gzip.decompress(raw)
+                elif encoding == "deflate":
+                    raw = zlib.decompress(raw)
+
+                request = {
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": raw,
+                }
+                with fake._lock:
+                    fake.requests.append(request)
+
+                status, headers, body = fake.responder(request)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_DELETE = _handle
+
+        self._server = _Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        ).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeHyperServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,95 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import gzip
+import json
+import unittest
+import zlib
+from typing import Dict, List
+
+from artifacts import FakeHyperServer, book_bulk_doc_artifacts
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import compress_body
+
+book_bulk_docs: List[Dict] = book_bulk_doc_artifacts()
+
+
+class TestCompressBody(unittest.TestCase):
+    def test_no_compression(self):
+        headers: Dict[str, str] = {}
+        data = compress_body("x" * 5000, headers, None)
+
+        self.assertEqual(data, "x" * 5000)
+        self.assertNotIn("Content-Encoding", headers)
+
+    def test_below_threshold(self):
+        headers: Dict[str, str] = {}
+        data = compress_body('{"a": 1}', headers, "gzip")
+
+        self.assertEqual(data, '{"a": 1}')
+        self.assertNotIn("Content-Encoding", headers)
+
+    def test_gzip(self):
+        headers: Dict[str, str] = {}
+        body = json.dumps(book_bulk_docs)
+        data = compress_body(body, headers, "gzip", threshold=0)
+
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(data).decode("utf-8"), body)
+        self.assertLess(len(data), len(body))
+
+    def test_deflate(self):
+        headers: Dict[str, str] = {}
+        body = json.dumps(book_bulk_docs)
+        data = compress_body(body, headers, "deflate", threshold=0)
+
+        self.assertEqual(headers["Content-Encoding"], "deflate")
+        self.assertEqual(zlib.decompress(data).decode("utf-8"), body)
+
+
+class TestCompressedRequests(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_bulk_compressed(self):
+        hyper: Hyper = connect(
+            self.server.connection_string,
+            compression="gzip",
+            compression_threshold=0,
+        )
+        result = hyper.data.bulk(book_bulk_docs)
+
+        self.assertEqual(result["status"], 200)
+        request = self.server.requests[0]
+        self.assertEqual(request["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(request["body"]), book_bulk_docs)
+
+    def test_query_uncompressed_by_default(self):
+        hyper: Hyper = connect(self.server.connection_string)
+        hyper.data.query({"type": "book"}, {"limit": 3, "useIndex": None})
+
+        request = self.server.requests[0]
+        self.assertNotIn("Content-Encoding", request["headers"])
+        self.assertIn("gzip", request["headers"]["Accept-Encoding"])
+
+    def test_search_load_compressed(self):
+        hyper: Hyper = connect(
+            self.server.connection_string,
+            compression="deflate",
+            compression_threshold=0,
+        )
+        hyper.search.load(book_bulk_docs)
+
+        request = self.server.requests[0]
+        self.assertEqual(request["headers"]["Content-Encoding"], "deflate")
+        self.assertEqual(request["path"], "/search/test/_bulk")
+
+
+if __name__ == "__main__":
+    unittest.main()
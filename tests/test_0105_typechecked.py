@@ -0,0 +1,51 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from hyper_connect.utils import TYPECHECK_ENV, typecheck_enabled, typechecked
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+class TestTypechecked(unittest.TestCase):
+    def test_enabled_by_default(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertTrue(typecheck_enabled())
+
+            checked = typechecked(double)
+            self.assertIsNot(checked, double)
+            with self.assertRaises(TypeError):
+                checked("2")
+
+    def test_disabled(self):
+        for value in ["0", "false", "OFF", "no"]:
+            with mock.patch.dict(os.environ, {TYPECHECK_ENV: value}):
+                self.assertFalse(typecheck_enabled())
+                self.assertIs(typechecked(double), double)
+
+    def test_production_mode_skips_checks(self):
+        # The setting is read on import, so check it in a fresh interpreter
+        code = (
+            "from hyper_connect.utils import get_key; "
+            "print(hasattr(get_key, '__wrapped__'))"
+        )
+        env = dict(os.environ, **{TYPECHECK_ENV: "0"})
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
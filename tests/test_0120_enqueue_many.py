@@ -0,0 +1,139 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+from typing import Dict, List
+
+import requests
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import call_with_retries
+
+jobs: List[Dict] = [{"type": "email", "n": n} for n in range(20)]
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.seen: Dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def responder(self, request: Dict):
+        job = json.loads(request["body"])
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.seen[job["n"]] = self.seen.get(job["n"], 0) + 1
+            calls = self.seen[job["n"]]
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+
+        if job["n"] == 3 and calls == 1:
+            return json_response(503, {"ok": False, "msg": "busy"})
+        if job["n"] == 5:
+            return json_response(400, {"ok": False, "msg": "bad job"})
+        if job["n"] == 7:
+            return json_response(429, {"ok": False, "msg": "slow down"})
+        return json_response(201, {"ok": True, "id": str(job["n"])})
+
+
+class TestEnqueueMany(unittest.TestCase):
+    def setUp(self):
+        self.tracker = ConcurrencyTracker()
+        self.server = FakeHyperServer(self.tracker.responder).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def assert_outcomes(self, results: List[Dict]):
+        self.assertEqual(len(results), len(jobs))
+        self.assertEqual(results[0]["id"], "0")
+        self.assertEqual(results[0]["attempts"], 1)
+
+        # a 5xx is retried
+        self.assertTrue(results[3]["ok"])
+        self.assertEqual(results[3]["attempts"], 2)
+
+        # a 4xx is reported, not retried
+        self.assertFalse(results[5]["ok"])
+        self.assertEqual(results[5]["status"], 400)
+        self.assertEqual(self.tracker.seen[5], 1)
+
+        # a 429 is retried until the retries run out
+        self.assertFalse(results[7]["ok"])
+        self.assertEqual(results[7]["attempts"], 2)
+        self.assertEqual(self.tracker.seen[7], 2)
+
+        self.assertLessEqual(self.tracker.peak, 4)
+        self.assertGreater(self.tracker.peak, 1)
+
+    def test_enqueue_many(self):
+        results = self.hyper.queue.enqueue_many(jobs, concurrency=4, retries=1)
+        self.assert_outcomes(results)
+
+    def test_enqueue_many_async(self):
+        async def enqueue_many():
+            return await self.hyper.queue.enqueue_many_async(
+                jobs, concurrency=4, retries=1
+            )
+
+        self.assert_outcomes(asyncio.run(enqueue_many()))
+
+    def test_connection_error(self):
+        self.server.stop()
+
+        results = self.hyper.queue.enqueue_many(jobs[:2], retries=0)
+
+        self.assertFalse(results[0]["ok"])
+        self.assertIsNone(results[0]["status"])
+        self.assertEqual(results[0]["attempts"], 1)
+
+    def test_bugs_are_raised_not_retried(self):
+        calls = []
+
+        def broken():
+            calls.append(1)
+            return {}["status"]
+
+        with self.assertRaises(KeyError):
+            call_with_retries(broken, 3, retry_delay=0)
+        self.assertEqual(len(calls), 1)
+
+        # a job that is not JSON is a bug in the caller, not an outage
+        with self.assertRaises(TypeError):
+            self.hyper.queue.enqueue_many([{"tags": {"a"}}], retries=3)
+        self.assertEqual(self.server.requests, [])
+
+    def test_retryable_statuses(self):
+        for status, attempts in [(500, 3), (503, 3), (429, 3), (404, 1)]:
+            with self.subTest(status=status):
+                result = call_with_retries(
+                    lambda: {"ok": False, "status": status}, 2, retry_delay=0
+                )
+                self.assertEqual(result["attempts"], attempts)
+
+        def not_found():
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("not found", response=response)
+
+        result = call_with_retries(not_found, 2, retry_delay=0)
+        self.assertEqual((result["status"], result["attempts"]), (404, 1))
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            self.hyper.queue.enqueue_many(jobs, concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
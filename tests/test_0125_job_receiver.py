@@ -0,0 +1,224 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import threading
+import time
+import unittest
+from typing import Dict, List, Optional
+
+from hyper_connect import ASGIJobReceiver, JobReceiver, WSGIJobReceiver
+from hyper_connect.utils import SignatureVerifier, verify_signature
+
+secret = "queue-secret"
+
+
+def sign(body: bytes, signed_at: Optional[float] = None) -> str:
+    # hyper signs with JavaScript's Date.now(), in milliseconds
+    t = str(int((time.time() if signed_at is None else signed_at) * 1000))
+    sig = hmac.new(
+        secret.encode(), t.encode() + b"." + body, hashlib.sha256
+    ).hexdigest()
+    return f"t={t},sig={sig}"
+
+
+def job_body(n: int) -> bytes:
+    return json.dumps({"type": "email", "n": n}).encode()
+
+
+class TestSignatureVerifier(unittest.TestCase):
+    def test_valid(self):
+        body = job_body(1)
+        self.assertTrue(verify_signature(secret, body, sign(body))["ok"])
+
+    def test_invalid(self):
+        body = job_body(1)
+        signature = sign(body)
+
+        for result in [
+            verify_signature(secret, job_body(2), signature),
+            verify_signature("other-secret", body, signature),
+            verify_signature(secret, body, None),
+            verify_signature(secret, body, "sig=abc"),
+            verify_signature(secret, body, "t=abc,sig=abc"),
+        ]:
+            self.assertFalse(result["ok"])
+            self.assertEqual(result["status"], 401)
+
+    def test_expired(self):
+        body = job_body(1)
+        result = verify_signature(secret, body, sign(body, time.time() - 600))
+
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["msg"], "signature expired")
+
+    def test_replay(self):
+        verifier = SignatureVerifier(secret)
+        body = job_body(1)
+        signature = sign(body)
+
+        self.assertTrue(verifier.verify(body, signature)["ok"])
+        self.assertEqual(verifier.verify(body, signature)["status"], 409)
+
+    def test_nonce_cache_is_bounded(self):
+        verifier = SignatureVerifier(secret, nonce_cache_size=2)
+        start = time.time()
+
+        for n in range(2):
+            body = job_body(n)
+            self.assertTrue(
+                verifier.verify(body, sign(body, start), start)["ok"]
+            )
+
+        # a full cache is not emptied of nonces that could be replayed,
+        # new deliveries are turned away until they expire
+        body = job_body(2)
+        result = verifier.verify(body, sign(body, start), start + 1)
+        self.assertEqual(result["status"], 503)
+        replay = job_body(0)
+        self.assertEqual(
+            verifier.verify(replay, sign(replay, start), start + 1)["status"],
+            409,
+        )
+
+        later = start + verifier.tolerance + 1
+        self.assertTrue(verifier.verify(body, sign(body, later), later)["ok"])
+        self.assertEqual(len(verifier._nonces), 1)
+
+    def test_nonces_expire_out_of_order(self):
+        verifier = SignatureVerifier(secret, nonce_cache_size=2)
+        start = time.time()
+
+        late, early = job_body(1), job_body(2)
+        verifier.verify(late, sign(late, start + 100), start)
+        verifier.verify(early, sign(early, start - 100), start)
+
+        now = start + verifier.tolerance - 50
+        body = job_body(3)
+        self.assertTrue(verifier.verify(body, sign(body, now), now)["ok"])
+        self.assertEqual(
+            verifier.verify(late, sign(late, start + 100), now)["status"], 409
+        )
+
+
+class TestJobReceiver(unittest.TestCase):
+    def setUp(self):
+        self.jobs: List[Dict] = []
+        self.handled = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+        def handler(job: Dict):
+            self.release.wait(5)
+            self.jobs.append(job)
+            self.handled.set()
+
+        self.receiver = JobReceiver(
+            handler, secret, workers=1, max_pending=1, wait=0
+        )
+
+    def tearDown(self):
+        self.release.set()
+        self.receiver.close()
+
+    def test_dispatches_verified_jobs(self):
+        body = job_body(1)
+
+        self.assertEqual(
+            self.receiver.receive(body, sign(body))["status"], 202
+        )
+        self.assertTrue(self.handled.wait(5))
+        self.assertEqual(self.jobs, [{"type": "email", "n": 1}])
+
+    def test_backpressure(self):
+        self.release.clear()
+        first, second = job_body(1), job_body(2)
+        second_signature = sign(second)
+
+        self.assertEqual(
+            self.receiver.receive(first, sign(first))["status"], 202
+        )
+        self.assertEqual(
+            self.receiver.receive(second, second_signature)["status"], 503
+        )
+
+        # a delivery turned away while busy is accepted when sent again
+        self.release.set()
+        result = self.receiver.receive(second, second_signature, wait=5)
+        self.assertEqual(result["status"], 202)
+
+    def test_wsgi(self):
+        app = WSGIJobReceiver(self.receiver, path="/jobs")
+        body = job_body(1)
+        responses: List[str] = []
+
+        def call(path: str, method: str, signature: Optional[str]) -> Dict:
+            environ = {
+                "PATH_INFO": path,
+                "REQUEST_METHOD": method,
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": io.BytesIO(body),
+            }
+            if signature is not None:
+                environ["HTTP_X_HYPER_SIGNATURE"] = signature
+            result = app(
+                environ, lambda status, headers: responses.append(status)
+            )
+            return json.loads(b"".join(result))
+
+        signature = sign(body)
+        self.assertTrue(call("/jobs", "POST", signature)["ok"])
+        self.assertEqual(call("/jobs", "POST", signature)["status"], 409)
+        self.assertEqual(call("/jobs", "POST", None)["status"], 401)
+        self.assertEqual(call("/jobs", "GET", signature)["status"], 405)
+        self.assertEqual(call("/other", "POST", signature)["status"], 404)
+        self.assertEqual(responses[0], "202 Accepted")
+
+    def test_asgi(self):
+        body = job_body(1)
+        signature = sign(body)
+
+        async def inner_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200})
+            await send({"type": "http.response.body", "body": b"inner"})
+
+        app = ASGIJobReceiver(self.receiver, inner_app, path="/jobs")
+
+        async def call(path: str) -> List[Dict]:
+            messages = [
+                {"type": "http.request", "body": body[:5], "more_body": True},
+                {"type": "http.request", "body": body[5:]},
+            ]
+            sent: List[Dict] = []
+
+            async def receive():
+                return messages.pop(0)
+
+            async def send(message):
+                sent.append(message)
+
+            scope = {
+                "type": "http",
+                "method": "POST",
+                "path": path,
+                "headers": [(b"x-hyper-signature", signature.encode())],
+            }
+            await app(scope, receive, send)
+            return sent
+
+        sent = asyncio.run(call("/jobs"))
+        self.assertEqual(sent[0]["status"], 202)
+        self.assertTrue(self.handled.wait(5))
+        self.assertEqual(self.jobs, [{"type": "email", "n": 1}])
+
+        sent = asyncio.run(call("/"))
+        self.assertEqual(sent[1]["body"], b"inner")
+
+
+if __name__ == "__main__":
+    unittest.main()
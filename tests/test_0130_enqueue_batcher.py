@@ -0,0 +1,145 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import json
+import queue
+import threading
+import time
+import unittest
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import EnqueueBatcher, connect
+from hyper_connect._batcher import BackgroundBatcher
+from hyper_connect.types import Hyper
+
+
+class TestEnqueueBatcher(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.gate.set()
+
+        def responder(request: Dict):
+            self.gate.wait(5)
+            job = json.loads(request["body"])
+            return json_response(201, {"ok": True, "id": str(job["n"])})
+
+        self.server = FakeHyperServer(responder).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.gate.set()
+        self.server.stop()
+
+    def test_futures(self):
+        with self.hyper.queue.batcher(batch_size=5, interval=0.01) as batcher:
+            futures = [batcher.submit({"n": n}) for n in range(12)]
+            results = [future.result(5) for future in futures]
+
+        self.assertEqual(
+            [r["id"] for r in results], [str(n) for n in range(12)]
+        )
+        self.assertEqual(len(self.server.requests), 12)
+
+    def test_submit_does_not_wait_for_hyper(self):
+        self.gate.clear()
+        batcher = self.hyper.queue.batcher(interval=0)
+
+        start = time.monotonic()
+        future = batcher.submit({"n": 1})
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertFalse(future.done())
+        self.assertEqual(len(batcher), 1)
+
+        self.gate.set()
+        self.assertTrue(future.result(5)["ok"])
+        batcher.close()
+
+    def test_flushes_full_batch_before_interval(self):
+        with self.hyper.queue.batcher(batch_size=3, interval=60) as batcher:
+            futures = [batcher.submit({"n": n}) for n in range(3)]
+            self.assertTrue(futures[2].result(5)["ok"])
+
+    def test_flush_and_close(self):
+        batcher = self.hyper.queue.batcher(batch_size=100, interval=60)
+        futures = [batcher.submit({"n": n}) for n in range(3)]
+
+        self.assertTrue(batcher.flush(5))
+        self.assertTrue(all(future.done() for future in futures))
+
+        last = batcher.submit({"n": 3})
+        batcher.close()
+        self.assertTrue(last.result(0)["ok"])
+        with self.assertRaises(RuntimeError):
+            batcher.submit({"n": 4})
+
+    def test_cancelled_future(self):
+        batcher = self.hyper.queue.batcher(batch_size=100, interval=60)
+        cancelled = batcher.submit({"n": 1})
+        kept = batcher.submit({"n": 2})
+        self.assertTrue(cancelled.cancel())
+
+        self.assertTrue(batcher.flush(5))
+        self.assertTrue(kept.result(0)["ok"])
+        self.assertEqual(len(self.server.requests), 1)
+
+        # the background thread is still sending
+        later = batcher.submit({"n": 3})
+        self.assertTrue(batcher.flush(5))
+        self.assertTrue(later.result(0)["ok"])
+        batcher.close()
+
+    def test_send_error_fails_the_batch_only(self):
+        batcher = self.hyper.queue.batcher(batch_size=100, interval=60)
+        batcher._enqueue = lambda job: job["missing"]  # type: ignore
+
+        with self.assertLogs("hyper_connect._batcher"):
+            failed = batcher.submit({"n": 1})
+            self.assertTrue(batcher.flush(5))
+        self.assertIsInstance(failed.exception(0), KeyError)
+
+        del batcher._enqueue
+        later = batcher.submit({"n": 2})
+        self.assertTrue(batcher.flush(5))
+        self.assertTrue(later.result(0)["ok"])
+        batcher.close()
+
+    def test_incomplete_subclass(self):
+        class NoSend(BackgroundBatcher):
+            def _buffered(self):
+                return 0
+
+            def _take(self, count):
+                return []
+
+            def _futures(self, batch):
+                return []
+
+        with self.assertRaises(TypeError):
+            NoSend()
+
+    def test_bounded_buffer(self):
+        self.gate.clear()
+        batcher = EnqueueBatcher(
+            self.hyper.queue, batch_size=1, interval=0, max_buffer=1
+        )
+
+        batcher.submit({"n": 1})
+        # wait for the first job to leave the buffer
+        while len(batcher._jobs):
+            time.sleep(0.001)
+        batcher.submit({"n": 2})
+
+        with self.assertRaises(queue.Full):
+            batcher.submit({"n": 3}, block=False)
+        with self.assertRaises(queue.Full):
+            batcher.submit({"n": 3}, timeout=0.01)
+
+        self.gate.set()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
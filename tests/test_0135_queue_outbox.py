@@ -0,0 +1,161 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+
+
+class TestQueueOutbox(unittest.TestCase):
+    def setUp(self):
+        self.status = 201
+
+        def responder(request: Dict):
+            job = json.loads(request["body"])
+            if job.get("bad"):
+                return json_response(400, {"ok": False, "msg": "bad job"})
+            return json_response(self.status, {"ok": self.status < 300})
+
+        self.server = FakeHyperServer(responder).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "outbox.db")
+
+    def tearDown(self):
+        self.server.stop()
+        self.dir.cleanup()
+
+    def test_drain(self):
+        with self.hyper.queue.outbox(self.path, batch_size=3) as outbox:
+            for n in range(7):
+                outbox.put({"n": n})
+            outbox.put({"bad": True}, key="bad")
+            self.assertEqual(outbox.backlog(), 8)
+
+            self.assertEqual(
+                outbox.drain(), {"sent": 7, "failed": 1, "pending": 0}
+            )
+
+            self.assertEqual(len(self.server.requests), 8)
+            failed = outbox.failed()
+            self.assertEqual(failed[0]["key"], "bad")
+            self.assertEqual(failed[0]["job"], {"bad": True})
+
+    def test_survives_outage_and_restart(self):
+        self.status = 503
+        outbox = self.hyper.queue.outbox(self.path)
+        outbox.put({"n": 1}, key="job-1")
+
+        self.assertEqual(
+            outbox.drain(), {"sent": 0, "failed": 0, "pending": 1}
+        )
+        outbox.close()
+
+        self.status = 201
+        with self.hyper.queue.outbox(self.path) as outbox:
+            self.assertEqual(outbox.backlog(), 1)
+            self.assertEqual(outbox.drain()["sent"], 1)
+            self.assertEqual(len(outbox), 0)
+
+    def test_dedupe(self):
+        with self.hyper.queue.outbox(self.path) as outbox:
+            self.assertTrue(outbox.put({"n": 1}, key="job-1"))
+            self.assertFalse(outbox.put({"n": 1}, key="job-1"))
+            outbox.drain()
+
+            # a sent job is not sent again when its producer retries
+            self.assertFalse(outbox.put({"n": 1}, key="job-1"))
+            self.assertEqual(outbox.drain()["sent"], 0)
+            self.assertEqual(len(self.server.requests), 1)
+
+    def test_put_of_a_rejected_key(self):
+        with self.hyper.queue.outbox(self.path) as outbox:
+            outbox.put({"bad": True}, key="bad")
+            outbox.drain()
+
+            with self.assertRaisesRegex(ValueError, "bad job"):
+                outbox.put({"bad": True}, key="bad")
+            self.assertEqual(outbox.backlog(), 0)
+
+    def test_synchronous(self):
+        with self.hyper.queue.outbox(self.path) as outbox:
+            (mode,) = outbox._db.execute("PRAGMA synchronous").fetchone()
+            self.assertEqual(mode, 2)  # FULL
+
+        with self.hyper.queue.outbox(
+            self.path, synchronous="normal"
+        ) as outbox:
+            (mode,) = outbox._db.execute("PRAGMA synchronous").fetchone()
+            self.assertEqual(mode, 1)
+
+        with self.assertRaises(ValueError):
+            self.hyper.queue.outbox(self.path, synchronous="OFF; DROP")
+
+    def test_failed_update_is_rolled_back(self):
+        with self.hyper.queue.outbox(self.path) as outbox:
+            outbox._db.execute(
+                "CREATE TRIGGER fail BEFORE UPDATE ON outbox "
+                "BEGIN SELECT RAISE(ABORT, 'disk trouble'); END"
+            )
+            outbox.put({"n": 1}, key="job-1")
+            with self.assertRaises(sqlite3.Error):
+                outbox.drain()
+            self.assertFalse(outbox._db.in_transaction)
+
+            # puts after the failure are committed, not left in a
+            # transaction another connection cannot see
+            outbox.put({"n": 2}, key="job-2")
+            other = sqlite3.connect(self.path)
+            self.assertEqual(
+                other.execute("SELECT COUNT(*) FROM outbox").fetchone(), (2,)
+            )
+            other.close()
+
+            outbox._db.execute("DROP TRIGGER fail")
+            self.assertEqual(outbox.drain()["sent"], 2)
+
+    def test_background_drain_survives_errors(self):
+        with self.hyper.queue.outbox(self.path, interval=0.01) as outbox:
+            calls = []
+
+            def enqueue(job):
+                calls.append(job)
+                if len(calls) == 1:
+                    raise RuntimeError("bug")
+                return {"ok": True, "status": 201}
+
+            outbox._queue = SimpleNamespace(enqueue=enqueue)
+            with self.assertLogs("hyper_connect._outbox", "ERROR"):
+                outbox.start()
+                outbox.put({"n": 1})
+
+                deadline = time.monotonic() + 5
+                while outbox.backlog() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            self.assertEqual(outbox.backlog(), 0)
+            self.assertEqual(len(calls), 2)
+
+    def test_background_drain(self):
+        with self.hyper.queue.outbox(self.path, interval=0.01) as outbox:
+            outbox.start()
+            outbox.put({"n": 1})
+
+            deadline = time.monotonic() + 5
+            while outbox.backlog() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(outbox.backlog(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import QueueWatcher, connect
+from hyper_connect.types import Hyper
+
+
+def error_job(n: int) -> Dict:
+    return {"id": f"job-{n}", "status": "ERROR", "job": {"n": n}}
+
+
+class TestQueueWatcher(unittest.TestCase):
+    def setUp(self):
+        self.jobs: List[Dict] = [error_job(1), error_job(2)]
+        self.server = FakeHyperServer(
+            lambda request: json_response(200, {"ok": True, "jobs": self.jobs})
+        ).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_yields_only_new_jobs(self):
+        watcher = self.hyper.queue.watch_errors(
+            interval=1, min_interval=0.5, max_interval=4
+        )
+
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(
+            self.server.requests[0]["path"], "/queue/test?status=ERROR"
+        )
+
+        self.jobs = [error_job(2), error_job(3)]
+        self.assertEqual(watcher.poll(), [error_job(3)])
+        self.assertEqual(watcher.interval, 0.5)
+
+        self.assertEqual(watcher.poll(), [])
+        self.assertEqual(watcher.interval, 0.75)
+
+        # jobs that drop off the list are forgotten
+        self.assertEqual(len(watcher._seen), 2)
+
+    def test_include_existing(self):
+        watcher = self.hyper.queue.watch_queued(include_existing=True)
+
+        self.assertEqual(watcher.poll(), self.jobs)
+        self.assertEqual(
+            self.server.requests[0]["path"], "/queue/test?status=READY"
+        )
+
+    def test_backs_off_on_failure(self):
+        watcher = QueueWatcher(
+            lambda: {"ok": False, "status": 500},
+            interval=1,
+            min_interval=1,
+            max_interval=2,
+        )
+
+        watcher.poll()
+        watcher.poll()
+        self.assertEqual(watcher.interval, 2)
+        self.assertEqual(watcher.last_error["status"], 500)
+
+    def test_iterate(self):
+        watcher = self.hyper.queue.watch_errors(
+            interval=0.01, min_interval=0.01, max_interval=0.01
+        )
+        seen: List[Dict] = []
+
+        # new jobs show up after the watcher's first poll
+        watcher.poll()
+        self.jobs = self.jobs + [error_job(3), error_job(4)]
+
+        for job in watcher:
+            seen.append(job)
+            if len(seen) == 2:
+                watcher.close()
+
+        self.assertEqual(seen, [error_job(3), error_job(4)])
+
+    def test_iterate_async(self):
+        watcher = self.hyper.queue.watch_errors(
+            interval=0.01, min_interval=0.01, max_interval=0.01
+        )
+
+        async def first_new_job():
+            async for job in watcher:
+                watcher.close()
+                return job
+
+        self.jobs = self.jobs + [error_job(3)]
+        watcher.poll()
+        self.jobs = self.jobs + [error_job(4)]
+
+        self.assertEqual(asyncio.run(first_new_job()), error_job(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
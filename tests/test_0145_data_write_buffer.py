@@ -0,0 +1,129 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import json
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+
+
+class TestDataWriteBuffer(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.gate.set()
+
+        def bulk_responder(request: Dict):
+            self.gate.wait(5)
+            docs = json.loads(request["body"])
+            return json_response(
+                201,
+                {
+                    "ok": True,
+                    "results": [
+                        {"ok": not doc.get("fail"), "id": doc["_id"]}
+                        for doc in docs
+                    ],
+                },
+            )
+
+        self.server = FakeHyperServer(bulk_responder).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.gate.set()
+        self.server.stop()
+
+    def test_coalesces_writes_per_id(self):
+        with self.hyper.data.write_buffer(interval=60) as writes:
+            first = writes.add({"_id": "movie-1", "title": "Jaws"})
+            second = writes.update("movie-1", {"title": "Jaws 2"})
+            writes.add({"_id": "movie-2", "title": "Alien"})
+            removed = writes.remove("movie-2")
+            self.assertEqual(len(writes), 2)
+
+            self.assertTrue(writes.flush(5))
+
+        self.assertEqual(len(self.server.requests), 1)
+        request = self.server.requests[0]
+        self.assertEqual(request["path"], "/data/test/_bulk")
+        self.assertEqual(
+            json.loads(request["body"]),
+            [
+                {"_id": "movie-1", "title": "Jaws 2"},
+                {"_id": "movie-2", "_deleted": True},
+            ],
+        )
+        self.assertEqual(first.result(0), {"ok": True, "id": "movie-1"})
+        self.assertIs(first.result(0), second.result(0))
+        self.assertEqual(removed.result(0)["id"], "movie-2")
+
+    def test_flushes_on_size(self):
+        with self.hyper.data.write_buffer(batch_size=2, interval=60) as writes:
+            writes.add({"_id": "movie-1"})
+            future = writes.add({"_id": "movie-2", "fail": True})
+
+            self.assertFalse(future.result(5)["ok"])
+            self.assertEqual(len(self.server.requests), 1)
+
+    def test_write_while_sending(self):
+        self.gate.clear()
+        writes = self.hyper.data.write_buffer(interval=0)
+
+        sending = writes.add({"_id": "movie-1", "title": "Jaws"})
+        while writes._writes:
+            time.sleep(0.001)
+        # movie-1 is on its way, so this write is sent in the next batch
+        later = writes.add({"_id": "movie-1", "title": "Jaws 2"})
+
+        self.gate.set()
+        writes.close()
+        self.assertTrue(sending.result(0)["ok"])
+        self.assertTrue(later.result(0)["ok"])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_cancelled_future(self):
+        writes = self.hyper.data.write_buffer(interval=60)
+        cancelled = writes.add({"_id": "movie-1", "title": "Jaws"})
+        kept = writes.add({"_id": "movie-2", "title": "Alien"})
+        self.assertTrue(cancelled.cancel())
+
+        self.assertTrue(writes.flush(5))
+        self.assertTrue(kept.result(0)["ok"])
+
+        # the background thread is still writing
+        later = writes.add({"_id": "movie-3", "title": "Heat"})
+        self.assertTrue(writes.flush(5))
+        self.assertTrue(later.result(0)["ok"])
+        writes.close()
+
+    def test_send_error_fails_the_batch_only(self):
+        writes = self.hyper.data.write_buffer(interval=60)
+        first = writes.add({"_id": "movie-1", "title": "Jaws"})
+        writes._data = SimpleNamespace(bulk=lambda docs: docs[0]["missing"])
+
+        with self.assertLogs("hyper_connect._batcher"):
+            self.assertTrue(writes.flush(5))
+        self.assertIsInstance(first.exception(0), KeyError)
+
+        writes._data = self.hyper.data
+        later = writes.add({"_id": "movie-2", "title": "Alien"})
+        self.assertTrue(writes.flush(5))
+        self.assertTrue(later.result(0)["ok"])
+        writes.close()
+
+    def test_requires_id(self):
+        with self.hyper.data.write_buffer() as writes:
+            with self.assertRaises(ValueError):
+                writes.add({"title": "Jaws"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import json
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import iter_json_array
+
+docs: List[Dict] = [
+    {"key": f"user-{n}", "value": {"n": n, "name": "ä" * n, "score": n / 3}}
+    for n in range(25)
+]
+
+
+def chunked(text: str, size: int) -> List[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def test_every_chunk_size(self):
+        text = json.dumps({"ok": True, "docs": docs[:5], "status": 200})
+
+        for size in range(1, 40):
+            self.assertEqual(
+                list(iter_json_array(chunked(text, size), "docs")), docs[:5]
+            )
+
+    def test_numbers_split_across_chunks(self):
+        text = '{"docs": [12345, 6.5e3, true, null]}'
+
+        for size in range(1, len(text)):
+            self.assertEqual(
+                list(iter_json_array(chunked(text, size), "docs")),
+                [12345, 6.5e3, True, None],
+            )
+
+    def test_missing_and_empty(self):
+        self.assertEqual(list(iter_json_array(['{"docs": []}'], "docs")), [])
+        self.assertEqual(list(iter_json_array(['{"ok": false}'], "docs")), [])
+        self.assertEqual(list(iter_json_array(["{}"], "docs")), [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['{"docs": [1, 2'], "docs"))
+
+
+class TestCacheIterQuery(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer(
+            lambda request: json_response(200, {"docs": docs, "ok": True})
+        ).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_pages(self):
+        pages = list(self.hyper.cache.iter_query("user-*", page_size=10))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([doc for page in pages for doc in page], docs)
+        self.assertEqual(
+            self.server.requests[0]["path"],
+            "/cache/test/_query?pattern=user-%2A",
+        )
+
+    def test_pages_async(self):
+        async def collect():
+            return [
+                page
+                async for page in self.hyper.cache.iter_query_async(
+                    "user-*", page_size=20
+                )
+            ]
+
+        pages = asyncio.run(collect())
+        self.assertEqual([len(page) for page in pages], [20, 5])
+
+    def test_error(self):
+        self.server.responder = lambda request: json_response(
+            500, {"ok": False}
+        )
+
+        with self.assertRaises(Exception):
+            list(self.hyper.cache.iter_query("user-*"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import threading
+import time
+import unittest
+from typing import Dict
+
+from artifacts import FakeHyperApp, FakeHyperServer
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import format_ttl, parse_ttl
+
+
+class TestTtl(unittest.TestCase):
+    def test_parse_ttl(self):
+        self.assertEqual(parse_ttl("30s"), 30)
+        self.assertEqual(parse_ttl("1m"), 60)
+        self.assertEqual(parse_ttl("2h"), 7200)
+        self.assertEqual(parse_ttl("1d"), 86400)
+        self.assertEqual(parse_ttl("1w"), 604800)
+        self.assertEqual(parse_ttl("500ms"), 0.5)
+        self.assertEqual(parse_ttl("1500"), 1.5)
+
+        with self.assertRaises(ValueError):
+            parse_ttl("soon")
+
+    def test_format_ttl(self):
+        self.assertEqual(format_ttl(90), "90s")
+        self.assertEqual(format_ttl(0.2), "1s")
+        self.assertEqual(format_ttl(1.5), "2s")
+
+
+class TestMemoize(unittest.TestCase):
+    def setUp(self):
+        self.cache = FakeHyperApp()
+        self.server = FakeHyperServer(self.cache).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+        self.calls = 0
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_caches_results(self):
+        @self.hyper.cache.memoize(ttl="1m", stale_ttl="1m")
+        def square(n: int) -> Dict:
+            self.calls += 1
+            return {"n": n * n}
+
+        self.assertEqual(square(3), {"n": 9})
+        self.assertEqual(square(3), {"n": 9})
+        self.assertEqual(square(4), {"n": 16})
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(square.__name__, "square")
+
+        key = next(iter(self.cache.values))
+        self.assertTrue(key.startswith("memo-"))
+        self.assertEqual(self.cache.ttls[key], "120s")
+
+    def test_custom_key(self):
+        @self.hyper.cache.memoize(key=lambda id: f"movie-{id}")
+        def movie(id: str) -> Dict:
+            return {"_id": id}
+
+        movie("1")
+        self.assertIn("movie-1", self.cache.values)
+
+    def test_serves_stale_while_refreshing_once(self):
+        refreshed = threading.Event()
+
+        @self.hyper.cache.memoize(key=lambda: "slow", beta=0)
+        def slow() -> int:
+            self.calls += 1
+            if self.calls > 1:
+                refreshed.wait(5)
+            return self.calls
+
+        self.assertEqual(slow(), 1)
+        self.cache.values["slow"]["expires"] = time.time() - 1
+
+        # stale values are served while one background call refreshes
+        self.assertEqual(slow(), 1)
+        self.assertEqual(slow(), 1)
+        refreshed.set()
+
+        deadline = time.monotonic() + 5
+        while self.cache.values["slow"]["value"] == 1:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(slow(), 2)
+
+    def test_early_refresh(self):
+        @self.hyper.cache.memoize(key=lambda: "early", beta=1e9)
+        def early() -> int:
+            self.calls += 1
+            return self.calls
+
+        early()
+        # a huge beta makes every read refresh ahead of expiry
+        self.cache.values["early"]["delta"] = 1
+        self.assertEqual(early(), 1)
+
+        deadline = time.monotonic() + 5
+        while self.calls < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_cache_down(self):
+        @self.hyper.cache.memoize()
+        def answer() -> int:
+            return 42
+
+        self.server.stop()
+        self.assertEqual(answer(), 42)
+
+    def test_async(self):
+        @self.hyper.cache.memoize(key=lambda n: f"double-{n}")
+        async def double(n: int) -> int:
+            self.calls += 1
+            return n * 2
+
+        async def run():
+            return [await double(2), await double(2)]
+
+        self.assertEqual(asyncio.run(run()), [4, 4])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.values["double-2"]["value"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
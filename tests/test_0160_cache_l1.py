@@ -0,0 +1,158 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import time
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperApp, FakeHyperServer
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import LocalCache
+
+
+class TestLocalCache(unittest.TestCase):
+    def test_lru(self):
+        local = LocalCache(maxsize=2, max_ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        self.assertIn("a", local)
+        self.assertNotIn("b", local)
+        self.assertEqual(len(local), 2)
+
+    def test_expiry(self):
+        local = LocalCache(maxsize=10, max_ttl=60)
+        local.set("short", 1, ttl=0.01)
+        local.set("long", 2, ttl=3600)
+        time.sleep(0.02)
+
+        self.assertIsNone(local.get("short"))
+        self.assertEqual(local.get("long"), 2)
+        self.assertEqual(local.stats()["hits"], 1)
+        self.assertEqual(local.stats()["misses"], 1)
+
+    def test_max_ttl(self):
+        local = LocalCache(maxsize=10, max_ttl=0.01)
+        local.set("a", 1, ttl=3600)
+        time.sleep(0.02)
+        self.assertNotIn("a", local)
+
+    def test_set_again_extends(self):
+        local = LocalCache(maxsize=10, max_ttl=60)
+        local.set("a", 1, ttl=0.01)
+        local.set("a", 2, ttl=60)
+        time.sleep(0.02)
+        self.assertEqual(local.get("a"), 2)
+
+    def test_heap_stays_bounded(self):
+        local = LocalCache(maxsize=5, max_ttl=60)
+        for i in range(1000):
+            local.set(str(i % 7), i)
+        self.assertLessEqual(len(local._expiries), 10)
+        self.assertEqual(len(local), 5)
+
+
+class TestCacheL1(unittest.TestCase):
+    def setUp(self):
+        self.cache = FakeHyperApp()
+        self.server = FakeHyperServer(self.cache).start()
+        self.hyper: Hyper = connect(
+            self.server.connection_string, cache_l1_size=100
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def gets(self) -> List[Dict]:
+        return [r for r in self.server.requests if r["method"] == "GET"]
+
+    def test_disabled_by_default(self):
+        hyper = connect(self.server.connection_string)
+        self.cache.values["movie-1"] = {"title": "Ghostbusters"}
+
+        hyper.cache.get("movie-1")
+        hyper.cache.get("movie-1")
+        self.assertEqual(len(self.gets()), 2)
+        self.assertEqual(hyper.cache.stats()["l1_hits"], 0)
+
+    def test_reads_are_kept(self):
+        self.cache.values["movie-1"] = {"title": "Ghostbusters"}
+
+        first = self.hyper.cache.get("movie-1")
+        second = self.hyper.cache.get("movie-1")
+        self.assertEqual(first, {"title": "Ghostbusters", "status": 200})
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.gets()), 1)
+
+        # callers get copies, so changing one does not change the cache
+        second["title"] = "changed"
+        self.assertEqual(
+            self.hyper.cache.get("movie-1")["title"], "Ghostbusters"
+        )
+
+    def test_misses_are_not_kept(self):
+        self.assertEqual(self.hyper.cache.get("missing")["status"], 404)
+        self.hyper.cache.get("missing")
+        self.assertEqual(len(self.gets()), 2)
+
+    def test_writes_are_kept(self):
+        self.hyper.cache.add("movie-1", {"title": "Ghostbusters"}, "1h")
+        self.assertEqual(
+            self.hyper.cache.get("movie-1"),
+            {"title": "Ghostbusters", "status": 200},
+        )
+
+        self.hyper.cache.set("movie-1", {"title": "Ghostbusters II"}, None)
+        self.assertEqual(
+            self.hyper.cache.get("movie-1")["title"], "Ghostbusters II"
+        )
+        self.assertEqual(len(self.gets()), 0)
+
+    def test_write_ttl_is_respected(self):
+        self.hyper.cache.set("movie-1", {"title": "Ghostbusters"}, "10ms")
+        time.sleep(0.02)
+        self.hyper.cache.get("movie-1")
+        self.assertEqual(len(self.gets()), 1)
+
+    def test_remove_invalidates(self):
+        self.hyper.cache.add("movie-1", {"title": "Ghostbusters"}, None)
+        self.hyper.cache.remove("movie-1")
+        self.assertEqual(self.hyper.cache.get("movie-1")["status"], 404)
+
+    def test_stats(self):
+        self.cache.values["movie-1"] = {"title": "Ghostbusters"}
+        for _ in range(4):
+            self.hyper.cache.get("movie-1")
+        self.hyper.cache.get("missing")
+
+        stats = self.hyper.cache.stats()
+        self.assertEqual(stats["l1_hits"], 3)
+        self.assertEqual(stats["l2_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["l1_hit_ratio"], 0.6)
+        self.assertEqual(stats["l2_hit_ratio"], 0.5)
+
+    def test_async(self):
+        self.cache.values["movie-1"] = {"title": "Ghostbusters"}
+
+        async def run():
+            first = await self.hyper.cache.get_async("movie-1")
+            second = await self.hyper.cache.get_async("movie-1")
+            await self.hyper.cache.remove_async("movie-1")
+            third = await self.hyper.cache.get_async("movie-1")
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(third["status"], 404)
+        self.assertEqual(len(self.gets()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
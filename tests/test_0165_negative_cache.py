@@ -0,0 +1,98 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import time
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperApp, FakeHyperServer
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+
+
+class TestNegativeCache(unittest.TestCase):
+    def setUp(self):
+        self.store = FakeHyperApp()
+        self.server = FakeHyperServer(self.store).start()
+        self.hyper: Hyper = connect(
+            self.server.connection_string, negative_cache_size=100
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def gets(self) -> List[Dict]:
+        return [r for r in self.server.requests if r["method"] == "GET"]
+
+    def test_disabled_by_default(self):
+        hyper = connect(self.server.connection_string)
+        hyper.data.get("missing")
+        hyper.data.get("missing")
+        self.assertEqual(len(self.gets()), 2)
+
+    def test_data_misses_are_kept(self):
+        first = self.hyper.data.get("missing")
+        second = self.hyper.data.get("missing")
+        self.assertEqual(first["status"], 404)
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.gets()), 1)
+
+    def test_data_writes_invalidate(self):
+        self.hyper.data.get("movie-1")
+        self.hyper.data.add({"_id": "movie-1", "title": "Ghostbusters"})
+        self.assertEqual(self.hyper.data.get("movie-1")["status"], 200)
+
+        self.hyper.data.get("movie-2")
+        self.hyper.data.update("movie-2", {"_id": "movie-2"})
+        self.assertEqual(self.hyper.data.get("movie-2")["status"], 200)
+
+        self.hyper.data.get("movie-3")
+        self.hyper.data.bulk([{"_id": "movie-3"}])
+        self.assertEqual(self.hyper.data.get("movie-3")["status"], 200)
+
+    def test_other_writes_seen_after_ttl(self):
+        hyper = connect(
+            self.server.connection_string,
+            negative_cache_size=100,
+            negative_cache_ttl="10ms",
+        )
+        hyper.data.get("movie-1")
+        self.store.docs["movie-1"] = {"_id": "movie-1"}
+        self.assertEqual(hyper.data.get("movie-1")["status"], 404)
+
+        time.sleep(0.02)
+        self.assertEqual(hyper.data.get("movie-1")["status"], 200)
+
+    def test_bounded(self):
+        hyper = connect(self.server.connection_string, negative_cache_size=2)
+        for id in ("a", "b", "c", "a"):
+            hyper.data.get(id)
+        self.assertEqual(len(self.gets()), 4)
+
+    def test_cache_misses_are_kept(self):
+        self.hyper.cache.get("missing")
+        self.hyper.cache.get("missing")
+        self.assertEqual(len(self.gets()), 1)
+
+        self.hyper.cache.set("missing", {"found": True}, None)
+        self.assertEqual(self.hyper.cache.get("missing")["found"], True)
+
+    def test_async(self):
+        async def run():
+            first = await self.hyper.data.get_async("missing")
+            second = await self.hyper.data.get_async("missing")
+            await self.hyper.data.add_async({"_id": "missing"})
+            third = await self.hyper.data.get_async("missing")
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(third["status"], 200)
+        self.assertEqual(len(self.gets()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import unittest
+from typing import List
+
+from artifacts import FakeHyperApp, FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import CONDITIONAL_MAX_BODY
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.store = FakeHyperApp(etags=True)
+        self.server = FakeHyperServer(self.store).start()
+        self.hyper: Hyper = connect(
+            self.server.connection_string, conditional_cache_size=100
+        )
+        self.store.docs["movie-1"] = {
+            "_id": "movie-1",
+            "title": "Ghostbusters",
+        }
+
+    def tearDown(self):
+        self.server.stop()
+
+    def statuses(self) -> List[int]:
+        return [status for _, status in self.store.gets]
+
+    def test_disabled_by_default(self):
+        hyper = connect(self.server.connection_string)
+        hyper.data.get("movie-1")
+        hyper.data.get("movie-1")
+        self.assertEqual(self.statuses(), [200, 200])
+        self.assertNotIn("If-None-Match", self.server.requests[1]["headers"])
+
+    def test_data_not_modified(self):
+        first = self.hyper.data.get("movie-1")
+        second = self.hyper.data.get("movie-1")
+
+        self.assertEqual(first["title"], "Ghostbusters")
+        self.assertEqual(second, first)
+        self.assertEqual(self.statuses(), [200, 304])
+
+        # the kept copy is not shared with callers
+        second["title"] = "changed"
+        self.assertEqual(
+            self.hyper.data.get("movie-1")["title"], "Ghostbusters"
+        )
+
+    def test_data_modified(self):
+        self.hyper.data.get("movie-1")
+        self.store.docs["movie-1"]["title"] = "Ghostbusters II"
+
+        self.assertEqual(
+            self.hyper.data.get("movie-1")["title"], "Ghostbusters II"
+        )
+        self.assertEqual(self.statuses(), [200, 200])
+
+    def test_rev_is_used_without_etag(self):
+        self.server.responder = lambda request: json_response(
+            200, {"_id": "movie-1", "_rev": "2-abc"}
+        )
+        self.hyper.data.get("movie-1")
+        self.hyper.data.get("movie-1")
+        self.assertEqual(
+            self.server.requests[-1]["headers"]["If-None-Match"], '"2-abc"'
+        )
+
+    def test_data_async(self):
+        async def run():
+            first = await self.hyper.data.get_async("movie-1")
+            second = await self.hyper.data.get_async("movie-1")
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(self.statuses(), [200, 304])
+
+    def test_download_not_modified(self):
+        self.store.files["hyper.txt"] = b"hello hyper"
+
+        first = self.hyper.storage.download("hyper.txt")
+        self.assertEqual(first.content, b"hello hyper")
+        second = self.hyper.storage.download("hyper.txt")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(b"".join(second.iter_content(4)), b"hello hyper")
+        self.assertEqual(self.statuses(), [200, 304])
+
+    def test_large_downloads_are_not_kept(self):
+        self.store.files["big.bin"] = b"x" * (CONDITIONAL_MAX_BODY + 1)
+
+        self.hyper.storage.download("big.bin").content
+        self.hyper.storage.download("big.bin").content
+        self.assertEqual(self.statuses(), [200, 200])
+
+    def test_remove_forgets(self):
+        self.store.files["hyper.txt"] = b"hello hyper"
+        self.hyper.storage.download("hyper.txt")
+        self.hyper.storage.remove("hyper.txt")
+
+        self.store.files["hyper.txt"] = b"hello again"
+        self.assertEqual(
+            self.hyper.storage.download("hyper.txt").content, b"hello again"
+        )
+        self.assertNotIn("If-None-Match", self.server.requests[-1]["headers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
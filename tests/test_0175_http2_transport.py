@@ -0,0 +1,92 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import gzip
+import importlib.util
+import io
+import json
+import unittest
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import HTTP2Transport
+
+HAS_HTTPX = (
+    importlib.util.find_spec("httpx") is not None
+    and importlib.util.find_spec("h2") is not None
+)
+
+
+def responder(request: Dict):
+    if request["path"].startswith("/storage/"):
+        if request["method"] == "GET":
+            body = gzip.compress(b"hello hyper" * 1000)
+            return (
+                200,
+                {
+                    "Content-Type": "text/plain",
+                    "Content-Encoding": "gzip",
+                    "Set-Cookie": "session=tenant-a",
+                },
+                body,
+            )
+        return json_response(201, {"ok": True})
+    return json_response(200, {"_id": "movie-1", "title": "Ghostbusters"})
+
+
+@unittest.skipUnless(HAS_HTTPX, "httpx[http2] is not installed")
+class TestHTTP2Transport(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer(responder).start()
+        self.transport = HTTP2Transport()
+        self.hyper: Hyper = connect(
+            self.server.connection_string, transport=self.transport
+        )
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_json(self):
+        self.assertEqual(
+            self.hyper.data.get("movie-1"),
+            {"_id": "movie-1", "title": "Ghostbusters", "status": 200},
+        )
+
+    def test_body(self):
+        self.hyper.data.add({"_id": "movie-1"})
+        self.assertEqual(
+            json.loads(self.server.requests[-1]["body"]), {"_id": "movie-1"}
+        )
+
+    def test_streamed_download(self):
+        response = self.hyper.storage.download("hyper.txt")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            b"".join(response.iter_content(128)), b"hello hyper" * 1000
+        )
+
+    def test_upload(self):
+        result = self.hyper.storage.upload("hyper.txt", io.BytesIO(b"hello"))
+        self.assertEqual(result["status"], 201)
+        self.assertIn(b"hello", self.server.requests[-1]["body"])
+
+    def test_cookies_are_not_stored(self):
+        self.hyper.storage.download("hyper.txt").content
+        self.hyper.data.get("movie-1")
+        self.assertNotIn("Cookie", self.server.requests[-1]["headers"])
+
+
+class TestHTTP2TransportMissing(unittest.TestCase):
+    @unittest.skipIf(HAS_HTTPX, "httpx is installed")
+    def test_import_error(self):
+        with self.assertRaises(ImportError):
+            HTTP2Transport()
+
+
+if __name__ == "__main__":
+    unittest.main()
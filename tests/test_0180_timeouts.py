@@ -0,0 +1,162 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import importlib.util
+import time
+import unittest
+from typing import Dict, List
+
+import requests
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import (
+    DeadlineExceeded,
+    HTTP2Transport,
+    call_with_retries,
+    deadline,
+    remaining_time,
+    request_timeout,
+    resolve_timeout,
+)
+
+HAS_HTTPX = (
+    importlib.util.find_spec("httpx") is not None
+    and importlib.util.find_spec("h2") is not None
+)
+
+jobs: List[Dict] = [{"type": "email", "n": n} for n in range(4)]
+
+
+class SlowResponder:
+    """Answers after `delay` seconds, with `status`."""
+
+    def __init__(self, delay: float = 0.5, status: int = 200):
+        self.delay = delay
+        self.status = status
+
+    def __call__(self, request: Dict):
+        time.sleep(self.delay)
+        return json_response(self.status, {"ok": self.status < 400})
+
+
+class TestResolveTimeout(unittest.TestCase):
+    def test_precedence(self):
+        self.assertEqual(resolve_timeout(), (3.05, 30.0))
+        self.assertEqual(resolve_timeout(5), (5, 5))
+        with request_timeout((1, 2)):
+            self.assertEqual(resolve_timeout(5), (1, 2))
+
+    def test_deadline_cuts_timeouts(self):
+        with deadline(1):
+            connect, read = resolve_timeout((3, 30))
+            self.assertLessEqual(read, 1)
+            self.assertLessEqual(connect, 1)
+
+    def test_nested_deadline_cannot_outlast_outer(self):
+        with deadline(1):
+            with deadline(60):
+                self.assertLessEqual(remaining_time(), 1)
+        self.assertIsNone(remaining_time())
+
+
+class TestTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.responder = SlowResponder()
+        self.server = FakeHyperServer(self.responder).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def assert_times_out(self, fn, within: float = 0.4):
+        start = time.monotonic()
+        with self.assertRaises(requests.Timeout):
+            fn()
+        self.assertLess(time.monotonic() - start, within)
+
+    def test_timeout(self):
+        hyper: Hyper = connect(self.server.connection_string, timeout=0.1)
+        self.assert_times_out(lambda: hyper.data.get("movie-1"))
+
+    def test_per_service_timeouts(self):
+        hyper: Hyper = connect(
+            self.server.connection_string,
+            timeout=0.1,
+            timeouts={"cache": 2},
+        )
+        self.assertEqual(hyper.cache.get("movie-1")["status"], 200)
+        self.assert_times_out(lambda: hyper.data.get("movie-1"))
+
+    def test_request_timeout_overrides(self):
+        hyper: Hyper = connect(self.server.connection_string, timeout=0.1)
+        with request_timeout(2):
+            self.assertEqual(hyper.data.get("movie-1")["status"], 200)
+
+    def test_deadline_cuts_timeout(self):
+        hyper: Hyper = connect(self.server.connection_string)
+        with deadline(0.1):
+            self.assert_times_out(lambda: hyper.data.get("movie-1"))
+
+    def test_deadline_exceeded_sends_nothing(self):
+        hyper: Hyper = connect(self.server.connection_string)
+        with deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(DeadlineExceeded):
+                hyper.data.get("movie-1")
+        self.assertEqual(self.server.requests, [])
+
+    def test_deadline_async(self):
+        hyper: Hyper = connect(self.server.connection_string)
+
+        async def run():
+            with deadline(0.1):
+                await hyper.data.get_async("movie-1")
+
+        with self.assertRaises(requests.Timeout):
+            asyncio.run(run())
+
+    def test_deadline_reaches_enqueue_many_threads(self):
+        hyper: Hyper = connect(self.server.connection_string)
+        start = time.monotonic()
+        with deadline(0.1):
+            results = hyper.queue.enqueue_many(jobs, concurrency=4)
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual([result["ok"] for result in results], [False] * 4)
+
+    def test_deadline_stops_retries(self):
+        self.responder.delay = 0
+        self.responder.status = 503
+        hyper: Hyper = connect(self.server.connection_string)
+        start = time.monotonic()
+        with deadline(0.25):
+            results = hyper.queue.enqueue_many(jobs, retries=10)
+        self.assertLess(time.monotonic() - start, 0.4)
+        for result in results:
+            self.assertEqual(result["status"], 503)
+            self.assertLess(result["attempts"], 4)
+
+    @unittest.skipUnless(HAS_HTTPX, "httpx[http2] is not installed")
+    def test_http2_timeout(self):
+        transport = HTTP2Transport()
+        try:
+            hyper: Hyper = connect(
+                self.server.connection_string, transport=transport, timeout=0.1
+            )
+            self.assert_times_out(lambda: hyper.data.get("movie-1"))
+        finally:
+            transport.close()
+
+    def test_retries_are_not_made_past_deadline(self):
+        def fail():
+            raise DeadlineExceeded("the deadline for hyper calls has passed")
+
+        result = call_with_retries(fail, 5)
+        self.assertEqual(result["status"], None)
+        self.assertEqual(result["attempts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import threading
+import time
+import unittest
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import HedgedTransport
+
+
+class StragglingResponder:
+    """Answers at once, except the next `slow` requests, which take 0.5s."""
+
+    def __init__(self):
+        self.slow = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: Dict):
+        with self.lock:
+            straggle = self.slow > 0
+            self.slow -= 1
+        if straggle:
+            time.sleep(0.5)
+        if request["method"] == "GET":
+            return json_response(200, {"_id": "movie-1"})
+        return json_response(201, {"ok": True, "id": "movie-1"})
+
+
+class TestHedgedTransport(unittest.TestCase):
+    def setUp(self):
+        self.responder = StragglingResponder()
+        self.server = FakeHyperServer(self.responder).start()
+        # warm up gets answer in far less than min_delay, so are not hedged
+        self.transport = HedgedTransport(
+            percentile=95, max_extra=0.05, min_delay=0.05
+        )
+        self.hyper: Hyper = connect(
+            self.server.connection_string, transport=self.transport
+        )
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def warm_up(self, gets: int = 40):
+        for _ in range(gets):
+            self.hyper.data.get("movie-1")
+        self.server.requests.clear()
+
+    def test_not_hedged_until_latencies_are_known(self):
+        self.responder.slow = 1
+        self.hyper.data.get("movie-1")
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIsNone(self.transport.stats()["delay"])
+
+    def test_slow_get_is_hedged(self):
+        self.warm_up()
+        self.responder.slow = 1
+
+        start = time.monotonic()
+        result = self.hyper.data.get("movie-1")
+        self.assertLess(time.monotonic() - start, 0.3)
+
+        self.assertEqual(result, {"_id": "movie-1", "status": 200})
+        self.assertEqual(len(self.server.requests), 2)
+        stats = self.transport.stats()
+        self.assertEqual(stats["hedged"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_hedged_async(self):
+        self.warm_up()
+        self.responder.slow = 1
+
+        async def get():
+            return await self.hyper.cache.get_async("movie-1")
+
+        start = time.monotonic()
+        result = asyncio.run(get())
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(self.transport.stats()["hedge_wins"], 1)
+
+    def test_extra_load_is_capped(self):
+        # 40 gets earn 40 * 0.05 = 2 hedges
+        self.warm_up()
+        self.responder.slow = 100
+
+        for _ in range(3):
+            self.hyper.data.get("movie-1")
+        self.assertEqual(self.transport.stats()["hedged"], 2)
+
+    def test_writes_are_not_hedged(self):
+        self.warm_up()
+        self.responder.slow = 1
+        self.hyper.data.add({"_id": "movie-1"})
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_connect_hedges_data_and_cache_gets(self):
+        hyper: Hyper = connect(
+            self.server.connection_string, hedge_percentile=90
+        )
+        for _ in range(40):
+            hyper.cache.get("movie-1")
+        self.responder.slow = 1
+
+        start = time.monotonic()
+        hyper.cache.get("movie-1")
+        self.assertLess(time.monotonic() - start, 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
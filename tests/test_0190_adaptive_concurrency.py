@@ -0,0 +1,129 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import threading
+import time
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import AdaptiveConcurrencyTransport
+
+jobs: List[Dict] = [{"type": "email", "n": n} for n in range(100)]
+
+
+class LimitedServer:
+    """
+    Answers after `delay` seconds, or with `status` when set.  More than
+    `capacity` requests at once are answered 503.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.delay = 0.005
+        self.status = None
+        self.active = 0
+        self.peak = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: Dict):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            overloaded = self.active > self.capacity
+            if overloaded:
+                self.rejected += 1
+        try:
+            time.sleep(self.delay)
+            if overloaded:
+                return json_response(503, {"ok": False, "msg": "busy"})
+            if self.status is not None:
+                return json_response(self.status, {"ok": False})
+            return json_response(201, {"ok": True, "id": "1"})
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.limited = LimitedServer()
+        self.server = FakeHyperServer(self.limited).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def connect(self, **options) -> Hyper:
+        self.transport = AdaptiveConcurrencyTransport(**options)
+        return connect(self.server.connection_string, transport=self.transport)
+
+    def test_in_flight_requests_stay_under_limit(self):
+        hyper = self.connect(initial_limit=2, max_limit=2)
+        results = hyper.queue.enqueue_many(jobs[:20], concurrency=8)
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertLessEqual(self.limited.peak, 2)
+
+    def test_limit_grows_while_latency_is_flat(self):
+        hyper = self.connect(initial_limit=2)
+        hyper.queue.enqueue_many(jobs, concurrency=16)
+        self.assertGreater(self.transport.stats()["limit"], 2)
+
+    def test_limit_is_cut_on_429(self):
+        self.limited.status = 429
+        hyper = self.connect(initial_limit=8)
+        for job in jobs[:20]:
+            hyper.queue.enqueue(job)
+        stats = self.transport.stats()
+        self.assertLess(stats["limit"], 8)
+        self.assertGreater(stats["cuts"], 0)
+
+    def test_limit_is_cut_on_latency_growth(self):
+        hyper = self.connect(initial_limit=8)
+        for job in jobs[:20]:
+            hyper.queue.enqueue(job)
+        limit = self.transport.stats()["limit"]
+
+        self.limited.delay = 0.1
+        for job in jobs[:10]:
+            hyper.queue.enqueue(job)
+        self.assertLess(self.transport.stats()["limit"], limit)
+
+    def test_finds_capacity(self):
+        # a fixed concurrency of 32 against a capacity of 4 is mostly 503s
+        self.limited.capacity = 4
+        self.limited.delay = 0.02
+        hyper = self.connect(initial_limit=32)
+        results = hyper.queue.enqueue_many(jobs, concurrency=32, retries=10)
+
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertLess(self.transport.stats()["limit"], 32)
+        self.assertLess(self.limited.rejected, len(jobs))
+
+    def test_async(self):
+        hyper = self.connect(initial_limit=2, max_limit=2)
+
+        async def run():
+            return await hyper.queue.enqueue_many_async(jobs[:20], 8)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertLessEqual(self.limited.peak, 2)
+
+    def test_connect_option(self):
+        hyper: Hyper = connect(
+            self.server.connection_string, adaptive_concurrency=True
+        )
+        results = hyper.queue.enqueue_many(jobs, concurrency=32)
+        self.assertTrue(all(result["ok"] for result in results))
+        # ADAPTIVE_INITIAL_LIMIT
+        self.assertLessEqual(self.limited.peak, 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
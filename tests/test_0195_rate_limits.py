@@ -0,0 +1,142 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import time
+import unittest
+
+from artifacts import FakeHyperServer
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import (
+    DeadlineExceeded,
+    RateLimitedTransport,
+    TokenBucket,
+    deadline,
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_waits_once_empty(self):
+        bucket = TokenBucket(10, 2)
+        self.assertEqual(bucket.reserve(1), 0)
+        self.assertEqual(bucket.reserve(1), 0)
+        self.assertAlmostEqual(bucket.reserve(1), 0.1, delta=0.01)
+        self.assertAlmostEqual(bucket.reserve(1), 0.2, delta=0.01)
+
+    def test_refund(self):
+        bucket = TokenBucket(10, 1)
+        bucket.reserve(1)
+        bucket.refund(1)
+        self.assertEqual(bucket.reserve(1), 0)
+
+    def test_larger_than_capacity_gets_through(self):
+        bucket = TokenBucket(100, 10)
+        self.assertEqual(bucket.reserve(10), 0)
+        self.assertAlmostEqual(bucket.reserve(50), 0.5, delta=0.01)
+
+
+class TestRateLimits(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def connect(self, limits) -> Hyper:
+        self.transport = RateLimitedTransport(limits=limits)
+        return connect(self.server.connection_string, transport=self.transport)
+
+    def timed(self, fn, times: int) -> float:
+        start = time.monotonic()
+        for _ in range(times):
+            fn()
+        return time.monotonic() - start
+
+    def test_requests_per_second(self):
+        # a burst of 2, then one every 50ms
+        hyper = self.connect({"*": {"requests_per_second": 20, "burst": 0.1}})
+        elapsed = self.timed(lambda: hyper.data.get("movie-1"), 10)
+
+        self.assertGreaterEqual(elapsed, 0.35)
+        stats = self.transport.stats()["*"]
+        self.assertEqual(stats["requests"], 10)
+        self.assertGreaterEqual(stats["waits"], 7)
+        self.assertGreater(stats["wait_seconds"], 0.3)
+        self.assertLessEqual(stats["max_wait_seconds"], 0.06)
+
+    def test_per_method(self):
+        hyper = self.connect({"POST": {"requests_per_second": 10}})
+        self.assertLess(self.timed(lambda: hyper.data.get("movie-1"), 20), 1)
+        self.assertEqual(self.transport.stats()["POST"]["requests"], 0)
+
+        hyper.data.add({"_id": "movie-1"})
+        self.assertEqual(self.transport.stats()["POST"]["requests"], 1)
+
+    def test_bytes_per_second(self):
+        doc = {"_id": "movie-1", "plot": "x" * 980}
+        hyper = self.connect(
+            {"POST": {"bytes_per_second": 10_000, "burst": 0.1}}
+        )
+        # each doc drains the 1000 byte burst
+        elapsed = self.timed(lambda: hyper.data.add(doc), 5)
+        self.assertGreaterEqual(elapsed, 0.35)
+
+    def test_async(self):
+        hyper = self.connect({"*": {"requests_per_second": 20, "burst": 0.1}})
+
+        async def run():
+            for _ in range(6):
+                await hyper.data.get_async("movie-1")
+
+        start = time.monotonic()
+        asyncio.run(run())
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertGreaterEqual(self.transport.stats()["*"]["waits"], 3)
+
+    def test_wait_past_deadline_fails_fast(self):
+        hyper = self.connect({"*": {"requests_per_second": 1}})
+        hyper.data.get("movie-1")
+
+        start = time.monotonic()
+        with deadline(0.5):
+            with self.assertRaises(DeadlineExceeded):
+                hyper.data.get("movie-1")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_connect_limits_per_service(self):
+        hyper: Hyper = connect(
+            self.server.connection_string,
+            rate_limits={"data": {"*": {"requests_per_second": 10}}},
+        )
+        self.assertLess(self.timed(lambda: hyper.cache.get("movie-1"), 20), 1)
+        self.assertGreaterEqual(
+            self.timed(lambda: hyper.data.get("movie-1"), 12), 0.15
+        )
+
+        stats = hyper.rate_limit_stats()
+        self.assertEqual(list(stats), ["data"])
+        self.assertEqual(stats["data"]["*"]["requests"], 12)
+        self.assertGreaterEqual(stats["data"]["*"]["waits"], 1)
+        self.assertGreater(stats["data"]["*"]["wait_seconds"], 0)
+
+    def test_rate_limit_stats_under_hedging(self):
+        hyper: Hyper = connect(
+            self.server.connection_string,
+            hedge_percentile=95,
+            rate_limits={"cache": {"GET": {"requests_per_second": 100}}},
+        )
+        hyper.cache.get("movie-1")
+        self.assertEqual(
+            hyper.rate_limit_stats()["cache"]["GET"]["requests"], 1
+        )
+        self.assertEqual(
+            connect(self.server.connection_string).rate_limit_stats(), {}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
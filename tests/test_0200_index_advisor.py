@@ -0,0 +1,191 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict
+
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import IndexRegistry, connect
+from hyper_connect._index_advisor import index_fields, query_shape
+from hyper_connect.types import Hyper, QueryOptions
+
+
+def options(**overrides) -> QueryOptions:
+    return {
+        "fields": None,
+        "sort": None,
+        "limit": None,
+        "useIndex": None,
+        **overrides,
+    }
+
+
+def responder(request: Dict):
+    if request["path"].endswith("/_index"):
+        return json_response(201, {"ok": True})
+    return json_response(200, {"ok": True, "docs": []})
+
+
+class TestQueryShape(unittest.TestCase):
+    def test_shape(self):
+        shape = query_shape(
+            {
+                "selector": {
+                    "type": "movie",
+                    "year": {"$gte": "1980", "$lt": "1990"},
+                    "genre": {"$in": ["comedy"]},
+                    "director": {"name": "Ivan Reitman"},
+                    "$and": [{"rating": {"$eq": "PG"}}],
+                },
+                "sort": [{"title": "ASC"}],
+            }
+        )
+        self.assertEqual(shape.equality, ("director.name", "rating", "type"))
+        self.assertEqual(shape.range, ("year",))
+        self.assertEqual(shape.other, ("genre",))
+        self.assertEqual(shape.sort, ("title",))
+        self.assertIsNone(shape.use_index)
+
+    def test_or_clauses_are_scans(self):
+        shape = query_shape(
+            {"selector": {"$or": [{"type": "movie"}, {"type": "book"}]}}
+        )
+        self.assertEqual(shape.equality, ())
+        self.assertEqual(shape.other, ("type",))
+
+    def test_values_do_not_change_shape(self):
+        self.assertEqual(
+            query_shape({"selector": {"type": "movie"}}),
+            query_shape({"selector": {"type": "book"}}),
+        )
+
+    def test_index_fields_equality_sort_range(self):
+        shape = query_shape(
+            {
+                "selector": {"year": {"$gt": "1980"}, "type": "movie"},
+                "sort": [{"title": "DESC"}],
+            }
+        )
+        self.assertEqual(index_fields(shape), ["type", "title", "year"])
+
+
+class TestQueryAdvisor(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer(responder).start()
+        self.hyper: Hyper = connect(
+            self.server.connection_string, query_advisor=True
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def index_requests(self):
+        return [
+            json.loads(request["body"])
+            for request in self.server.requests
+            if request["path"].endswith("/_index")
+        ]
+
+    def test_disabled_by_default(self):
+        hyper = connect(self.server.connection_string)
+        self.assertIsNone(hyper.data.advisor)
+        with self.assertRaises(ValueError):
+            hyper.data.ensure_indexes()
+
+    def test_recommendations(self):
+        for year in ["1984", "1989"]:
+            self.hyper.data.query(
+                {"type": "movie", "year": {"$gt": year}},
+                options(sort=[{"year": "ASC"}]),
+            )
+        self.hyper.data.query(
+            {"type": "movie"}, options(useIndex="idx_type", limit=3)
+        )
+
+        advisor = self.hyper.data.advisor
+        self.assertEqual(len(advisor.shapes()), 2)
+        self.assertEqual(len(advisor.unindexed()), 1)
+
+        [recommendation] = advisor.recommendations()
+        self.assertEqual(recommendation["name"], "idx_type_year")
+        self.assertEqual(recommendation["fields"], ["type", "year"])
+        self.assertEqual(recommendation["count"], 2)
+
+    def test_async_queries_are_recorded(self):
+        async def run():
+            await self.hyper.data.query_async({"type": "movie"}, options())
+
+        asyncio.run(run())
+        self.assertEqual(self.hyper.data.advisor.shapes()[0]["count"], 1)
+
+    def test_slow_query_is_logged_once(self):
+        self.hyper.data.advisor.slow_query_seconds = 0
+        with self.assertLogs("hyper_connect._index_advisor") as logs:
+            self.hyper.data.query({"type": "movie"}, options())
+            self.hyper.data.query({"type": "book"}, options())
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("['type']", logs.output[0])
+
+    def test_ensure_indexes_from_recommendations(self):
+        self.hyper.data.query({"type": "movie"}, options())
+
+        self.assertEqual(
+            self.hyper.data.ensure_indexes(),
+            [{"ok": True, "status": 201, "name": "idx_type"}],
+        )
+        self.assertEqual(
+            self.hyper.data.ensure_indexes(),
+            [{"ok": True, "skipped": True, "name": "idx_type"}],
+        )
+        self.assertEqual(
+            self.index_requests(),
+            [{"name": "idx_type", "type": "json", "fields": ["type"]}],
+        )
+
+    def test_changed_fields_are_created_again(self):
+        self.hyper.data.ensure_indexes([{"name": "idx", "fields": ["type"]}])
+        self.hyper.data.ensure_indexes(
+            [{"name": "idx", "fields": ["type", "year"]}]
+        )
+        self.assertEqual(len(self.index_requests()), 2)
+
+    def test_failed_indexes_are_not_registered(self):
+        self.server.responder = lambda request: json_response(
+            400, {"ok": False}
+        )
+        self.hyper.data.ensure_indexes([{"name": "idx", "fields": ["type"]}])
+        [result] = self.hyper.data.ensure_indexes(
+            [{"name": "idx", "fields": ["type"]}]
+        )
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual((result["ok"], result["name"]), (False, "idx"))
+
+    def test_file_registry(self):
+        indexes = [{"name": "idx_type", "fields": ["type"]}]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "indexes.json")
+            self.hyper.data.ensure_indexes(indexes, IndexRegistry(path))
+
+            # eg the next deploy
+            hyper = connect(self.server.connection_string)
+            [result] = hyper.data.ensure_indexes(indexes, IndexRegistry(path))
+            self.assertTrue(result["skipped"])
+
+            # other domains are other indexes
+            hyper = connect(self.server.connection_string, "other")
+            [result] = hyper.data.ensure_indexes(indexes, IndexRegistry(path))
+            self.assertNotIn("skipped", result)
+
+            with open(path) as file:
+                self.assertNotIn("secret", file.read())
+        self.assertEqual(len(self.index_requests()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import unittest
+from typing import Dict, List
+
+from hyper_connect.utils import collation_key, compile_selector, filter_docs
+
+movies: List[Dict] = [
+    {
+        "_id": "movie-1",
+        "type": "movie",
+        "title": "Ghostbusters",
+        "year": 1984,
+        "genres": ["comedy", "fantasy"],
+        "director": {"name": "Ivan Reitman"},
+    },
+    {
+        "_id": "movie-2",
+        "type": "movie",
+        "title": "Groundhog Day",
+        "year": 1993,
+        "genres": ["comedy"],
+        "director": {"name": "Harold Ramis"},
+    },
+    {
+        "_id": "movie-3",
+        "type": "movie",
+        "title": "Alien",
+        "year": 1979,
+        "genres": ["horror", "sci-fi"],
+        "director": {"name": "Ridley Scott"},
+    },
+    {"_id": "book-1", "type": "book", "title": "Dune", "year": "1965"},
+    {"_id": "book-2", "type": "book", "title": "Emma", "rating": None},
+]
+
+
+def ids(selector: Dict, **options) -> List[str]:
+    return [doc["_id"] for doc in filter_docs(movies, selector, options)]
+
+
+class TestCompileSelector(unittest.TestCase):
+    def test_equality(self):
+        self.assertEqual(ids({"type": "book"}), ["book-1", "book-2"])
+        self.assertEqual(ids({"year": {"$eq": 1984}}), ["movie-1"])
+        self.assertEqual(ids({"type": "movie", "year": 1979}), ["movie-3"])
+        self.assertEqual(ids({"genres": ["comedy"]}), ["movie-2"])
+
+    def test_nested_and_dotted_fields(self):
+        self.assertEqual(
+            ids({"director": {"name": "Harold Ramis"}}), ["movie-2"]
+        )
+        self.assertEqual(ids({"director.name": {"$regex": "^R"}}), ["movie-3"])
+        self.assertEqual(ids({"genres.1": "fantasy"}), ["movie-1"])
+
+    def test_comparisons(self):
+        self.assertEqual(
+            ids({"year": {"$gte": 1979, "$lt": 1990}}), ["movie-1", "movie-3"]
+        )
+        # strings collate after numbers
+        self.assertEqual(ids({"year": {"$gt": 2000}}), ["book-1"])
+        self.assertEqual(
+            ids({"year": {"$lt": "1970"}}),
+            ["movie-1", "movie-2", "movie-3", "book-1"],
+        )
+
+    def test_missing_fields(self):
+        self.assertEqual(ids({"rating": {"$exists": True}}), ["book-2"])
+        self.assertEqual(ids({"rating": None}), ["book-2"])
+        self.assertEqual(ids({"year": {"$exists": False}}), ["book-2"])
+        # only docs with the field match $ne and $nin
+        self.assertEqual(ids({"rating": {"$ne": 5}}), ["book-2"])
+        self.assertEqual(ids({"rating": {"$nin": [5]}}), ["book-2"])
+        self.assertEqual(
+            ids({"$not": {"rating": None}}),
+            ["movie-1", "movie-2", "movie-3", "book-1"],
+        )
+
+    def test_in_matches_array_elements(self):
+        self.assertEqual(
+            ids({"genres": {"$in": ["fantasy", "horror"]}}),
+            ["movie-1", "movie-3"],
+        )
+        self.assertEqual(ids({"genres": {"$nin": ["comedy"]}}), ["movie-3"])
+        self.assertEqual(
+            ids({"year": {"$in": [1993, "1965"]}}), ["movie-2", "book-1"]
+        )
+
+    def test_combinations(self):
+        self.assertEqual(
+            ids({"$or": [{"year": 1979}, {"title": "Dune"}]}),
+            ["movie-3", "book-1"],
+        )
+        self.assertEqual(
+            ids(
+                {
+                    "$and": [{"type": "movie"}, {"year": {"$gt": 1980}}],
+                    "$nor": [{"title": "Ghostbusters"}],
+                }
+            ),
+            ["movie-2"],
+        )
+        self.assertEqual(
+            ids({"year": {"$or": [{"$lt": 1980}, {"$gt": 1990}]}}),
+            ["movie-2", "movie-3", "book-1"],
+        )
+
+    def test_array_operators(self):
+        self.assertEqual(
+            ids({"genres": {"$all": ["fantasy", "comedy"]}}), ["movie-1"]
+        )
+        self.assertEqual(ids({"genres": {"$size": 1}}), ["movie-2"])
+        self.assertEqual(
+            ids({"genres": {"$elemMatch": {"$beginsWith": "sci"}}}),
+            ["movie-3"],
+        )
+        self.assertEqual(
+            ids({"genres": {"$allMatch": {"$ne": "comedy"}}}), ["movie-3"]
+        )
+        self.assertEqual(
+            ids({"director": {"$keyMapMatch": {"$eq": "name"}}}),
+            ["movie-1", "movie-2", "movie-3"],
+        )
+
+    def test_type_and_mod(self):
+        self.assertEqual(ids({"year": {"$type": "string"}}), ["book-1"])
+        self.assertEqual(
+            ids({"year": {"$mod": [2, 1]}}), ["movie-2", "movie-3"]
+        )
+        match = compile_selector({"n": {"$mod": [3, -1]}})
+        self.assertTrue(match({"n": -7}))
+        self.assertFalse(match({"n": 2}))
+
+    def test_booleans_are_not_numbers(self):
+        match = compile_selector({"flag": 1})
+        self.assertTrue(match({"flag": 1.0}))
+        self.assertFalse(match({"flag": True}))
+        self.assertTrue(compile_selector({"flag": True})({"flag": True}))
+        self.assertFalse(compile_selector({"n": {"$in": [1]}})({"n": True}))
+
+    def test_invalid_selectors(self):
+        for selector in [
+            {"year": {"$near": 1}},
+            {"$or": {"year": 1}},
+            {"year": {"$type": "date"}},
+            {"year": {"$mod": [0, 1]}},
+            {"year": {"$regex": 1}},
+            {"year": {"$regex": "(unclosed"}},
+            {"genres": {"$size": -1}},
+            {"genres": {"$size": 1.5}},
+            {"genres": {"$size": True}},
+            {"genres": {"$size": "1"}},
+        ]:
+            with self.subTest(selector=selector):
+                with self.assertRaises(ValueError):
+                    compile_selector(selector)
+
+
+class TestFilterDocs(unittest.TestCase):
+    def test_sort_and_limit(self):
+        self.assertEqual(
+            ids({"type": "movie"}, sort=[{"year": "ASC"}]),
+            ["movie-3", "movie-1", "movie-2"],
+        )
+        self.assertEqual(
+            ids({"type": "movie"}, sort=[{"year": "DESC"}], limit=2),
+            ["movie-2", "movie-1"],
+        )
+        self.assertEqual(
+            ids({}, sort=[{"type": "ASC"}, {"title": "DESC"}]),
+            ["book-2", "book-1", "movie-2", "movie-1", "movie-3"],
+        )
+        self.assertEqual(
+            ids({}, sort=[{"type": "DESC"}, {"title": "ASC"}], limit=2),
+            ["movie-3", "movie-1"],
+        )
+
+    def test_sort_leaves_out_docs_without_the_field(self):
+        self.assertEqual(
+            ids({}, sort=[{"year": "ASC"}]),
+            ["movie-3", "movie-1", "movie-2", "book-1"],
+        )
+
+    def test_fields(self):
+        docs = filter_docs(
+            movies,
+            {"_id": "movie-1"},
+            {"fields": ["title", "director.name", "rating"]},
+        )
+        self.assertEqual(
+            list(docs),
+            [{"title": "Ghostbusters", "director": {"name": "Ivan Reitman"}}],
+        )
+
+    def test_streams_without_sort(self):
+        def docs():
+            yield from movies
+            raise AssertionError("read past the limit")
+
+        self.assertEqual(
+            [doc["_id"] for doc in filter_docs(docs(), {}, {"limit": 2})],
+            ["movie-1", "movie-2"],
+        )
+
+    def test_compiled_selector(self):
+        match = compile_selector({"type": "book"})
+        self.assertEqual(len(list(filter_docs(movies, match))), 2)
+        self.assertEqual(len(list(filter_docs(movies[:4], match))), 1)
+
+    def test_collation_order(self):
+        values = [{"a": 1}, [1, 2], "b", "a", 10, 2.5, True, False, None, [1]]
+        self.assertEqual(
+            sorted(values, key=collation_key),
+            [None, False, True, 2.5, 10, "a", "b", [1], [1, 2], {"a": 1}],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import importlib.util
+import json
+import unittest
+from typing import Dict, List
+
+import requests
+from artifacts import FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import iter_columns, to_columns
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+movies: List[Dict] = [
+    {
+        "_id": f"movie-{n}",
+        "year": 1980 + n,
+        "rating": n / 2 if n % 3 else None,
+        "title": f"Movie {n}",
+        "director": {"name": "Ivan Reitman"} if n % 2 else {},
+    }
+    for n in range(10)
+]
+
+
+class TestIterQuery(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeHyperServer(
+            lambda request: json_response(200, {"docs": movies, "ok": True})
+        ).start()
+        self.hyper: Hyper = connect(self.server.connection_string)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_pages(self):
+        pages = list(self.hyper.data.iter_query({"type": "movie"}, None, 4))
+        self.assertEqual([len(page) for page in pages], [4, 4, 2])
+        self.assertEqual([doc for page in pages for doc in page], movies)
+
+        [request] = self.server.requests
+        self.assertTrue(request["path"].endswith("/_query"))
+        self.assertEqual(
+            json.loads(request["body"]), {"selector": {"type": "movie"}}
+        )
+
+    def test_error(self):
+        self.server.responder = lambda request: json_response(
+            500, {"ok": False}
+        )
+        with self.assertRaises(requests.HTTPError):
+            list(self.hyper.data.iter_query({"type": "movie"}))
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is not installed")
+class TestColumns(unittest.TestCase):
+    def test_to_columns(self):
+        columns = to_columns(
+            movies, ["year", "rating", "title", "director.name"], chunk_size=3
+        )
+
+        self.assertEqual(columns["year"].dtype.name, "int64")
+        self.assertEqual(columns["year"].sum(), sum(range(1980, 1990)))
+
+        rating = columns["rating"]
+        self.assertEqual(rating.dtype.name, "float64")
+        self.assertEqual(rating.count(), 6)
+        self.assertEqual(list(rating.mask), [n % 3 == 0 for n in range(10)])
+        self.assertAlmostEqual(
+            rating.mean(), sum(n / 2 for n in range(10) if n % 3) / 6
+        )
+
+        self.assertEqual(columns["title"][2], "Movie 2")
+        self.assertEqual(columns["director.name"].count(), 5)
+
+    def test_dtypes(self):
+        columns = to_columns(
+            movies,
+            ["year", "title", "rating"],
+            {"year": "int16", "title": "U12", "rating": "float32"},
+        )
+        self.assertEqual(columns["year"].dtype.name, "int16")
+        self.assertEqual(columns["title"].dtype.str, "<U12")
+        self.assertEqual(columns["rating"].dtype.name, "float32")
+        self.assertTrue(columns["rating"].mask[0])
+
+        with self.assertRaises(ValueError):
+            to_columns(movies, ["title"], {"title": "float64"})
+
+    def test_values_that_do_not_fit_the_dtype(self):
+        for dtype, value in [
+            ("U4", "Ghostbusters"),
+            ("int32", 1.7),
+            ("int32", 2**40),
+            ("int64", 2**70),
+            ("int32", [1]),
+        ]:
+            with self.subTest(dtype=dtype, value=value):
+                with self.assertRaises(ValueError):
+                    to_columns([{"n": 1}, {"n": value}], ["n"], {"n": dtype})
+
+        columns = to_columns([{"n": 2.0}, {}], ["n"], {"n": "int32"})
+        self.assertEqual(columns["n"].tolist(), [2, None])
+
+    def test_lists_are_objects(self):
+        docs = [{"genres": ["comedy", "sci-fi"]}, {"genres": ["horror", "x"]}]
+        column = to_columns(docs, ["genres"])["genres"]
+        self.assertEqual(column.shape, (2,))
+        self.assertEqual(column[1], ["horror", "x"])
+
+    def test_integers_too_large_for_int64(self):
+        columns = to_columns([{"n": 2**70}, {"n": 1}], ["n"])
+        self.assertEqual(columns["n"].dtype, object)
+        self.assertEqual(columns["n"].tolist(), [2**70, 1])
+
+        columns = to_columns([{"n": 2**70}, {"n": 1.5}], ["n"])
+        self.assertEqual(columns["n"].dtype.name, "float64")
+
+    def test_chunk_size_does_not_change_the_result(self):
+        docs = [
+            {"flag": True, "n": 1, "big": 2**70, "mixed": 1},
+            {"flag": 2, "n": None, "big": 1.5, "mixed": "x"},
+            {"flag": None, "n": 2.5, "big": None, "mixed": 2.5},
+        ]
+        fields = ["flag", "n", "big", "mixed", "missing"]
+        expected = to_columns(docs, fields)
+        for chunk_size in (1, 2):
+            with self.subTest(chunk_size=chunk_size):
+                columns = to_columns(docs, fields, chunk_size=chunk_size)
+                for field in fields:
+                    self.assertEqual(
+                        columns[field].dtype, expected[field].dtype
+                    )
+                    self.assertEqual(
+                        columns[field].tolist(), expected[field].tolist()
+                    )
+                    self.assertEqual(
+                        [type(value) for value in columns[field].tolist()],
+                        [type(value) for value in expected[field].tolist()],
+                    )
+        self.assertEqual(expected["flag"].dtype, object)
+        self.assertEqual(expected["flag"].tolist(), [True, 2, None])
+        self.assertEqual(expected["big"].dtype.name, "float64")
+
+    def test_chunks_of_different_types_are_promoted(self):
+        docs = [{"n": 1}, {"n": 2}, {"n": 2.5}]
+        columns = to_columns(docs, ["n"], chunk_size=2)
+        self.assertEqual(columns["n"].dtype.name, "float64")
+        self.assertEqual(list(columns["n"]), [1.0, 2.0, 2.5])
+
+    def test_empty(self):
+        columns = to_columns([], ["year"], {"year": "int32"})
+        self.assertEqual(len(columns["year"]), 0)
+        self.assertEqual(columns["year"].dtype.name, "int32")
+
+    def test_iter_columns(self):
+        pages = [movies[:4], movies[4:]]
+        sizes = [len(batch["year"]) for batch in iter_columns(pages, ["year"])]
+        self.assertEqual(sizes, [4, 6])
+
+    def test_query_columns(self):
+        with FakeHyperServer(
+            lambda request: json_response(200, {"docs": movies, "ok": True})
+        ) as server:
+            hyper = connect(server.connection_string)
+            columns = hyper.data.query_columns(
+                {"type": "movie"},
+                ["year", "rating"],
+                {"year": "int32"},
+                page_size=3,
+            )
+            [request] = server.requests
+
+        self.assertEqual(columns["year"].dtype.name, "int32")
+        self.assertEqual(len(columns["rating"]), 10)
+        self.assertEqual(
+            json.loads(request["body"])["fields"], ["year", "rating"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
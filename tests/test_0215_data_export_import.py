@@ -0,0 +1,212 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperApp, FakeHyperServer, json_response
+
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+from hyper_connect.utils import iter_concurrently
+
+movies: List[Dict] = [
+    {"_id": f"movie-{n:03}", "type": "movie", "title": f"Movie {n} ä"}
+    for n in range(25)
+]
+
+
+class TestDataExportImport(unittest.TestCase):
+    def setUp(self):
+        self.source = FakeHyperApp(movies)
+        # like hyper, the target rejects documents it cannot validate
+        self.target = FakeHyperApp(reject=lambda doc: "title" not in doc)
+        self.source_server = FakeHyperServer(self.source).start()
+        self.target_server = FakeHyperServer(self.target).start()
+        self.hyper: Hyper = connect(self.source_server.connection_string)
+        self.target_hyper: Hyper = connect(
+            self.target_server.connection_string
+        )
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.source_server.stop()
+        self.target_server.stop()
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_export_pages_through_list(self):
+        pages = []
+        result = self.hyper.data.export(
+            self.path("movies.ndjson"), page_size=10, progress=pages.append
+        )
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["docs"], 25)
+        self.assertEqual([page["docs"] for page in pages], [10, 20, 25])
+        with open(self.path("movies.ndjson"), encoding="utf-8") as file:
+            self.assertEqual([json.loads(line) for line in file], movies)
+        # 3 pages of 11
+        self.assertEqual(len(self.source_server.requests), 3)
+
+    def test_export_selector_to_stream(self):
+        stream = io.StringIO()
+        self.hyper.data.export(stream, {"_id": "movie-007"})
+        self.assertEqual(
+            stream.getvalue().splitlines(),
+            [json.dumps(movies[7], ensure_ascii=False, separators=(",", ":"))],
+        )
+
+    def test_export_gzip(self):
+        self.hyper.data.export(self.path("movies.ndjson.gz"))
+        with gzip.open(self.path("movies.ndjson.gz"), "rt") as file:
+            self.assertEqual(len(file.readlines()), 25)
+
+        stream = io.BytesIO()
+        self.hyper.data.export(stream, compress=True)
+        self.assertEqual(
+            len(gzip.decompress(stream.getvalue()).splitlines()), 25
+        )
+
+    def test_failed_export_keeps_the_old_file(self):
+        path = self.path("movies.ndjson")
+        with open(path, "w") as file:
+            file.write("old\n")
+
+        self.source_server.responder = lambda request: json_response(
+            500, {"ok": False, "msg": "down"}
+        )
+        result = self.hyper.data.export(path)
+        self.assertFalse(result["ok"])
+        with open(path) as file:
+            self.assertEqual(file.read(), "old\n")
+        self.assertEqual(os.listdir(self.directory.name), ["movies.ndjson"])
+
+    def test_round_trip(self):
+        path = self.path("movies.ndjson.gz")
+        self.hyper.data.export(path)
+
+        progress = []
+        result = self.target_hyper.data.import_(
+            path, batch_size=4, concurrency=3, progress=progress.append
+        )
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["docs"], 25)
+        self.assertEqual(result["batches"], 7)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(sorted(self.target.bulk_sizes), [1] + [4] * 6)
+        self.assertEqual(self.target.docs, self.source.docs)
+        self.assertEqual(
+            [update["docs"] for update in progress],
+            [4, 8, 12, 16, 20, 24, 25],
+        )
+
+    def test_round_trip_through_streams(self):
+        for compress in (True, False):
+            with self.subTest(compress=compress):
+                stream = io.BytesIO()
+                self.hyper.data.export(stream, compress=compress)
+                stream.seek(0)
+
+                result = self.target_hyper.data.import_(stream)
+                self.assertEqual(result["docs"], 25)
+                self.assertEqual(self.target.docs, self.source.docs)
+                self.assertFalse(stream.closed)
+
+    def test_batches_by_bytes_not_characters(self):
+        docs = [{"_id": f"movie-{n}", "title": "é" * 100} for n in range(6)]
+        lines = [json.dumps(doc, ensure_ascii=False) + "\n" for doc in docs]
+        stream = io.StringIO("".join(lines))
+        self.target_hyper.data.import_(
+            stream, max_batch_bytes=len(lines[0]) * 2
+        )
+        # each line takes about twice as many bytes as characters
+        self.assertEqual(max(self.target.bulk_sizes), 1)
+
+    def test_batches_by_size(self):
+        lines = [json.dumps(doc) + "\n" for doc in movies]
+        stream = io.StringIO("".join(lines) + "\n")
+        self.target_hyper.data.import_(
+            stream, max_batch_bytes=len(lines[0]) * 3
+        )
+        self.assertEqual(sum(self.target.bulk_sizes), 25)
+        self.assertEqual(max(self.target.bulk_sizes), 3)
+
+    def test_rejected_docs_are_counted(self):
+        stream = io.StringIO('{"_id": "a", "title": "A"}\n{"_id": "b"}\n')
+        result = self.target_hyper.data.import_(stream)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["failed"], 1)
+
+    def test_resume_from_checkpoint(self):
+        path = self.path("movies.ndjson")
+        checkpoint = self.path("movies.checkpoint")
+        self.hyper.data.export(path)
+
+        self.target.fail_ids = {"movie-010"}
+        result = self.target_hyper.data.import_(
+            path, batch_size=5, concurrency=1, checkpoint=checkpoint
+        )
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["status"], 400)
+        self.assertEqual(result["line"], 10)
+        self.assertEqual(result["docs"], 10)
+        with open(checkpoint) as file:
+            self.assertEqual(json.load(file)["line"], 10)
+
+        self.target.fail_ids = set()
+        self.target.bulk_sizes = []
+        result = self.target_hyper.data.import_(
+            path, batch_size=5, checkpoint=checkpoint
+        )
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["docs"], 25)
+        self.assertEqual(self.target.bulk_sizes, [5, 5, 5])
+        self.assertEqual(len(self.target.docs), 25)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_checkpoint_of_another_file(self):
+        checkpoint = self.path("checkpoint")
+        with open(checkpoint, "w") as file:
+            json.dump({"source": "/elsewhere", "line": 5, "docs": 5}, file)
+
+        with self.assertRaises(ValueError):
+            self.target_hyper.data.import_(
+                self.path("movies.ndjson"), checkpoint=checkpoint
+            )
+
+    def test_invalid_line(self):
+        stream = io.StringIO('{"_id": "a", "title": "A"}\nnot json\n')
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            self.target_hyper.data.import_(stream)
+
+
+class TestIterConcurrently(unittest.TestCase):
+    def test_reads_items_as_threads_free_up(self):
+        read: List[int] = []
+
+        def items():
+            for n in range(10):
+                read.append(n)
+                yield n
+
+        results = iter_concurrently(lambda n: n * 2, items(), 3)
+        item, result = next(results)
+        self.assertEqual(result, item * 2)
+        self.assertLessEqual(len(read), 6)
+
+        rest = dict(results)
+        self.assertEqual(sorted([item, *rest]), list(range(10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+# Once you have multiple test files, as long as you follow the test*.py naming pattern,
+# you can provide the name of the directory instead by using the -s flag and the name of the directory:
+# python -m unittest discover -s tests -v
+
+import json
+import os
+import tempfile
+import unittest
+from typing import Dict, List
+
+from artifacts import FakeHyperApp, FakeHyperServer
+
+import hyper_connect
+from hyper_connect import connect
+from hyper_connect.types import Hyper
+
+movies: List[Dict] = [
+    {"_id": f"movie-{n:03}", "_rev": f"1-{n}", "type": "movie", "n": n}
+    for n in range(23)
+]
+
+
+class TestCopy(unittest.TestCase):
+    def setUp(self):
+        self.source = FakeHyperApp(
+            movies,
+            {f"user-{n}": {"n": n} for n in range(7)},
+            {doc["_id"]: {"title": doc["_id"]} for doc in movies[::2]},
+        )
+        # copies must not carry the source's revisions
+        self.target = FakeHyperApp(reject=lambda doc: "_rev" in doc)
+        self.source_server = FakeHyperServer(self.source).start()
+        self.target_server = FakeHyperServer(self.target).start()
+        self.src: Hyper = connect(self.source_server.connection_string)
+        self.dst: Hyper = connect(self.target_server.connection_string)
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, "checkpoint")
+
+    def tearDown(self):
+        self.source_server.stop()
+        self.target_server.stop()
+        self.directory.cleanup()
+
+    def test_copies_every_service(self):
+        progress = []
+        result = hyper_connect.copy(
+            self.src,
+            self.dst,
+            batch_size=5,
+            concurrency=3,
+            cache_ttl="1d",
+            progress=progress.append,
+        )
+
+        self.assertTrue(result["ok"])
+        data = result["services"]["data"]
+        self.assertEqual((data["docs"], data["batches"]), (23, 5))
+        self.assertEqual(data["failed"], 0)
+        self.assertGreater(data["docs_per_second"], 0)
+        self.assertEqual(result["services"]["cache"]["docs"], 7)
+        self.assertEqual(result["services"]["search"]["docs"], 12)
+
+        self.assertEqual(
+            self.target.docs,
+            {
+                id: {k: v for k, v in doc.items() if k != "_rev"}
+                for id, doc in self.source.docs.items()
+            },
+        )
+        self.assertEqual(sorted(self.target.bulk_sizes), [3, 5, 5, 5, 5])
+        self.assertEqual(self.target.values, self.source.values)
+        self.assertEqual(set(self.target.ttls.values()), {"1d"})
+        self.assertEqual(
+            self.target.search,
+            {id: {**doc, "_id": id} for id, doc in self.source.search.items()},
+        )
+
+        # progress is reported in order, as batches are committed
+        self.assertEqual(
+            [u["docs"] for u in progress if u["service"] == "data"],
+            [5, 10, 15, 20, 23],
+        )
+
+    def test_only_the_services_asked_for(self):
+        result = hyper_connect.copy(
+            self.src, self.dst, ["search"], search_keys=["movie-004", "x"]
+        )
+        self.assertEqual(list(result["services"]), ["search"])
+        self.assertEqual(list(self.target.search), ["movie-004"])
+        self.assertEqual(self.target.docs, {})
+
+    def test_resumes_from_checkpoint(self):
+        self.target.fail_ids = {"movie-012"}
+        result = hyper_connect.copy(
+            self.src,
+            self.dst,
+            ["data", "cache"],
+            batch_size=5,
+            concurrency=1,
+            checkpoint=self.checkpoint,
+        )
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["status"], 400)
+        self.assertEqual(result["service"], "data")
+        self.assertEqual(result["services"]["data"]["docs"], 10)
+        with open(self.checkpoint) as file:
+            saved = json.load(file)
+        self.assertEqual(
+            saved["services"]["data"],
+            {"after": "movie-009", "docs": 10, "done": False},
+        )
+        self.assertNotIn("secret", json.dumps(saved))
+
+        self.target.fail_ids = set()
+        self.target.bulk_sizes = []
+        result = hyper_connect.copy(
+            self.src,
+            self.dst,
+            ["data", "cache"],
+            batch_size=5,
+            checkpoint=self.checkpoint,
+        )
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["services"]["data"]["docs"], 23)
+        # the first page starts with the last document copied
+        self.assertEqual(sorted(self.target.bulk_sizes), [4, 4, 5])
+        self.assertEqual(len(self.target.docs), 23)
+        self.assertEqual(len(self.target.values), 7)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_source_failure(self):
+        self.source.down = True
+        result = hyper_connect.copy(self.src, self.dst, ["cache"], retries=0)
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["status"], 503)
+        self.assertEqual(self.target.values, {})
+
+    def test_destination_failure_stops_the_copy(self):
+        self.target.down = True
+        result = hyper_connect.copy(
+            self.src, self.dst, ["cache", "data"], batch_size=2, retries=0
+        )
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["service"], "cache")
+        self.assertNotIn("data", result["services"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            hyper_connect.copy(self.src, self.dst, ["storage"])
+        with self.assertRaises(ValueError):
+            hyper_connect.copy(
+                self.src, connect(self.source_server.connection_string)
+            )
+        # the domain is ignored outside the cloud, so this is the same app
+        with self.assertRaises(ValueError):
+            hyper_connect.copy(
+                self.src,
+                connect(self.source_server.connection_string, "staging"),
+            )
+
+        with open(self.checkpoint, "w") as file:
+            json.dump({"source": "elsewhere", "services": {}}, file)
+        with self.assertRaises(ValueError):
+            hyper_connect.copy(self.src, self.dst, checkpoint=self.checkpoint)
+
+
+if __name__ == "__main__":
+    unittest.main()